@@ -32,6 +32,7 @@ CardView class
 # -------------------------------------------------------------------------
 import pickle
 import time
+from functools import partial
 
 # -------------------------------------------------------------------------
 #
@@ -68,8 +69,14 @@ from view.config.config_templates import (
     EditTemplateOptions,
     build_templates_panel,
 )
+from view.services.service_confidence import ConfidenceRankingService
 from view.services.service_images import ImagesService
+from view.services.service_lineage import LineageIndexService
+from view.services.service_places import PlaceIndexService
 from view.services.service_statistics import StatisticsService
+from view.services.service_status import StatusIndicatorService
+from view.services.service_timelines import TimelineCacheService
+from view.services.service_todo import TodoIndexService
 from view.services.service_windows import WindowService
 from view.actions import action_handler
 from view.views.view_builder import view_builder
@@ -110,9 +117,18 @@ class CardView(GlobalNavigationView):
         self._init_methods()
         self._init_state(dbstate, uistate)
         self._init_history = False
+        # Created before the view connects to the database signals so
+        # stale timelines, rankings, to do notes, lines of descent and place
+        # events are dropped before any page is redrawn.
+        TimelineCacheService(self.grstate)
+        ConfidenceRankingService(self.grstate)
+        TodoIndexService(self.grstate)
+        LineageIndexService(self.grstate)
+        PlaceIndexService(self.grstate)
 
         self.current_view = None
         self.current_context = None
+        self.current_page_view = None
 
         self.defer_refresh = False
         self.defer_refresh_id = None
@@ -212,11 +228,52 @@ class CardView(GlobalNavigationView):
             "note",
             "tag",
         ]:
-            for suffix in ["-add", "-update", "-delete", "-rebuild"]:
+            for suffix in ["-add", "-update", "-delete"]:
                 key = "%s%s" % (obj_type, suffix)
-                self.callman.add_db_signal(key, self.build_tree)
+                self.callman.add_db_signal(
+                    key, partial(self._handle_db_signal, obj_type, suffix)
+                )
+            self.callman.add_db_signal(
+                "%s-rebuild" % obj_type, self.build_tree
+            )
         self.callman.add_db_signal("home-person-changed", self.build_tree)
 
+    def _handle_db_signal(self, obj_type, suffix, handles):
+        """
+        Rebuild the page only if the changed objects are ones it was
+        rendered from or they now reference something on the page. Where
+        possible only the affected groups are rebuilt in place.
+        """
+        self.grstate.clear_fetch_cache()
+        StatusIndicatorService().clear_cache()
+        primary_handle = None
+        if self.current_context and self.current_context.primary_obj:
+            primary_handle = self.current_context.primary_obj.obj.handle
+        groups = self.grstate.find_dependent_groups(
+            obj_type.capitalize(),
+            handles,
+            suffix != "-delete",
+            exclude=primary_handle,
+        )
+        primary_changed = primary_handle in handles
+        if groups is None or (primary_changed and suffix == "-delete"):
+            self.build_tree()
+        elif groups or primary_changed:
+            if (
+                self.active
+                and self.current_page_view
+                and self.current_page_view.refresh_groups(
+                    groups, primary_changed=primary_changed
+                )
+            ):
+                self.current_context = self.current_page_view.grcontext
+                self._set_status_bar(self.current_context)
+                WindowService().refresh_all_windows()
+            else:
+                self.build_tree()
+        else:
+            WindowService().refresh_all_windows()
+
     def navigation_type(self):
         """
         Return active navigation type.
@@ -360,10 +417,12 @@ class CardView(GlobalNavigationView):
             self.bookmarks.redraw()
         WindowService().close_all_windows()
         self.current_context = None
+        self.current_page_view = None
         self._init_methods()
         self.history.clear()
         self._init_history = False
         self.image_service.get_thumbnail_image.cache_clear()
+        StatusIndicatorService().clear_cache()
         self._load_config()
         if self.active:
             self.build_tree()
@@ -394,6 +453,7 @@ class CardView(GlobalNavigationView):
         Perform redraw to populate tree.
         """
         self.dirty = True
+        StatusIndicatorService().clear_cache()
         if self.active:
             active_object = self.history.present()
             if active_object:
@@ -406,12 +466,9 @@ class CardView(GlobalNavigationView):
         """
         Clear view for object change.
         """
-        list(
-            map(
-                self.current_view.remove,
-                self.current_view.get_children(),
-            )
-        )
+        list(map(Gtk.Widget.destroy, self.current_view.get_children()))
+        self.grstate.clear_dependencies()
+        self.current_page_view = None
         if not self.dbstate.is_open():
             self.uistate.status.pop(self.uistate.status_id)
             self.uistate.status.push(
@@ -467,9 +524,16 @@ class CardView(GlobalNavigationView):
         start = time.time()
 
         self._clear_current_view()
-        view = view_builder(self.grstate, page_context)
-        self.current_view.pack_start(view, True, True, 0)
-        self.post_render_page()
+        self.grstate.track_dependencies()
+        self.grstate.cache_fetches()
+        StatusIndicatorService().clear_options()
+        try:
+            view = view_builder(self.grstate, page_context)
+            self.current_view.pack_start(view, True, True, 0)
+            self.current_page_view = view
+            self.post_render_page()
+        finally:
+            self.grstate.clear_fetch_cache()
 
         if page_context.primary_obj.obj_type != "Tag":
             self.set_bookmarks(page_context.primary_obj.obj_type)
@@ -38,7 +38,6 @@ from gramps.gen.lib import FamilyRelType, Person
 from view.common.common_vitals import (
     get_date_sortval,
     get_key_family_events,
-    get_person_birth_or_death,
     get_span,
 )
 from view.config.config_utils import create_grid
@@ -122,7 +121,7 @@ def get_child_field(grstate, obj, _dummy_field_value, args):
     person_birth = None
     birth_ref = obj.get_birth_ref()
     if birth_ref:
-        event = grstate.dbstate.db.get_event_from_handle(birth_ref.ref)
+        event = grstate.fetch("Event", birth_ref.ref)
         if event:
             person_birth = event.get_date_object()
 
@@ -130,9 +129,7 @@ def get_child_field(grstate, obj, _dummy_field_value, args):
     if not parent_family_handle:
         return [(get_label(_("Child")), get_label(_("Unknown Parents")))]
 
-    parent_family = grstate.dbstate.db.get_family_from_handle(
-        parent_family_handle
-    )
+    parent_family = grstate.fetch("Family", parent_family_handle)
 
     total = 0
     number = 0
@@ -154,13 +151,13 @@ def get_optional_fields(grstate, parent_family, person_birth):
     data = []
     if grstate.config.get(OPTION_SHOW_MOTHER):
         mother_text, dummy_text = get_parent_text(
-            grstate.dbstate.db, parent_family, person_birth, "Mother"
+            grstate, parent_family, person_birth, "Mother"
         )
         if mother_text:
             data.append(mother_text)
     if grstate.config.get(OPTION_SHOW_FATHER):
         father_text, death_text = get_parent_text(
-            grstate.dbstate.db, parent_family, person_birth, "Father"
+            grstate, parent_family, person_birth, "Father"
         )
         if father_text:
             data.append(father_text)
@@ -175,7 +172,7 @@ def get_optional_fields(grstate, parent_family, person_birth):
     return data
 
 
-def get_parent_text(db, family, birth_date, parent_type):
+def get_parent_text(grstate, family, birth_date, parent_type):
     """
     Return parent age at time child born.
     """
@@ -188,16 +185,17 @@ def get_parent_text(db, family, birth_date, parent_type):
     if not parent_handle:
         return "", ""
 
-    dummy_parent, birth = get_person_birth_or_death(db, parent_handle)
+    parent = grstate.fetch("Person", parent_handle)
+    if not parent:
+        return "", ""
+    birth = fetch_ref_event(grstate, parent.get_birth_ref())
     if birth:
         parent_text = get_parent_age_text(
             birth.get_date_object(), birth_date, parent_type
         )
 
     if parent_type == "Father":
-        dummy_parent, death = get_person_birth_or_death(
-            db, parent_handle, birth=False
-        )
+        death = fetch_ref_event(grstate, parent.get_death_ref())
         if death:
             death_sortval = get_date_sortval(death)
             if death_sortval < birth_date.sortval:
@@ -205,6 +203,15 @@ def get_parent_text(db, family, birth_date, parent_type):
     return parent_text, death_text
 
 
+def fetch_ref_event(grstate, event_ref):
+    """
+    Return the event for an event reference if there is one.
+    """
+    if event_ref:
+        return grstate.fetch("Event", event_ref.ref)
+    return None
+
+
 def get_parent_age_text(parent_birth_date, event_date, parent_type):
     """
     Return parent age text.
@@ -30,7 +30,6 @@ Duration field calculator.
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.lib import Family, Person
 from gramps.gen.lib.date import Today
-from gramps.gen.utils.alive import probably_alive_range
 
 # -------------------------------------------------------------------------
 #
@@ -38,6 +37,7 @@ from gramps.gen.utils.alive import probably_alive_range
 #
 # -------------------------------------------------------------------------
 from view.common.common_vitals import get_marriage_duration, get_span
+from view.common.lifespan import get_lifespan
 
 _ = glocale.translation.sgettext
 
@@ -99,7 +99,7 @@ def get_duration_field(grstate, obj, field_value, args):
             death_date,
             dummy_explain_text,
             dummy_related_person,
-        ) = probably_alive_range(obj, grstate.dbstate.db)
+        ) = get_lifespan(grstate.dbstate.db, obj)
         today = Today()
         if death_date and death_date > today:
             return currently_living(field_value, get_label, birth_date)
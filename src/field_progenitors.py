@@ -36,6 +36,7 @@ from gramps.gen.utils.db import family_name
 # Plugin Modules
 #
 # -------------------------------------------------------------------------
+from view.services.service_lineage import LineageIndexService
 
 _ = glocale.translation.sgettext
 
@@ -92,15 +93,13 @@ def get_progenitors_field(grstate, obj, field_value, args):
         parent_family_handle = obj.get_main_parents_family_handle()
         if not parent_family_handle:
             return []
-        parent_family = grstate.dbstate.db.get_family_from_handle(
-            parent_family_handle
-        )
-        if not parent_family:
-            return []
         paternal = PATERNAL_PROGENITORS in field_value
-        family, generations = extract_progenitor_family(
-            grstate.dbstate.db, parent_family, paternal=paternal
+        handle, generations = LineageIndexService(grstate).get_progenitors(
+            parent_family_handle, paternal=paternal
         )
+        family = grstate.fetch("Family", handle)
+        if not family:
+            return []
         name = family_name(family, grstate.dbstate.db)
         if not name:
             return []
@@ -119,28 +118,3 @@ def get_progenitors_field(grstate, obj, field_value, args):
             )
         ]
     return []
-
-
-def extract_progenitor_family(db, family, generation=1, paternal=True):
-    """
-    Recursively extract progenitors.
-    """
-    if paternal:
-        parent_handle = family.father_handle
-    else:
-        parent_handle = family.mother_handle
-    if parent_handle:
-        parent = db.get_person_from_handle(parent_handle)
-        if parent:
-            parent_family_handle = parent.get_main_parents_family_handle()
-            if parent_family_handle:
-                parent_family = db.get_family_from_handle(parent_family_handle)
-                if parent_family:
-                    generation = generation + 1
-                    return extract_progenitor_family(
-                        db,
-                        parent_family,
-                        generation=generation,
-                        paternal=paternal,
-                    )
-    return family, generation
@@ -22,6 +22,13 @@
 Person and family status indicators.
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from functools import partial
+
 # ------------------------------------------------------------------------
 #
 # GTK Modules
@@ -35,7 +42,7 @@ from gi.repository import Gtk
 #
 # ------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
-from gramps.gen.errors import WindowActiveError
+from gramps.gen.errors import HandleError, WindowActiveError
 from gramps.gen.lib import Event, EventType, Family, Person
 from gramps.gui.editors import EditEvent
 
@@ -64,9 +71,10 @@ from view.config.config_const import (
 from view.config.config_utils import (
     config_event_fields,
     create_grid,
-    get_event_fields,
+    get_option_event_fields,
 )
 from view.menus.menu_utils import menu_item, show_menu
+from view.services.service_confidence import ConfidenceRankingService
 
 _ = glocale.translation.sgettext
 
@@ -84,6 +92,7 @@ OPTION_CITATION_ALERT = "status.citation-alert"
 OPTION_CITATION_ALERT_EDIT = "status.citation-alert-edit"
 OPTION_CITATION_ALERT_MINIMUM = "status.citation-alert-minimum"
 OPTION_MISSING_ALERT = "status.missing-alert"
+OPTION_RANK_PRECOMPUTE = "status.rank-precompute"
 
 RANK_OPTIONS = [
     OPTION_RANK_OBJECT,
@@ -122,6 +131,7 @@ def load_on_reg(_dummy_dbstate, _dummy_uistate, _dummy_plugin):
             "default_options": default_options,
             "get_config_grids": get_status_config_grids,
             "get_status": get_status,
+            "get_status_batch": get_status_batch,
         }
     ]
 
@@ -142,6 +152,7 @@ default_options = [
     (OPTION_RANK_ADDRESSES, True),
     (OPTION_RANK_SPOUSES, True),
     (OPTION_RANK_CHILDREN, True),
+    (OPTION_RANK_PRECOMPUTE, False),
     ("status.rank-1", OPTION_VALUE_BAPTISM),
     ("status.rank-2", OPTION_VALUE_CHRISTENING),
     ("status.rank-3", OPTION_VALUE_BANNS),
@@ -276,6 +287,12 @@ def get_status_config_grids(configdialog, grstate, *_dummy_args):
     )
     grid3 = config_event_fields(grstate, "rank")
     grid.attach(grid3, 1, 26, 2, 1)
+    configdialog.add_checkbox(
+        grid,
+        _("Rank all people in the background"),
+        27,
+        OPTION_RANK_PRECOMPUTE,
+    )
     grids.append(grid)
 
     grid = create_grid()
@@ -323,144 +340,229 @@ def get_status_config_grids(configdialog, grstate, *_dummy_args):
 
 # ------------------------------------------------------------------------
 #
-# Function to check status and return icons as needed.
+# Functions to check status and return icons or icon builders as needed.
 #
 # ------------------------------------------------------------------------
 def get_status(grstate, obj, size):
-
-    if isinstance(obj, Person):
-        return get_person_status(grstate, obj, size)
-    return get_family_status(grstate, obj, size)
+    """
+    Check status for an object and return the icons.
+    """
+    options = {key: grstate.config.get(key) for key, dummy in default_options}
+    builders = get_status_batch(grstate, [obj], size, options)[0]
+    return [build() for build in builders]
 
 
-# ------------------------------------------------------------------------
-#
-# Some helper functions.
-#
-# ------------------------------------------------------------------------
-def get_person_status(grstate, obj, size):
+def get_status_batch(grstate, objs, size, options):
     """
-    Load status indicators if needed.
+    Check status for a list of objects given a snapshot of the options,
+    returning a list of icon builders for each.
     """
-    icon_list = []
-    alert = grstate.config.get(OPTION_CITATION_ALERT)
-    missing = grstate.config.get(OPTION_MISSING_ALERT)
-    ranking = grstate.config.get(OPTION_CONFIDENCE_RANKING)
-    if alert or ranking:
-        (
-            alert_icon,
-            rank_icon,
-            rank_text,
-            missing_icon,
-            missing_text,
-        ) = get_person_status_icons(grstate, obj, size)
-        if ranking and rank_icon:
-            icon_list.append(
-                prepare_icon(rank_icon, size=size, tooltip=rank_text)
+    person_options = get_person_ranking_options(options)
+    family_options = get_family_ranking_options(options)
+    if options[OPTION_RANK_PRECOMPUTE] and (
+        options[OPTION_CITATION_ALERT] or options[OPTION_CONFIDENCE_RANKING]
+    ):
+        precompute_person_rankings(grstate, person_options)
+    results = []
+    for obj in objs:
+        if isinstance(obj, Person):
+            results.append(
+                get_person_status(grstate, obj, size, options, person_options)
             )
-        if alert and alert_icon:
-            icon_list.append(alert_icon)
-        if missing and missing_icon:
-            icon_list.append(
-                prepare_icon(missing_icon, size=size, tooltip=missing_text)
+        else:
+            results.append(
+                get_family_status(grstate, obj, size, options, family_options)
             )
-    return icon_list
+    return results
 
 
-def get_person_status_icons(grstate, obj, size):
+# ------------------------------------------------------------------------
+#
+# Some helper functions.
+#
+# ------------------------------------------------------------------------
+def get_person_ranking_options(options):
     """
-    Evaluate and return status icons for an object.
+    Return the ranking option set for people.
     """
-    alert_list = get_event_fields(grstate, "alert")
-    alert_minimum = grstate.config.get(OPTION_CITATION_ALERT_MINIMUM)
-    alert_minimum = alert_minimum + 1
-    rank_list = get_event_fields(grstate, "rank")
+    alert_list = get_option_event_fields(options, "alert")
+    alert_minimum = options[OPTION_CITATION_ALERT_MINIMUM] + 1
+    rank_list = get_option_event_fields(options, "rank")
     for event in ["Birth", "Death"]:
         if event not in rank_list:
             rank_list.append(event)
     for option in RANK_OPTIONS:
-        if grstate.config.get(option):
+        if options[option]:
             rank_list.append(option.split("-")[1])
-    missing_list = get_event_fields(grstate, "missing", count=6)
-    (
-        total_rank_items,
-        total_rank_confidence,
-        missing_alerts,
-        confidence_alerts,
-    ) = get_status_ranking(
-        grstate.dbstate.db,
-        obj,
-        rank_list,
-        alert_list,
+    missing_list = get_option_event_fields(options, "missing", count=6)
+    return (
+        "Person",
+        tuple(rank_list),
+        tuple(alert_list),
         alert_minimum,
-        missing_list,
+        tuple(missing_list),
     )
-    if total_rank_confidence != 0:
-        rank_score = total_rank_confidence / total_rank_items
-        rank_icon = RANK_ICONS.get(int(rank_score))
-        rank_text = " ".join((_("Confidence Ranking"), ":", str(rank_score)))
-    else:
-        rank_icon = None
-        rank_text = ""
 
-    if confidence_alerts:
-        alert_icon = GrampsCitationAlertIcon(grstate, confidence_alerts, size)
-    else:
-        alert_icon = None
 
-    if missing_alerts:
-        missing_icon = "emblem-important"
-        missing_text = ", ".join(tuple(missing_alerts))
-        missing_text = "%s: %s" % (_("Missing Events"), missing_text)
-    else:
-        missing_icon = None
-        missing_text = ""
+def get_family_ranking_options(options):
+    """
+    Return the ranking option set for families.
+    """
+    alert_list = get_option_event_fields(options, "alert")
+    alert_minimum = options[OPTION_CITATION_ALERT_MINIMUM] + 1
+    return ("Family", (), tuple(alert_list), alert_minimum, ())
+
 
-    return alert_icon, rank_icon, rank_text, missing_icon, missing_text
+def get_person_status(grstate, obj, size, options, ranking_options):
+    """
+    Load status indicators if needed.
+    """
+    builders = []
+    alert = options[OPTION_CITATION_ALERT]
+    missing = options[OPTION_MISSING_ALERT]
+    ranking = options[OPTION_CONFIDENCE_RANKING]
+    if alert or ranking:
+        (
+            total_rank_items,
+            total_rank_confidence,
+            missing_alerts,
+            confidence_alerts,
+        ) = get_cached_status_ranking(grstate, obj, ranking_options)
+        if ranking and total_rank_confidence != 0:
+            rank_score = total_rank_confidence / total_rank_items
+            rank_icon = RANK_ICONS.get(int(rank_score))
+            if rank_icon:
+                rank_text = " ".join(
+                    (_("Confidence Ranking"), ":", str(rank_score))
+                )
+                builders.append(
+                    partial(
+                        prepare_icon, rank_icon, size=size, tooltip=rank_text
+                    )
+                )
+        if alert and confidence_alerts:
+            builders.append(
+                partial(
+                    GrampsCitationAlertIcon, grstate, confidence_alerts, size
+                )
+            )
+        if missing and missing_alerts:
+            missing_text = ", ".join(tuple(missing_alerts))
+            missing_text = "%s: %s" % (_("Missing Events"), missing_text)
+            builders.append(
+                partial(
+                    prepare_icon,
+                    "emblem-important",
+                    size=size,
+                    tooltip=missing_text,
+                )
+            )
+    return builders
 
 
-def get_family_status(grstate, obj, size):
+def get_family_status(grstate, obj, size, options, ranking_options):
     """
     Load status indicators if needed.
     """
-    icon_list = []
-    alert = grstate.config.get(OPTION_CITATION_ALERT)
-    if alert:
-        alert_icon = get_family_status_icons(grstate, obj, size)
-        if alert_icon:
-            icon_list.append(alert_icon)
-    return icon_list
+    builders = []
+    if options[OPTION_CITATION_ALERT]:
+        (
+            dummy_total_rank_items,
+            dummy_total_rank_confidence,
+            dummy_missing_alerts,
+            confidence_alerts,
+        ) = get_cached_status_ranking(grstate, obj, ranking_options)
+        if confidence_alerts:
+            builders.append(
+                partial(
+                    GrampsCitationAlertIcon, grstate, confidence_alerts, size
+                )
+            )
+    return builders
+
+
+class RankingFetcher:
+    """
+    Fetches objects for a ranking while recording their handles so the
+    cached result can be dropped when any of them change. Outside of a
+    page render the objects are read from the database directly so they
+    are not recorded as page dependencies.
+    """
+
+    __slots__ = ("grstate", "background", "handles")
 
+    def __init__(self, grstate, background=False):
+        self.grstate = grstate
+        self.background = background
+        self.handles = set()
 
-def get_family_status_icons(grstate, obj, size):
+    def fetch(self, obj_type, handle):
+        """
+        Fetch an object, recording its handle.
+        """
+        self.handles.add(handle)
+        if self.background:
+            try:
+                return self.grstate.methods[obj_type](handle)
+            except HandleError:
+                return None
+        return self.grstate.fetch(obj_type, handle)
+
+
+def compute_status_ranking(fetcher, obj, options):
     """
-    Evaluate and return status icons for an object.
+    Compute a ranking for an option set, returning it with the handles it
+    was derived from.
     """
-    alert_list = get_event_fields(grstate, "alert")
-    alert_minimum = grstate.config.get(OPTION_CITATION_ALERT_MINIMUM)
-    alert_minimum = alert_minimum + 1
     (
-        total_rank_items,
-        total_rank_confidence,
-        missing_alerts,
-        confidence_alerts,
-    ) = get_status_ranking(
-        grstate.dbstate.db,
-        obj,
-        [],
+        dummy_obj_type,
+        rank_list,
         alert_list,
         alert_minimum,
-        [],
+        required_list,
+    ) = options
+    ranking = get_status_ranking(
+        fetcher,
+        obj,
+        list(rank_list),
+        list(alert_list),
+        alert_minimum,
+        list(required_list),
+    )
+    fetcher.handles.add(obj.handle)
+    return ranking, fetcher.handles
+
+
+def get_cached_status_ranking(grstate, obj, options):
+    """
+    Return the ranking for an object and option set from the cache.
+    """
+    return ConfidenceRankingService(grstate).get_ranking(
+        obj.handle,
+        options,
+        lambda: compute_status_ranking(RankingFetcher(grstate), obj, options),
+    )
+
+
+def precompute_person_rankings(grstate, options):
+    """
+    Start a background pass ranking all the people with an option set.
+    """
+
+    def compute(handle):
+        fetcher = RankingFetcher(grstate, background=True)
+        person = fetcher.fetch("Person", handle)
+        if person is None:
+            return None
+        return compute_status_ranking(fetcher, person, options)
+
+    ConfidenceRankingService(grstate).precompute(
+        options, grstate.dbstate.db.get_person_handles, compute
     )
-    if confidence_alerts:
-        alert_icon = GrampsCitationAlertIcon(grstate, confidence_alerts, size)
-    else:
-        alert_icon = None
-    return alert_icon
 
 
 def get_status_ranking(
-    db,
+    fetcher,
     obj,
     rank_list=None,
     alert_list=None,
@@ -468,7 +570,9 @@ def get_status_ranking(
     required_list=None,
 ):
     """
-    Evaluate object attributes to collect data for confidence ranking.
+    Evaluate object attributes to collect data for confidence ranking. The
+    objects are read through the fetch method of the fetcher, normally the
+    grstate.
     """
     rank_list = rank_list or []
     alert_list = alert_list or []
@@ -483,7 +587,7 @@ def get_status_ranking(
 
     vital_count = 2
     object_bucket, events_bucket = collect_primary_object_data(
-        db, obj, rank_list
+        fetcher, obj, rank_list
     )
     for event_data in events_bucket:
         (
@@ -547,77 +651,82 @@ def get_status_ranking(
     )
 
 
-def collect_primary_object_data(db, obj, rank_list):
+def collect_primary_object_data(fetcher, obj, rank_list):
     """
     Collect all object and event data for a primary object.
     """
     buckets = ([], [])
     if isinstance(obj, Person):
-        collect_person_data(db, obj, rank_list, buckets)
+        collect_person_data(fetcher, obj, rank_list, buckets)
     elif isinstance(obj, Family):
-        collect_family_data(db, obj, rank_list, buckets)
+        collect_family_data(fetcher, obj, rank_list, buckets)
     return buckets[0], buckets[1]
 
 
-def collect_person_data(db, person, rank_list, buckets, include_family=True):
+def collect_person_data(
+    fetcher, person, rank_list, buckets, include_family=True
+):
     """
     Collect all citation metrics associated with a person.
     """
     (object_bucket, events_bucket) = buckets
     person_handle = person.handle
 
-    collect_object_data(db, person, rank_list, object_bucket)
-    collect_event_data(db, person, events_bucket)
+    collect_object_data(fetcher, person, rank_list, object_bucket)
+    collect_event_data(fetcher, person, events_bucket)
     if include_family:
         if "object" in rank_list:
             for handle in person.parent_family_list:
-                family = db.get_family_from_handle(handle)
+                family = fetcher.fetch("Family", handle)
                 for child_ref in family.child_ref_list:
                     if child_ref.ref == person_handle:
                         collect_child_object_data(
-                            db, family, _("Child"), [child_ref], object_bucket
+                            fetcher,
+                            family,
+                            _("Child"),
+                            [child_ref],
+                            object_bucket,
                         )
                         break
 
         for handle in person.family_list:
-            family = db.get_family_from_handle(handle)
-            collect_object_data(db, family, rank_list, object_bucket)
-            collect_event_data(db, family, events_bucket)
+            family = fetcher.fetch("Family", handle)
+            collect_object_data(fetcher, family, rank_list, object_bucket)
+            collect_event_data(fetcher, family, events_bucket)
 
 
-def collect_family_data(db, obj, rank_list, buckets, skip_handle=None):
+def collect_family_data(fetcher, obj, rank_list, buckets, skip_handle=None):
     """
     Collect most citation metrics associated with a family.
     If requested this can include spouses and children.
     """
     (object_bucket, events_bucket) = buckets
 
-    collect_object_data(db, obj, rank_list, object_bucket)
-    collect_event_data(db, obj, events_bucket)
+    collect_object_data(fetcher, obj, rank_list, object_bucket)
+    collect_event_data(fetcher, obj, events_bucket)
 
-    get_person_from_handle = db.get_person_from_handle
     if "spouses" in rank_list:
         if obj.father_handle and obj.father_handle != skip_handle:
-            father = get_person_from_handle(obj.father_handle)
+            father = fetcher.fetch("Person", obj.father_handle)
             collect_person_data(
-                db, father, rank_list, buckets, include_family=False
+                fetcher, father, rank_list, buckets, include_family=False
             )
         if obj.mother_handle and obj.mother_handle != skip_handle:
-            mother = get_person_from_handle(obj.mother_handle)
+            mother = fetcher.fetch("Person", obj.mother_handle)
             collect_person_data(
-                db, mother, rank_list, buckets, include_family=False
+                fetcher, mother, rank_list, buckets, include_family=False
             )
 
     if "children" in rank_list:
         for child_ref in obj.child_ref_list:
             if child_ref != skip_handle:
-                child = get_person_from_handle(child_ref.ref)
+                child = fetcher.fetch("Person", child_ref.ref)
                 collect_person_data(
-                    db, child, rank_list, buckets, include_family=False
+                    fetcher, child, rank_list, buckets, include_family=False
                 )
 
 
-def collect_object_data(db, obj, rank_list, bucket):
+def collect_object_data(fetcher, obj, rank_list, bucket):
     """
     Collect object citation metrics excluding their events.
     """
@@ -630,31 +739,33 @@ def collect_object_data(db, obj, rank_list, bucket):
             description = _("Family")
         elif isinstance(obj, Event):
             description = _("Event")
-        collect_child_object_data(db, obj, description, [obj], bucket)
+        collect_child_object_data(fetcher, obj, description, [obj], bucket)
     if person and "names" in rank_list:
         names = [obj.primary_name] + obj.alternate_names
-        collect_child_object_data(db, obj, _("Name"), names, bucket)
+        collect_child_object_data(fetcher, obj, _("Name"), names, bucket)
     if "ordinances" in rank_list:
         collect_child_object_data(
-            db, obj, _("Ordinance"), obj.lds_ord_list, bucket
+            fetcher, obj, _("Ordinance"), obj.lds_ord_list, bucket
         )
     if "attributes" in rank_list:
         collect_child_object_data(
-            db, obj, _("Attribute"), obj.attribute_list, bucket
+            fetcher, obj, _("Attribute"), obj.attribute_list, bucket
         )
     if person and "associations" in rank_list:
         collect_child_object_data(
-            db, obj, _("Association"), obj.person_ref_list, bucket
+            fetcher, obj, _("Association"), obj.person_ref_list, bucket
         )
     if person and "addresses" in rank_list:
         collect_child_object_data(
-            db, obj, _("Address"), obj.address_list, bucket
+            fetcher, obj, _("Address"), obj.address_list, bucket
         )
     if "media" in rank_list:
-        collect_child_object_data(db, obj, _("Media"), obj.media_list, bucket)
+        collect_child_object_data(
+            fetcher, obj, _("Media"), obj.media_list, bucket
+        )
 
 
-def collect_child_object_data(db, obj, description, child_list, bucket):
+def collect_child_object_data(fetcher, obj, description, child_list, bucket):
     """
     Collect child object citation metrics.
     """
@@ -663,7 +774,7 @@ def collect_child_object_data(db, obj, description, child_list, bucket):
             total_count,
             total_confidence,
             highest_confidence,
-        ) = get_citation_metrics(db, child_obj)
+        ) = get_citation_metrics(fetcher, child_obj)
         bucket.append(
             (
                 obj,
@@ -676,21 +787,21 @@ def collect_child_object_data(db, obj, description, child_list, bucket):
         )
 
 
-def collect_event_data(db, obj, bucket):
+def collect_event_data(fetcher, obj, bucket):
     """
     Collect event citation metrics.
     """
     vital_handles = get_preferred_vital_handles(obj)
     seen_list = []
     for event_ref in obj.event_ref_list:
-        event = db.get_event_from_handle(event_ref.ref)
+        event = fetcher.fetch("Event", event_ref.ref)
         event_type = event.get_type()
         event_name = event_type.xml_str()
         (
             total_count,
             total_confidence,
             highest_confidence,
-        ) = get_citation_metrics(db, event)
+        ) = get_citation_metrics(fetcher, event)
         primary = False
         if event_name not in seen_list:
             if event_type in [EventType.BIRTH, EventType.DEATH]:
@@ -726,14 +837,14 @@ def get_preferred_vital_handles(obj):
     return vital_handles
 
 
-def get_citation_metrics(db, obj):
+def get_citation_metrics(fetcher, obj):
     """
     Examine citations for an object and return what metrics are available.
     """
     total_confidence = 0
     highest_confidence = 0
     for handle in obj.citation_list:
-        citation = db.get_citation_from_handle(handle)
+        citation = fetcher.fetch("Citation", handle)
         total_confidence = total_confidence + citation.confidence
         if citation.confidence > highest_confidence:
             highest_confidence = citation.confidence
@@ -22,6 +22,13 @@
 To do note status indicator plugin.
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from functools import partial
+
 # ------------------------------------------------------------------------
 #
 # GTK Modules
@@ -36,7 +43,7 @@ from gi.repository import Gtk
 # ------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.errors import WindowActiveError
-from gramps.gen.lib import Family, NoteType, Person
+from gramps.gen.lib import Family, Person
 from gramps.gui.editors import EditNote
 
 # ------------------------------------------------------------------------
@@ -48,6 +55,7 @@ from view.common.common_classes import GrampsBaseIcon
 from view.common.common_utils import describe_object
 from view.config.config_utils import create_grid
 from view.menus.menu_utils import menu_item, show_menu
+from view.services.service_todo import TodoIndexService
 
 _ = glocale.translation.sgettext
 
@@ -74,6 +82,7 @@ def load_on_reg(_dummy_dbstate, _dummy_uistate, _dummy_plugin):
             "default_options": default_options,
             "get_config_grids": build_todo_grid,
             "get_status": get_todo_status,
+            "get_status_batch": get_todo_status_batch,
         }
     ]
 
@@ -164,49 +173,54 @@ def get_todo_status(grstate, obj, size):
     """
     Load todo status indicator if needed.
     """
-    if not grstate.config.get(OPTION_TODO):
-        return []
+    options = {key: grstate.config.get(key) for key, dummy in default_options}
+    builders = get_todo_status_batch(grstate, [obj], size, options)[0]
+    return [build() for build in builders]
 
-    todo_list = []
-    db = grstate.dbstate.db
-    obj_path = [describe_object(db, obj)]
 
-    done = False
-    if isinstance(obj, Person) and grstate.config.get(OPTION_TODO_PERSON):
-        evaluate_person(db, obj, obj_path, todo_list)
-        done = True
-    elif isinstance(obj, Family) and grstate.config.get(OPTION_TODO_FAMILY):
-        evaluate_family(db, obj, obj_path, todo_list)
-        done = True
-    if not done:
-        evaluate_object(db, obj, obj_path, todo_list)
-
-    if todo_list:
-        todo_icon = GrampsToDoIcon(grstate, todo_list, size)
-        return [todo_icon]
-    return []
+def get_todo_status_batch(grstate, objs, size, options):
+    """
+    Check todo status for a list of objects given a snapshot of the
+    options, returning a list of icon builders for each.
+    """
+    if not options[OPTION_TODO]:
+        return [[] for dummy_obj in objs]
+
+    results = []
+    for obj in objs:
+        todo_list = []
+        obj_path = [obj]
+        if isinstance(obj, Person) and options[OPTION_TODO_PERSON]:
+            evaluate_person(grstate, obj, obj_path, todo_list)
+        elif isinstance(obj, Family) and options[OPTION_TODO_FAMILY]:
+            evaluate_family(grstate, obj, obj_path, todo_list)
+        else:
+            evaluate_object(grstate, obj, obj_path, todo_list)
+        if todo_list:
+            results.append([partial(GrampsToDoIcon, grstate, todo_list, size)])
+        else:
+            results.append([])
+    return results
 
 
 # ------------------------------------------------------------------------
 #
-# Some helper functions.
+# Some helper functions. The object paths are kept as lists of objects
+# and only described when a to do note is found.
 #
 # ------------------------------------------------------------------------
-def evaluate_family(db, obj, obj_path, todo_list):
+def evaluate_family(grstate, obj, obj_path, todo_list):
     """
     Evaluate all members of a family in case any have open todo items.
     """
-    get_event_from_handle = db.get_event_from_handle
-    get_person_from_handle = db.get_person_from_handle
-    new_obj_path = evaluate_obj_path(db, obj, obj_path)
-    evaluate_object(db, obj, new_obj_path, todo_list)
+    new_obj_path = evaluate_obj_path(obj, obj_path)
+    evaluate_object(grstate, obj, new_obj_path, todo_list)
     for event_ref in obj.event_ref_list:
-        event = get_event_from_handle(event_ref.ref)
-        evaluate_object(db, event, obj_path, todo_list)
+        evaluate_handle(grstate, "Event", event_ref.ref, obj_path, todo_list)
     if obj.father_handle:
-        father = get_person_from_handle(obj.father_handle)
+        father = grstate.fetch("Person", obj.father_handle)
         evaluate_person(
-            db,
+            grstate,
             father,
             new_obj_path,
             todo_list,
@@ -214,9 +228,9 @@ def evaluate_family(db, obj, obj_path, todo_list):
             include_family=False,
         )
     if obj.mother_handle:
-        mother = get_person_from_handle(obj.mother_handle)
+        mother = grstate.fetch("Person", obj.mother_handle)
         evaluate_person(
-            db,
+            grstate,
             mother,
             new_obj_path,
             todo_list,
@@ -224,22 +238,27 @@ def evaluate_family(db, obj, obj_path, todo_list):
             include_family=False,
         )
     for child_ref in obj.child_ref_list:
-        person = get_person_from_handle(child_ref.ref)
+        person = grstate.fetch("Person", child_ref.ref)
         evaluate_person(
-            db, person, new_obj_path, todo_list, include_parents=False
+            grstate, person, new_obj_path, todo_list, include_parents=False
         )
 
 
 def evaluate_person(
-    db, obj, obj_path, todo_list, include_parents=True, include_family=True
+    grstate,
+    obj,
+    obj_path,
+    todo_list,
+    include_parents=True,
+    include_family=True,
 ):
     """
     Evaluate base person and then all their details for open todo items.
     """
-    new_obj_path = evaluate_obj_path(db, obj, obj_path)
-    evaluate_object(db, obj, new_obj_path, todo_list)
+    new_obj_path = evaluate_obj_path(obj, obj_path)
+    evaluate_object(grstate, obj, new_obj_path, todo_list)
     evaluate_person_details(
-        db,
+        grstate,
         obj,
         new_obj_path,
         todo_list,
@@ -249,79 +268,107 @@ def evaluate_person(
 
 
 def evaluate_person_details(
-    db, obj, obj_path, todo_list, include_parents=True, include_family=True
+    grstate,
+    obj,
+    obj_path,
+    todo_list,
+    include_parents=True,
+    include_family=True,
 ):
     """
     Evaluate all events and families a person may head as well as their
     child references from parent families to determine if any to do items
     exist for any aspect of that person.
     """
-    get_event_from_handle = db.get_event_from_handle
     for event_ref in obj.event_ref_list:
-        event = get_event_from_handle(event_ref.ref)
-        evaluate_object(db, event, obj_path, todo_list)
-    get_media_from_handle = db.get_media_from_handle
+        evaluate_handle(grstate, "Event", event_ref.ref, obj_path, todo_list)
     for media_ref in obj.media_list:
-        media = get_media_from_handle(media_ref.ref)
-        evaluate_object(db, media, obj_path, todo_list)
-    get_family_from_handle = db.get_family_from_handle
+        evaluate_handle(grstate, "Media", media_ref.ref, obj_path, todo_list)
     if include_family:
-        get_family_from_handle = db.get_family_from_handle
         for handle in obj.family_list:
-            family = get_family_from_handle(handle)
-            evaluate_object(db, family, obj_path, todo_list)
+            family = grstate.fetch("Family", handle)
+            evaluate_object(grstate, family, obj_path, todo_list)
             for event_ref in family.event_ref_list:
-                evaluate_event(db, event_ref.ref, obj_path, todo_list)
+                evaluate_event(grstate, event_ref.ref, obj_path, todo_list)
     if include_parents:
+        index = TodoIndexService(grstate)
         person_handle = obj.handle
         for handle in obj.parent_family_list:
-            family = get_family_from_handle(handle)
-            for child_ref in family.child_ref_list:
-                if child_ref.ref == person_handle:
-                    evaluate_object(db, child_ref, obj_path, todo_list)
+            if index.has_todo(handle):
+                family = grstate.fetch("Family", handle)
+                for child_ref in family.child_ref_list:
+                    if child_ref.ref == person_handle:
+                        evaluate_object(
+                            grstate, child_ref, obj_path, todo_list
+                        )
+
+
+def evaluate_handle(grstate, obj_type, handle, obj_path, todo_list):
+    """
+    Evaluate whether a primary object has any todo notes, only fetching
+    it if the index shows it does.
+    """
+    if TodoIndexService(grstate).has_todo(handle):
+        obj = grstate.fetch(obj_type, handle)
+        evaluate_object(grstate, obj, obj_path, todo_list)
 
 
-def evaluate_event(db, handle, obj_path, todo_list):
+def evaluate_event(grstate, handle, obj_path, todo_list):
     """
     Evaluate whether event has any todo notes.
     """
-    event = db.get_event_from_handle(handle)
-    new_obj_path = evaluate_obj_path(db, event, obj_path)
-    evaluate_object(db, event, new_obj_path, todo_list)
+    if TodoIndexService(grstate).has_todo(handle):
+        event = grstate.fetch("Event", handle)
+        new_obj_path = evaluate_obj_path(event, obj_path)
+        evaluate_object(grstate, event, new_obj_path, todo_list)
 
 
-def evaluate_object(db, obj, obj_path, todo_list):
+def evaluate_object(grstate, obj, obj_path, todo_list):
     """
     Evaluate whether object has any todo notes.
     """
-    new_obj_path = evaluate_obj_path(db, obj, obj_path)
+    index = TodoIndexService(grstate)
+    if hasattr(obj, "handle") and not index.has_todo(obj.handle):
+        return
+    new_obj_path = evaluate_obj_path(obj, obj_path)
     for handle in obj.note_list:
-        evaluate_note(db, handle, new_obj_path, todo_list)
+        evaluate_note(grstate, handle, new_obj_path, todo_list)
     for child_obj in obj.get_note_child_list():
-        new_obj_path = obj_path + [describe_object(db, child_obj)]
+        new_obj_path = obj_path + [child_obj]
         for handle in child_obj.note_list:
-            evaluate_note(db, handle, new_obj_path, todo_list)
+            evaluate_note(grstate, handle, new_obj_path, todo_list)
 
 
-def evaluate_note(db, handle, obj_path, todo_list):
+def evaluate_note(grstate, handle, obj_path, todo_list):
     """
     Evaluate whether it is a to do note.
     """
-    note = db.get_note_from_handle(handle)
-    if note.get_type() == NoteType.TODO:
-        todo_list.append((obj_path, note))
+    if TodoIndexService(grstate).is_todo(handle):
+        note = grstate.fetch("Note", handle)
+        todo_list.append((describe_obj_path(grstate, obj_path), note))
 
 
-def evaluate_obj_path(db, obj, obj_path):
+def evaluate_obj_path(obj, obj_path):
     """
     Evaluate and return updated path if needed.
     """
-    new_obj = describe_object(db, obj)
-    if obj_path[-1] != new_obj:
-        return obj_path + [new_obj]
+    if obj_path[-1] is not obj:
+        return obj_path + [obj]
     return obj_path
 
 
+def describe_obj_path(grstate, obj_path):
+    """
+    Return the descriptions for the objects in a path.
+    """
+    path = []
+    for obj in obj_path:
+        description = describe_object(grstate.dbstate.db, obj)
+        if not path or path[-1] != description:
+            path.append(description)
+    return path
+
+
 # ------------------------------------------------------------------------
 #
 # ToDoIcon class
@@ -68,6 +68,7 @@ _TEMPLATE = (
     ("display.icons-active-width", 24),
     ("display.icons-group-width", 12),
     ("display.max-changes-per-list", 20),
+    ("display.defer-card-details", True),
     ######################################################################
     ## General Options
     ######################################################################
@@ -874,6 +875,8 @@ _TEMPLATE = (
     ("timeline.place.show-class-residence", True),
     ("timeline.place.show-class-other", True),
     ("timeline.place.show-class-custom", True),
+    ("timeline.place.start-year", 0),
+    ("timeline.place.end-year", 0),
     ######################################################################
     # Additional Color Schemes
     #
@@ -30,7 +30,6 @@ EventCard.
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.display.place import displayer as place_displayer
 from gramps.gen.lib import EventType
-from gramps.gen.utils.alive import probably_alive
 from gramps.gui.ddtargets import DdTargets
 
 # ------------------------------------------------------------------------
@@ -57,6 +56,7 @@ from ..common.common_vitals import (
     get_primary_participant,
     get_relation,
 )
+from ..common.lifespan import is_probably_alive
 from ..menus.menu_utils import add_participants_menu, menu_item
 from .card_reference import ReferenceCard
 
@@ -412,7 +412,7 @@ class EventCard(ReferenceCard):
         else:
             person = None
         if person:
-            living = probably_alive(person, self.grstate.dbstate.db)
+            living = is_probably_alive(self.grstate.dbstate.db, person)
             css_string = get_person_color_css(person, living=living)
         else:
             css_string = get_family_color_css(self.primary_participant[1])
@@ -96,6 +96,10 @@ class ObjectCard(CardView):
             self.reference = None
         CardView.__init__(self, grstate, groptions)
         self.primary = GrampsObject(primary_obj)
+        if self.primary.has_handle:
+            grstate.record_object_dependencies(self.primary.obj)
+        if self.reference_base and self.reference_base.has_handle:
+            grstate.record_object_dependencies(self.reference_base.obj)
         self.secondary = None
         self.focus = self.primary
         self.dnd_drop_targets = []
@@ -40,7 +40,6 @@ from gi.repository import Gtk
 from gramps.gen.config import config as global_config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.display.name import displayer as name_displayer
-from gramps.gen.utils.alive import probably_alive
 from gramps.gui.ddtargets import DdTargets
 
 # ------------------------------------------------------------------------
@@ -52,6 +51,7 @@ from ..actions import action_handler
 from ..common.common_const import _GENDERS
 from ..common.common_utils import get_person_color_css
 from ..common.common_vitals import format_date_string
+from ..common.lifespan import is_probably_alive
 from ..menus.menu_utils import (
     add_associations_menu,
     add_ldsords_menu,
@@ -201,7 +201,9 @@ class PersonCard(ReferenceCard):
                 living = False
 
         if living:
-            living = probably_alive(self.primary.obj, self.grstate.dbstate.db)
+            living = is_probably_alive(
+                self.grstate.dbstate.db, self.primary.obj
+            )
         return birth, death, living
 
     def __load_fields(self, grid_key, option_prefix, event_cache):
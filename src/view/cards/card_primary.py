@@ -32,6 +32,7 @@ PrimaryCard
 #
 # ------------------------------------------------------------------------
 import time
+from functools import partial
 
 # ------------------------------------------------------------------------
 #
@@ -71,6 +72,7 @@ from ..menus.menu_utils import (
     add_urls_menu,
     show_menu,
 )
+from ..services.service_deferred import DeferredLoadService
 from .card_object import ObjectCard
 from .card_widgets import GrampsImage
 from .card_utils import load_metadata
@@ -148,6 +150,10 @@ class PrimaryCard(ObjectCard):
                 "get_link": self.get_link,
             }
         )
+        defer = (
+            self.grstate.config.get("display.defer-card-details")
+            and "active" not in self.groptions.option_space
+        )
         for count in range(1, 11):
             option = self.get_option(
                 "%s%s" % (option_prefix, str(count)), full=False
@@ -158,12 +164,35 @@ class PrimaryCard(ObjectCard):
                 and len(option) > 1
                 and option[1]
             ):
+                if option[0] == "Calculated" and defer:
+                    placeholder = grid.add_placeholder()
+                    DeferredLoadService().defer(
+                        placeholder,
+                        partial(
+                            self.load_deferred_field,
+                            grid,
+                            placeholder,
+                            option,
+                            args,
+                        ),
+                        grstate=self.grstate,
+                    )
+                    continue
                 labels = field_builder(
                     self.grstate, self.primary.obj, option[0], option[1], args
                 )
                 for (label, value) in labels:
                     grid.add_fact(value, label=label)
 
+    def load_deferred_field(self, grid, placeholder, option, args):
+        """
+        Fill in a calculated field that was deferred.
+        """
+        labels = field_builder(
+            self.grstate, self.primary.obj, option[0], option[1], args
+        )
+        grid.fill_placeholder(placeholder, labels)
+
     def load_attributes(self):
         """
         Load any user defined attributes.
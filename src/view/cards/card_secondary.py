@@ -46,7 +46,6 @@ from gi.repository import Gtk
 #
 # ------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
-from gramps.gen.utils.alive import probably_alive
 
 # ------------------------------------------------------------------------
 #
@@ -55,6 +54,7 @@ from gramps.gen.utils.alive import probably_alive
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsObject
 from ..common.common_utils import get_person_color_css
+from ..common.lifespan import is_probably_alive
 from ..menus.menu_utils import (
     add_citations_menu,
     add_delete_menu_option,
@@ -180,7 +180,9 @@ class SecondaryCard(ObjectCard):
             self.grstate.config.get("display.use-color-scheme")
             and self.primary.obj_type == "Person"
         ):
-            living = probably_alive(self.primary.obj, self.grstate.dbstate.db)
+            living = is_probably_alive(
+                self.grstate.dbstate.db, self.primary.obj
+            )
             return get_person_color_css(
                 self.primary.obj,
                 living=living,
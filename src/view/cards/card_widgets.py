@@ -26,6 +26,13 @@
 Widgets supporting various sections of the card.
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from functools import partial
+
 # ------------------------------------------------------------------------
 #
 # GTK Modules
@@ -57,6 +64,7 @@ from ..common.common_const import (
     GROUP_LABELS_SINGLE,
 )
 from ..common.common_utils import button_pressed
+from ..services.service_deferred import DeferredLoadService
 from ..services.service_status import StatusIndicatorService
 from ..services.service_images import images_service
 
@@ -91,12 +99,42 @@ class CardGrid(Gtk.Grid):
         """
         Add a simple fact.
         """
+        self.attach_fact(fact, label, self.row)
+        self.row += 1
+
+    def attach_fact(self, fact, label, row):
+        """
+        Attach a fact at a given row.
+        """
         if label:
-            self.attach(label, 0, self.row, 1, 1)
-            self.attach(fact, 1, self.row, 1, 1)
+            self.attach(label, 0, row, 1, 1)
+            self.attach(fact, 1, row, 1, 1)
         else:
-            self.attach(fact, 0, self.row, 2, 1)
+            self.attach(fact, 0, row, 2, 1)
+
+    def add_placeholder(self):
+        """
+        Reserve a row for facts that will be filled in later.
+        """
+        placeholder = Gtk.Box()
+        self.attach(placeholder, 0, self.row, 2, 1)
         self.row += 1
+        return placeholder
+
+    def fill_placeholder(self, placeholder, facts):
+        """
+        Replace a placeholder with a list of label and fact tuples.
+        """
+        row = self.child_get_property(placeholder, "top-attach")
+        self.remove_row(row)
+        for (label, fact) in facts:
+            self.insert_row(row)
+            self.attach_fact(fact, label, row)
+            if label:
+                label.show_all()
+            fact.show_all()
+            row += 1
+        self.row += len(facts) - 1
 
     def add_facts(self, *args):
         column = 0
@@ -159,7 +197,19 @@ class CardIcons(Gtk.HBox, GrampsConfig):
         self.title = title
         self.grobject = grobject
 
-        self.load_status(grobject)
+        if (
+            self.grstate.config.get("display.defer-card-details")
+            and "active" not in self.groptions.option_space
+        ):
+            DeferredLoadService().defer(
+                self,
+                partial(self.load_status, grobject, deferred=True),
+                grstate=self.grstate,
+                batch=StatusIndicatorService().prepare_items,
+                item=(self.grstate, grobject.obj, self.icon_size),
+            )
+        else:
+            self.load_status(grobject)
         if self.grstate.config.get("indicator.child-objects"):
             self.load_indicators(grobject)
 
@@ -167,15 +217,23 @@ class CardIcons(Gtk.HBox, GrampsConfig):
             self.load_tags(grobject)
         self.show_all()
 
-    def load_status(self, grobject):
+    def load_status(self, grobject, deferred=False):
         """
-        Load status indicators for an object.
+        Load status indicators for an object. When deferred the icons are
+        placed ahead of any indicators and tags already loaded.
         """
         status_service = StatusIndicatorService()
-        for icon in status_service.get_status(
-            self.grstate, grobject.obj, self.icon_size
+        for position, icon in enumerate(
+            status_service.get_status(
+                self.grstate, grobject.obj, self.icon_size
+            )
         ):
-            self.flowbox.add(icon)
+            if deferred:
+                self.flowbox.insert(icon, position)
+            else:
+                self.flowbox.add(icon)
+        if deferred:
+            self.flowbox.show_all()
 
     def load_indicators(self, grobject):
         """
@@ -300,10 +358,7 @@ class CardIcons(Gtk.HBox, GrampsConfig):
         """
         Load tags for an object.
         """
-        tags = []
-        for handle in grobject.obj.tag_list:
-            tag = self.fetch("Tag", handle)
-            tags.append(tag)
+        tags = self.grstate.fetch_many("Tag", grobject.obj.tag_list)
 
         if self.grstate.config.get("indicator.tags-sort-by-name"):
             tags.sort(key=lambda x: x.name)
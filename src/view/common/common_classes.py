@@ -566,6 +566,9 @@ class GrampsState:
         "page_type",
         "methods",
         "templates",
+        "dependencies",
+        "dependency_group",
+        "fetch_cache",
     )
 
     def __init__(self, dbstate, uistate, callbacks, config):
@@ -577,6 +580,9 @@ class GrampsState:
         if callbacks:
             self.methods = callbacks.get("methods")
         self.templates = None
+        self.dependencies = None
+        self.dependency_group = None
+        self.fetch_cache = None
 
     def set_templates(self, templates):
         """
@@ -598,12 +604,122 @@ class GrampsState:
 
     def fetch(self, obj_type, obj_handle):
         """
-        Fetches an object from the database.
+        Fetches an object from the database, or from the fetch cache if
+        one is active.
         """
+        self.record_dependency(obj_handle)
+        if self.fetch_cache is not None:
+            key = (obj_type, obj_handle)
+            if key in self.fetch_cache:
+                return self.fetch_cache[key]
         try:
-            return self.methods[obj_type](obj_handle)
+            obj = self.methods[obj_type](obj_handle)
         except HandleError:
+            obj = None
+        if self.fetch_cache is not None:
+            self.fetch_cache[key] = obj
+        return obj
+
+    def fetch_many(self, obj_type, obj_handles):
+        """
+        Fetches a list of objects, loading any not yet cached.
+        """
+        return [self.fetch(obj_type, handle) for handle in obj_handles]
+
+    def cache_fetches(self):
+        """
+        Start caching fetched objects, so each is only loaded once while
+        a page is rendered.
+        """
+        self.fetch_cache = {}
+
+    def clear_fetch_cache(self):
+        """
+        Stop caching fetched objects and drop those cached.
+        """
+        self.fetch_cache = None
+
+    def track_dependencies(self):
+        """
+        Start recording the handles a page render depends on.
+        """
+        self.dependencies = {}
+        self.dependency_group = "header"
+
+    def clear_dependencies(self):
+        """
+        Stop recording dependencies, the page state is unknown.
+        """
+        self.dependencies = None
+        self.dependency_group = None
+
+    def set_dependency_group(self, group):
+        """
+        Set the page group subsequent dependencies are recorded against.
+        """
+        self.dependency_group = group
+
+    def record_dependency(self, handle):
+        """
+        Record a handle the current page group depends on.
+        """
+        if self.dependencies is not None and handle:
+            if self.dependency_group not in self.dependencies:
+                self.dependencies[self.dependency_group] = set()
+            self.dependencies[self.dependency_group].add(handle)
+
+    def record_object_dependencies(self, obj):
+        """
+        Record a primary object and all the objects it references. For the
+        header only the object itself is recorded, along with whatever it
+        fetches to display, so edits to the rest of what it references only
+        refresh the groups showing them.
+        """
+        if self.dependencies is not None and obj.handle:
+            self.record_dependency(obj.handle)
+            if self.dependency_group == "header":
+                return
+            for (
+                dummy_obj_type,
+                handle,
+            ) in obj.get_referenced_handles_recursively():
+                self.record_dependency(handle)
+
+    def find_dependent_groups(
+        self, obj_type, handles, check_references, exclude=None
+    ):
+        """
+        Return the set of page groups depending on any of the given handles,
+        or None if the page dependencies are not known. If requested the
+        changed objects are also checked for references to anything on the
+        page so new back references are caught. An excluded handle, usually
+        the page object itself, is ignored.
+        """
+        if not self.dependencies:
             return None
+        handles = set(handles)
+        handles.discard(exclude)
+        groups = set()
+        for group, group_handles in self.dependencies.items():
+            if not handles.isdisjoint(group_handles):
+                groups.add(group)
+        if groups or not check_references:
+            return groups
+
+        for handle in handles:
+            try:
+                obj = self.methods[obj_type](handle)
+            except HandleError:
+                continue
+            if not obj:
+                continue
+            references = set(
+                x[1] for x in obj.get_referenced_handles_recursively()
+            )
+            for group, group_handles in self.dependencies.items():
+                if not references.isdisjoint(group_handles):
+                    groups.add(group)
+        return groups
 
     def fetch_page_context(self):
         """
@@ -35,7 +35,6 @@ from gramps.gen.display.name import displayer as name_displayer
 from gramps.gen.lib import EventType, Person, Span
 from gramps.gen.lib.date import Today
 from gramps.gen.relationship import get_relationship_calculator
-from gramps.gen.utils.alive import probably_alive
 from gramps.gen.utils.db import family_name
 
 # ------------------------------------------------------------------------
@@ -44,6 +43,8 @@ from gramps.gen.utils.db import family_name
 #
 # ------------------------------------------------------------------------
 from .common_utils import get_confidence
+from .lifespan import is_probably_alive
+from .timeline import get_event_category
 
 _ = glocale.translation.sgettext
 
@@ -216,23 +217,6 @@ def get_participants_text(participants, primary=None):
     return text
 
 
-def get_event_category(db, event):
-    """
-    Return the category for grouping an event.
-    """
-    event_type = event.get_type()
-    for entry in event_type.get_menu_standard_xml():
-        event_key = entry[0].lower().replace("life events", "vital")
-        for event_id in entry[1]:
-            if event_type == event_id:
-                return event_key
-    custom_event_types = db.get_event_types()
-    for event_name in custom_event_types:
-        if event_type.xml_str() == event_name:
-            return "custom"
-    return "other"
-
-
 def get_person_birth_or_death(db, handle, birth=True):
     """
     Get person and birth or death event given a handle.
@@ -292,7 +276,7 @@ def get_marriage_duration(db, family_obj_or_handle):
     if mother_sortval:
         return get_age(marriage, mother_death, strip=True)
 
-    if probably_alive(father, db) and probably_alive(mother, db):
+    if is_probably_alive(db, father) and is_probably_alive(db, mother):
         today = Today()
         return get_age(marriage, None, today=today, strip=True)
     return ""
@@ -0,0 +1,175 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+LifespanIndex
+"""
+
+# ------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# ------------------------------------------------------------------------
+from gramps.gen.errors import HandleError
+from gramps.gen.lib.date import Today
+from gramps.gen.utils.alive import probably_alive_range
+
+
+# ------------------------------------------------------------------------
+#
+# LifespanRecorder Class
+#
+# ------------------------------------------------------------------------
+class LifespanRecorder:
+    """
+    Wraps a database to record the handles of the people, families and
+    events read while estimating a lifespan.
+    """
+
+    __slots__ = ("db_handle", "handles")
+
+    def __init__(self, db_handle):
+        self.db_handle = db_handle
+        self.handles = set()
+
+    def __getattr__(self, name):
+        return getattr(self.db_handle, name)
+
+    def get_person_from_handle(self, handle):
+        """
+        Fetch a person, recording the handle.
+        """
+        self.handles.add(handle)
+        return self.db_handle.get_person_from_handle(handle)
+
+    def get_family_from_handle(self, handle):
+        """
+        Fetch a family, recording the handle.
+        """
+        self.handles.add(handle)
+        return self.db_handle.get_family_from_handle(handle)
+
+    def get_event_from_handle(self, handle):
+        """
+        Fetch an event, recording the handle.
+        """
+        self.handles.add(handle)
+        return self.db_handle.get_event_from_handle(handle)
+
+
+# ------------------------------------------------------------------------
+#
+# LifespanIndex Class
+#
+# ------------------------------------------------------------------------
+class LifespanIndex:
+    """
+    Memo of the estimated birth and death date ranges for people, as
+    these may take a walk through parents, spouses and children to infer.
+    The memo does not follow the database signals itself, the timeline
+    cache service forwards the changes to it so it is always current
+    before any page is redrawn.
+    """
+
+    __slots__ = ("db_handle", "lifespans", "dependencies")
+
+    def __init__(self):
+        self.db_handle = None
+        self.lifespans = {}
+        self.dependencies = {}
+
+    def reset(self, *_dummy_args):
+        """
+        Drop all the memoised lifespans.
+        """
+        self.lifespans = {}
+        self.dependencies = {}
+
+    def objects_changed(self, handles):
+        """
+        Drop the memoised lifespans that depend on changed objects.
+        """
+        for handle in handles:
+            for key in self.dependencies.pop(handle, []):
+                self.lifespans.pop(key, None)
+
+    def get_lifespan(self, db_handle, person):
+        """
+        Return the estimated (birth, death, explanation, related person)
+        for a person and the handles it was derived from.
+        """
+        if db_handle is not self.db_handle:
+            self.db_handle = db_handle
+            self.reset()
+        key = person.handle
+        if key not in self.lifespans:
+            recorder = LifespanRecorder(db_handle)
+            lifespan = probably_alive_range(person, recorder)
+            recorder.handles.add(key)
+            self.lifespans[key] = (lifespan, recorder.handles)
+            for handle in recorder.handles:
+                self.dependencies.setdefault(handle, set()).add(key)
+        return self.lifespans[key]
+
+    def is_alive(self, db_handle, person):
+        """
+        Return True if a person is probably alive today. Like Gramps a
+        person lacking either estimate is considered alive.
+        """
+        lifespan, dummy_handles = self.get_lifespan(db_handle, person)
+        birth, death = lifespan[0], lifespan[1]
+        if not birth or not death:
+            return True
+        today = Today()
+        return today.match(birth, ">=") and today.match(death, "<=")
+
+    def warm_up(self, db_handle, handles):
+        """
+        Estimate the lifespans for a set of people in one pass before their
+        cards are built, so later lookups are served from the memo. People
+        that can not be fetched are skipped.
+        """
+        for handle in handles:
+            if db_handle is self.db_handle and handle in self.lifespans:
+                continue
+            try:
+                person = db_handle.get_person_from_handle(handle)
+            except HandleError:
+                continue
+            if person:
+                self.get_lifespan(db_handle, person)
+
+
+LIFESPANS = LifespanIndex()
+
+
+def get_lifespan(db_handle, person):
+    """
+    Return the estimated (birth, death, explanation, related person) for a
+    person.
+    """
+    return LIFESPANS.get_lifespan(db_handle, person)[0]
+
+
+def is_probably_alive(db_handle, person):
+    """
+    Return True if a person is probably alive today.
+    """
+    return LIFESPANS.is_alive(db_handle, person)
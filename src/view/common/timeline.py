@@ -22,15 +22,29 @@
 GrampsTimeline
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from heapq import heapify, heappop
+
 # ------------------------------------------------------------------------
 #
 # Gramps Modules
 #
 # ------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
-from gramps.gen.lib import Date, EventType, Span
+from gramps.gen.errors import HandleError
+from gramps.gen.lib import ChildRefType, Date, EventType, Span
 from gramps.gen.relationship import get_relationship_calculator
-from gramps.gen.utils.alive import probably_alive_range
+
+# ------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# ------------------------------------------------------------------------
+from .lifespan import LIFESPANS
 
 event_type = EventType()
 
@@ -86,12 +100,398 @@ EVENT_CATEGORIES = [
 # A group timeline will filter on all events for a specific grouping of people
 # and families.
 #
-# A date timeline will filter on all events between a given set of dates.
+# A span timeline will filter on all events between a given set of dates,
+# optionally only those in a place or with a tag.
 #
 # A place timeline will filter on all events in a given place between an
 # optional set of dates.
 
 
+# ------------------------------------------------------------------------
+#
+# EventCategoryIndex Class
+#
+# ------------------------------------------------------------------------
+class EventCategoryIndex:
+    """
+    Lookup table for the category used to group each event type. The
+    standard types are mapped once, the custom types are gathered once per
+    database and gathered again after events are added or updated as that
+    may introduce new custom types.
+    """
+
+    __slots__ = ("db_handle", "categories", "members", "custom")
+
+    def __init__(self):
+        self.db_handle = None
+        self.categories = {}
+        self.members = {}
+        self.custom = None
+        default_event_map = event_type.get_map()
+        for entry in event_type.get_menu_standard_xml():
+            event_key = entry[0].lower().replace("life events", "vital")
+            members = self.members.setdefault(event_key, set())
+            for event_id in entry[1]:
+                self.categories.setdefault(int(event_id), event_key)
+                if event_id in default_event_map:
+                    members.add(default_event_map[event_id])
+
+    def get_custom_types(self, db_handle):
+        """
+        Return the set of custom event types for a database.
+        """
+        if db_handle is not self.db_handle:
+            self.db_handle = db_handle
+            self.custom = None
+            for signal in ["event-add", "event-update", "event-rebuild"]:
+                db_handle.connect(signal, self.reset)
+        if self.custom is None:
+            self.custom = set(db_handle.get_event_types())
+        return self.custom
+
+    def reset(self, *_dummy_args):
+        """
+        Drop the custom event types so they are gathered again.
+        """
+        self.custom = None
+
+    def get_category(self, db_handle, type_event):
+        """
+        Return the category for grouping an event type.
+        """
+        category = self.categories.get(int(type_event))
+        if category:
+            return category
+        if type_event.xml_str() in self.get_custom_types(db_handle):
+            return "custom"
+        return "other"
+
+    def get_members(self, category):
+        """
+        Return the names of the standard event types in a category.
+        """
+        return self.members.get(category, set())
+
+
+CATEGORY_INDEX = EventCategoryIndex()
+
+
+def get_event_category(db_handle, event):
+    """
+    Return the category for grouping an event.
+    """
+    return CATEGORY_INDEX.get_category(db_handle, event.get_type())
+
+
+# ------------------------------------------------------------------------
+#
+# UnionSortvalIndex Class
+#
+# ------------------------------------------------------------------------
+class UnionSortvalIndex:
+    """
+    Memo of the synthetic sort values for undated family unions and
+    dissolutions. The memo does not follow the database signals itself,
+    the timeline cache service forwards the changes to it so it is always
+    current before any page is redrawn.
+    """
+
+    __slots__ = ("db_handle", "sortvals", "dependencies")
+
+    def __init__(self):
+        self.db_handle = None
+        self.sortvals = {}
+        self.dependencies = {}
+
+    def reset(self, *_dummy_args):
+        """
+        Drop all the memoised sort values.
+        """
+        self.sortvals = {}
+        self.dependencies = {}
+
+    def objects_changed(self, handles):
+        """
+        Drop the memoised sort values that depend on changed objects.
+        """
+        for handle in handles:
+            for key in self.dependencies.pop(handle, []):
+                self.sortvals.pop(key, None)
+
+    def get_sortval(self, db_handle, family, union=True):
+        """
+        Return the synthetic sort value for an undated union or dissolution
+        and the handles it was derived from.
+        """
+        if db_handle is not self.db_handle:
+            self.db_handle = db_handle
+            self.reset()
+        key = (family.handle, bool(union))
+        if key not in self.sortvals:
+            sortval, handles = generate_union_sortval(
+                db_handle, family, union=union
+            )
+            self.sortvals[key] = (sortval, handles)
+            for handle in handles:
+                self.dependencies.setdefault(handle, set()).add(key)
+        return self.sortvals[key]
+
+
+UNION_SORTVALS = UnionSortvalIndex()
+
+
+def generate_union_sortval(db_handle, family, union=True):
+    """
+    For an undated family union or disolution try to generate a synthetic
+    sortval based on birth of first or last child if one is present and
+    does have a known date. Will not always work but at least we attempted
+    to place the event in sequence. Returns the sortval and the handles of
+    the objects examined.
+    """
+    index = int(bool(union)) - 1
+    offset = -int(bool(union)) or 1
+    handles = [family.handle]
+    child_handles = family.child_ref_list
+    if child_handles:
+        child = db_handle.get_person_from_handle(child_handles[index].ref)
+        handles.append(child.handle)
+        birth = None
+        birth_fallback = None
+        get_event_from_handle = db_handle.get_event_from_handle
+        for event_ref in child.get_primary_event_ref_list():
+            handles.append(event_ref.ref)
+            event = get_event_from_handle(event_ref.ref)
+            if event.type.is_birth():
+                birth = event
+                break
+            if (
+                not birth
+                and not birth_fallback
+                and event.type.is_birth_fallback()
+            ):
+                birth_fallback = event
+                break
+        if not birth and birth_fallback:
+            birth = birth_fallback
+        if birth and birth.date.sortval:
+            return birth.date.sortval + offset, handles
+    return 0, handles
+
+
+# ------------------------------------------------------------------------
+#
+# RelationshipIndex Class
+#
+# ------------------------------------------------------------------------
+class RelationshipIndex:
+    """
+    Relationship index for the people in a timeline. The blood relatives of
+    a person within a given depth are found with one walk up to their
+    ancestors and back down to the descendants of each, after which every
+    relationship label is built from the generation distances by a single
+    relationship calculator instead of a new search for each relative.
+    """
+
+    __slots__ = (
+        "db_handle",
+        "calculator",
+        "people",
+        "relatives",
+        "descendants",
+    )
+
+    def __init__(self, db_handle, locale=glocale):
+        """
+        Initialize relationship index.
+        """
+        self.db_handle = db_handle
+        self.calculator = get_relationship_calculator(
+            reinit=True, clocale=locale
+        )
+        self.people = {}
+        self.relatives = {}
+        self.descendants = {}
+
+    def get_person(self, handle):
+        """
+        Return a person, fetching them only once.
+        """
+        if handle not in self.people:
+            self.people[handle] = self.db_handle.get_person_from_handle(
+                handle
+            )
+        return self.people[handle]
+
+    def get_relationship(self, person, other, depth):
+        """
+        Return the relationship of the other person to a person.
+        """
+        if person.handle == other.handle:
+            return ""
+        calculator = self.calculator
+        spouse = calculator.is_spouse(self.db_handle, person, other)
+        if spouse:
+            return spouse
+
+        key = (person.handle, depth)
+        if key not in self.relatives:
+            self.relatives[key] = self.find_relatives(person.handle, depth)
+        relation = self.relatives[key].get(other.handle)
+        if not relation:
+            return ""
+        path_orig, path_other = relation
+        if len(path_orig) == len(path_other) == 1:
+            return calculator.get_sibling_relationship_string(
+                calculator.get_sibling_type(self.db_handle, person, other),
+                person.get_gender(),
+                other.get_gender(),
+            )
+        return calculator.get_single_relationship_string(
+            len(path_orig),
+            len(path_other),
+            person.get_gender(),
+            other.get_gender(),
+            path_orig,
+            path_other,
+            only_birth=calculator.only_birth(path_orig)
+            and calculator.only_birth(path_other),
+        )
+
+    def find_relatives(self, handle, depth):
+        """
+        Find the blood relatives of a person within a depth. For each the
+        paths up to the closest common ancestor from both sides are kept,
+        using the notation of the relationship calculator. When both
+        parents in a family are common ancestors the paths are collapsed
+        to the family.
+        """
+        relatives = {}
+        for ancestor_handle, path_orig in self.find_ancestors(
+            handle, depth
+        ).items():
+            for other_handle, path_other in self.find_descendants(
+                ancestor_handle, depth
+            ).items():
+                if other_handle not in relatives:
+                    relatives[other_handle] = (path_orig, path_other)
+                    continue
+                current_orig, current_other = relatives[other_handle]
+                rank = len(path_orig) + len(path_other)
+                if rank < len(current_orig) + len(current_other):
+                    relatives[other_handle] = (path_orig, path_other)
+                else:
+                    collapsed = self.collapse_paths(
+                        (current_orig, current_other), (path_orig, path_other)
+                    )
+                    if collapsed:
+                        relatives[other_handle] = collapsed
+        relatives.pop(handle, None)
+        return relatives
+
+    def collapse_paths(self, first, second):
+        """
+        Collapse two paths through the father and mother in a family into a
+        path through the family, or return None if they can not be.
+        """
+        collapsed = []
+        for path_first, path_second in zip(first, second):
+            if not path_first or path_first[:-1] != path_second[:-1]:
+                return None
+            ends = path_first[-1] + path_second[-1]
+            if ends.lower() not in ["fm", "mf"]:
+                return None
+            if ends in ["fm", "mf"]:
+                end = self.calculator.REL_FAM_BIRTH
+            elif ends in ["FM", "MF"]:
+                end = self.calculator.REL_FAM_NONBIRTH
+            elif "m" in ends:
+                end = self.calculator.REL_FAM_BIRTH_MOTH_ONLY
+            else:
+                end = self.calculator.REL_FAM_BIRTH_FATH_ONLY
+            collapsed.append(path_first[:-1] + end)
+        return tuple(collapsed)
+
+    def find_ancestors(self, handle, depth):
+        """
+        Find the ancestors of a person within a depth along with the path
+        up to each of them.
+        """
+        calculator = self.calculator
+        get_family_from_handle = self.db_handle.get_family_from_handle
+        ancestors = {handle: ""}
+        generation = [handle]
+        for dummy_depth in range(depth):
+            parents = []
+            for child_handle in generation:
+                child = self.get_person(child_handle)
+                for family_handle in child.parent_family_list:
+                    family = get_family_from_handle(family_handle)
+                    for child_ref in family.child_ref_list:
+                        if child_ref.ref == child_handle:
+                            break
+                    else:
+                        continue
+                    for parent_handle, birth, step in [
+                        (
+                            family.father_handle,
+                            child_ref.frel == ChildRefType.BIRTH,
+                            calculator.REL_FATHER,
+                        ),
+                        (
+                            family.mother_handle,
+                            child_ref.mrel == ChildRefType.BIRTH,
+                            calculator.REL_MOTHER,
+                        ),
+                    ]:
+                        if parent_handle and parent_handle not in ancestors:
+                            if not birth:
+                                step = step.upper()
+                            ancestors[parent_handle] = (
+                                ancestors[child_handle] + step
+                            )
+                            parents.append(parent_handle)
+            generation = parents
+        return ancestors
+
+    def find_descendants(self, handle, depth):
+        """
+        Find the descendants of a person within a depth along with the path
+        up from each of them.
+        """
+        key = (handle, depth)
+        if key in self.descendants:
+            return self.descendants[key]
+        calculator = self.calculator
+        get_family_from_handle = self.db_handle.get_family_from_handle
+        descendants = {handle: ""}
+        generation = [handle]
+        for dummy_depth in range(depth):
+            children = []
+            for parent_handle in generation:
+                parent = self.get_person(parent_handle)
+                for family_handle in parent.family_list:
+                    family = get_family_from_handle(family_handle)
+                    is_father = family.father_handle == parent_handle
+                    for child_ref in family.child_ref_list:
+                        if child_ref.ref in descendants:
+                            continue
+                        if is_father:
+                            step = calculator.REL_FATHER
+                            birth = child_ref.frel == ChildRefType.BIRTH
+                        else:
+                            step = calculator.REL_MOTHER
+                            birth = child_ref.mrel == ChildRefType.BIRTH
+                        if not birth:
+                            step = step.upper()
+                        descendants[child_ref.ref] = (
+                            step + descendants[parent_handle]
+                        )
+                        children.append(child_ref.ref)
+            generation = children
+        self.descendants[key] = descendants
+        return descendants
+
+
 # ------------------------------------------------------------------------
 #
 # GrampsTimeline Class
@@ -120,6 +520,10 @@ class GrampsTimeline:
         "relative_event_filters",
         "cached_people",
         "cached_events",
+        "event_refs",
+        "sorted_length",
+        "referenced",
+        "relationships",
     )
 
     def __init__(
@@ -156,7 +560,11 @@ class GrampsTimeline:
         self.set_relative_event_filters(self.relative_event_filters)
 
         self.cached_people = {}
-        self.cached_events = []
+        self.cached_events = set()
+        self.event_refs = {}
+        self.sorted_length = 0
+        self.referenced = set()
+        self.relationships = None
 
         if dates and "-" in dates:
             start, end = dates.split("-")
@@ -223,8 +631,7 @@ class GrampsTimeline:
         eligible_events.add("Birth")
         eligible_events.add("Death")
         default_event_types = event_type.get_standard_xml()
-        default_event_map = event_type.get_map()
-        custom_event_types = self.db_handle.get_event_types()
+        custom_event_types = CATEGORY_INDEX.get_custom_types(self.db_handle)
         for key in event_filters:
             if key in default_event_types:
                 eligible_events.add(key)
@@ -236,32 +643,16 @@ class GrampsTimeline:
                 raise ValueError(
                     "{} is not a valid event or event category".format(key)
                 )
-        for entry in event_type.get_menu_standard_xml():
-            event_key = entry[0].lower().replace("life events", "vital")
-            if event_key in event_filters:
-                for event_id in entry[1]:
-                    if event_id in default_event_map:
-                        eligible_events.add(default_event_map[event_id])
+            eligible_events.update(CATEGORY_INDEX.get_members(key))
         if "custom" in event_filters:
-            for event_name in custom_event_types:
-                eligible_events.add(event_name)
+            eligible_events.update(custom_event_types)
         return eligible_events
 
     def get_category(self, event):
         """
         Return the category for grouping the event.
         """
-        type_event = event.get_type()
-        for entry in type_event.get_menu_standard_xml():
-            event_key = entry[0].lower().replace("life events", "vital")
-            for event_id in entry[1]:
-                if type_event == event_id:
-                    return event_key
-        custom_event_types = self.db_handle.get_event_types()
-        for event_name in custom_event_types:
-            if type_event.xml_str() == event_name:
-                return "custom"
-        return "other"
+        return CATEGORY_INDEX.get_category(self.db_handle, event.get_type())
 
     def get_age(self, start_date, date):
         """
@@ -323,12 +714,8 @@ class GrampsTimeline:
                 if not role.is_primary() and not role.is_family():
                     primary = self.get_primary_event_participant(event.handle)
                     if primary:
-                        calculator = get_relationship_calculator(
-                            reinit=True, clocale=self.locale
-                        )
-                        calculator.set_depth(4)
-                        relationship = calculator.get_one_relationship(
-                            self.db_handle, person, primary
+                        relationship = self.get_relationship(
+                            person, primary, 4
                         )
             self.timeline.append(
                 (
@@ -343,7 +730,18 @@ class GrampsTimeline:
                     ),
                 )
             )
-            self.cached_events.append(event.handle)
+            self.cached_events.add(event.handle)
+
+    def get_relationship(self, person, other, depth):
+        """
+        Return the relationship of the other person to a person, using the
+        relationship index for the current build.
+        """
+        if self.relationships is None:
+            self.relationships = RelationshipIndex(
+                self.db_handle, locale=self.locale
+            )
+        return self.relationships.get_relationship(person, other, depth)
 
     def get_primary_event_participant(self, handle):
         """
@@ -353,16 +751,28 @@ class GrampsTimeline:
         for backlink in self.db_handle.find_backlink_handles(
             handle, include_classes=["Person"]
         ):
+            self.referenced.add(backlink[1])
             person = get_person_from_handle(backlink[1])
             if person:
-                for event_ref in person.get_primary_event_ref_list():
-                    if (
-                        handle == event_ref.ref
-                        and event_ref.get_role().is_primary()
-                    ):
-                        return person
+                dummy_event_refs, primary_refs = self.get_event_refs(person)
+                if handle in primary_refs:
+                    return person
         return None
 
+    def get_event_refs(self, person):
+        """
+        Return maps of event handle to the first event reference and to the
+        first primary event reference for a person, built once per timeline.
+        """
+        if person.handle not in self.event_refs:
+            event_refs, primary_refs = {}, {}
+            for event_ref in person.event_ref_list:
+                event_refs.setdefault(event_ref.ref, event_ref)
+                if event_ref.get_role().is_primary():
+                    primary_refs.setdefault(event_ref.ref, event_ref)
+            self.event_refs[person.handle] = (event_refs, primary_refs)
+        return self.event_refs[person.handle]
+
     def prepare_event_sortvals(self, events):
         """
         Prepare keys for sorting constructing synthetic keys when we can for
@@ -400,38 +810,14 @@ class GrampsTimeline:
 
     def generate_union_event_sortval(self, family, union=True):
         """
-        For an undated family union or disolution try to generate a synthetic
-        sortval based on birth of first or last child if one is present and
-        does have a known date. Will not always work but at least we attempted
-        to place the event in sequence.
-        """
-        index = int(bool(union)) - 1
-        offset = -int(bool(union)) or 1
-        child_handles = family.child_ref_list
-        if child_handles:
-            child = self.db_handle.get_person_from_handle(
-                child_handles[index].ref
-            )
-            birth = None
-            birth_fallback = None
-            get_event_from_handle = self.db_handle.get_event_from_handle
-            for event_ref in child.get_primary_event_ref_list():
-                event = get_event_from_handle(event_ref.ref)
-                if event.type.is_birth():
-                    birth = event
-                    break
-                if (
-                    not birth
-                    and not birth_fallback
-                    and event.type.is_birth_fallback()
-                ):
-                    birth_fallback = event
-                    break
-            if not birth and birth_fallback:
-                birth = birth_fallback
-            if birth and birth.date.sortval:
-                return birth.date.sortval + offset
-        return 0
+        For an undated family union or disolution return the synthetic
+        sortval from the shared memo.
+        """
+        sortval, handles = UNION_SORTVALS.get_sortval(
+            self.db_handle, family, union=union
+        )
+        self.referenced.update(handles)
+        return sortval
 
     def extract_person_events(self, person, relative=False):
         """
@@ -447,7 +833,9 @@ class GrampsTimeline:
         events = []
         get_event_from_handle = self.db_handle.get_event_from_handle
         get_family_from_handle = self.db_handle.get_family_from_handle
+        self.referenced.add(person.handle)
         for event_ref in person.event_ref_list:
+            self.referenced.add(event_ref.ref)
             role = event_ref.get_role()
             event = get_event_from_handle(event_ref.ref)
             if role.is_primary():
@@ -479,8 +867,10 @@ class GrampsTimeline:
 
         events = []
         for family_handle in person.family_list:
+            self.referenced.add(family_handle)
             family = get_family_from_handle(family_handle)
             for event_ref in family.event_ref_list:
+                self.referenced.add(event_ref.ref)
                 events.append(
                     (
                         get_event_from_handle(event_ref.ref),
@@ -488,7 +878,7 @@ class GrampsTimeline:
                         family,
                     )
                 )
-            timeline = timeline + self.prepare_event_sortvals(events)
+            timeline.extend(self.prepare_event_sortvals(events))
         return timeline, birth, death
 
     def set_person(
@@ -503,7 +893,13 @@ class GrampsTimeline:
         self.timeline = []
         self.timeline_type = "person"
         self.cached_people = {}
-        self.cached_events = []
+        self.cached_events = set()
+        self.event_refs = {}
+        self.sorted_length = 0
+        self.referenced = set()
+        self.relationships = RelationshipIndex(
+            self.db_handle, locale=self.locale
+        )
 
         person = self.db_handle.get_person_from_handle(handle)
         timeline, birth, death = self.extract_person_events(person)
@@ -518,7 +914,10 @@ class GrampsTimeline:
             self.depth = max(ancestors, offspring) + 1
             timeline.sort(key=lambda x: x[0])
             if not birth or not death:
-                lifespan = probably_alive_range(person, self.db_handle)
+                lifespan, handles = LIFESPANS.get_lifespan(
+                    self.db_handle, person
+                )
+                self.referenced.update(handles)
             if self.start_date is None:
                 if birth:
                     self.start_date = birth.date
@@ -557,13 +956,10 @@ class GrampsTimeline:
         """
         if not self.eligible_relatives:
             return
+        self.referenced.add(handle)
         person = self.db_handle.get_person_from_handle(handle)
-        calculator = get_relationship_calculator(
-            reinit=True, clocale=self.locale
-        )
-        calculator.set_depth(self.depth)
-        relationship = calculator.get_one_relationship(
-            self.db_handle, self.reference_person, person
+        relationship = self.get_relationship(
+            self.reference_person, person, self.depth
         )
         for relative in self.eligible_relatives:
             if relative in relationship:
@@ -626,6 +1022,7 @@ class GrampsTimeline:
         """
         Add events for all family members to the timeline.
         """
+        self.referenced.add(handle)
         family = self.db_handle.get_family_from_handle(handle)
         if self.reference_person:
             if (
@@ -662,24 +1059,136 @@ class GrampsTimeline:
         self.timeline = []
         self.timeline_type = "family"
         self.cached_people = {}
-        self.cached_events = []
+        self.cached_events = set()
+        self.event_refs = {}
+        self.sorted_length = 0
+        self.referenced = set()
+        self.relationships = RelationshipIndex(
+            self.db_handle, locale=self.locale
+        )
 
         self.add_family(handle, ancestors, offspring)
 
     def set_place(
         self,
         handle,
+        place_index=None,
     ):
         """
-        Generate a place timeline.
+        Generate a place timeline. If a place index is available the events
+        are read from it instead of searching the place hierarchy.
         """
         self.timeline = []
         self.timeline_type = "place"
-        self.add_place(handle)
+        self.cached_events = set()
+        self.event_refs = {}
+        self.sorted_length = 0
+        self.referenced = set()
+        if place_index:
+            self.add_indexed_place(handle, place_index)
+        else:
+            self.add_place(handle)
+
+    def set_span(
+        self,
+        start_date=None,
+        end_date=None,
+        place=None,
+        tag=None,
+        event_index=None,
+    ):
+        """
+        Generate a timeline of the events between two dates, optionally only
+        those in a place and the places it encloses or with a given tag. If
+        an event index is available the events are read from it instead of
+        scanning all the events.
+        """
+        self.timeline = []
+        self.timeline_type = "span"
+        self.cached_events = set()
+        self.event_refs = {}
+        self.sorted_length = 0
+        self.referenced = set()
+        if start_date:
+            self.set_start_date(start_date)
+        if end_date:
+            self.set_end_date(end_date)
+        if event_index:
+            start, end = self.get_sortval_range()
+            self.add_indexed_events(
+                event_index.get_span_events(
+                    start=start, end=end, place=place, tag=tag
+                )
+            )
+            return
+        if place:
+            self.add_place(place, tag=tag)
+        else:
+            for event in self.db_handle.iter_events():
+                self.merge_generic_event(event, tag=tag)
+
+    def get_sortval_range(self):
+        """
+        Return the sort values for the start and end dates if set.
+        """
+        start = end = None
+        if self.start_date:
+            start = self.start_date.sortval
+        if self.end_date:
+            end = self.end_date.sortval
+        return start, end
+
+    def add_indexed_place(self, handle, place_index):
+        """
+        Add the events for a given place using the place index.
+        """
+        start, end = self.get_sortval_range()
+        self.add_indexed_events(
+            place_index.get_events(handle, start=start, end=end)
+        )
+
+    def add_indexed_events(self, events):
+        """
+        Add the (sortval, event handle, primary participant handle) events
+        read from an index, skipping any that no longer resolve.
+        """
+        get_event_from_handle = self.db_handle.get_event_from_handle
+        get_person_from_handle = self.db_handle.get_person_from_handle
+        for sortval, event_handle, person_handle in events:
+            if not person_handle or event_handle in self.cached_events:
+                continue
+            try:
+                event = get_event_from_handle(event_handle)
+            except HandleError:
+                continue
+            if not self.is_eligible(event, None):
+                continue
+            try:
+                primary = get_person_from_handle(person_handle)
+            except HandleError:
+                continue
+            event_refs, dummy_primary_refs = self.get_event_refs(primary)
+            event_ref = event_refs.get(event_handle)
+            if event_ref:
+                self.timeline.append(
+                    (
+                        sortval,
+                        (
+                            event,
+                            event_ref,
+                            primary,
+                            None,
+                            None,
+                            self.get_category(event),
+                        ),
+                    )
+                )
+                self.cached_events.add(event_handle)
 
-    def add_place(self, handle, depth=0):
+    def add_place(self, handle, depth=0, tag=None):
         """
-        Build a list of events for a given place.
+        Build a list of events for a given place, optionally only those with
+        a given tag.
         """
         if depth > 8:
             return
@@ -693,17 +1202,20 @@ class GrampsTimeline:
                 place = get_place_from_handle(obj_handle)
                 for place_ref in place.placeref_list:
                     if place_ref.ref == handle:
-                        self.add_place(obj_handle, depth=depth + 1)
+                        self.add_place(obj_handle, depth=depth + 1, tag=tag)
             if obj_type == "Event":
                 event = get_event_from_handle(obj_handle)
-                self.merge_generic_event(event)
+                self.merge_generic_event(event, tag=tag)
 
-    def merge_generic_event(self, event):
+    def merge_generic_event(self, event, tag=None):
         """
-        Filter and merge an eligible event into the master timeline.
+        Filter and merge an eligible event into the master timeline,
+        optionally only if it has a given tag.
         """
         if event.handle in self.cached_events:
             return
+        if tag and tag not in event.tag_list:
+            return
         if not self.is_eligible(event, None):
             return
         date = event.get_date_object()
@@ -717,33 +1229,73 @@ class GrampsTimeline:
             return
         primary = self.get_primary_event_participant(event.handle)
         if primary:
-            for event_ref in primary.event_ref_list:
-                if event_ref.ref == event.handle:
-                    self.timeline.append(
+            event_refs, dummy_primary_refs = self.get_event_refs(primary)
+            event_ref = event_refs.get(event.handle)
+            if event_ref:
+                self.timeline.append(
+                    (
+                        sortval,
                         (
-                            sortval,
-                            (
-                                event,
-                                event_ref,
-                                primary,
-                                None,
-                                None,
-                                self.get_category(event),
-                            ),
-                        )
+                            event,
+                            event_ref,
+                            primary,
+                            None,
+                            None,
+                            self.get_category(event),
+                        ),
                     )
-                    self.cached_events.append(event.handle)
-                    break
+                )
+                self.cached_events.add(event.handle)
         return
 
     def events(self, raw=False):
         """
         Return the list of sorted events.
         """
-        self.timeline.sort(key=lambda x: x[0])
+        self.sort_events()
         if raw:
             return self.timeline
         events = []
         for dummy_sortval, event in self.timeline:
             events.append(event)
         return events
+
+    def get_referenced_handles(self):
+        """
+        Return the handles of the people, families and events read while
+        building a person or family timeline, a change to any of which may
+        change the timeline.
+        """
+        handles = set(self.referenced)
+        if self.relationships:
+            handles.update(self.relationships.people)
+        return handles
+
+    def sort_events(self):
+        """
+        Sort the timeline if events were added since it was last sorted.
+        """
+        if len(self.timeline) != self.sorted_length:
+            self.timeline.sort(key=lambda x: x[0])
+            self.sorted_length = len(self.timeline)
+
+    def iter_events(self, raw=False):
+        """
+        Return an iterator yielding the events in sorted order, ordering
+        them only as they are consumed if not already sorted.
+        """
+        if len(self.timeline) == self.sorted_length:
+            for item in self.timeline:
+                yield item if raw else item[1]
+            return
+        keys = [
+            (sortval, index)
+            for index, (sortval, dummy_event) in enumerate(self.timeline)
+        ]
+        heapify(keys)
+        while keys:
+            dummy_sortval, index = heappop(keys)
+            if raw:
+                yield self.timeline[index]
+            else:
+                yield self.timeline[index][1]
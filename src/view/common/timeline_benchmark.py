@@ -0,0 +1,236 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Timeline benchmark
+
+Generates a temporary SQLite tree for each requested number of events, in
+which one person takes part in all of them at a single place, and times
+building the person and place timelines. The time per event should stay
+flat as the number of events grows. Like the statistics benchmark it is
+run standalone:
+
+    python3 timeline_benchmark.py -e 1000 10000 20000 -r report.json
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    Date,
+    Event,
+    EventRef,
+    EventRoleType,
+    EventType,
+    Person,
+    Place,
+    PlaceName,
+)
+from gramps.version import VERSION
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+)
+from view.common.timeline import GrampsTimeline
+
+# Types of the generated events, and the share the person only witnesses
+# with another person as the primary participant.
+EVENT_TYPES = [
+    EventType.RESIDENCE,
+    EventType.OCCUPATION,
+    EventType.CENSUS,
+    EventType.EDUCATION,
+    EventType.RELIGION,
+]
+WITNESS_RATIO = 0.2
+
+
+def generate_tree(path, events, seed):
+    """
+    Fill a new SQLite tree with a person taking part in a number of events.
+    """
+    db = make_database("sqlite")
+    db.load(path)
+    rng = random.Random(seed)
+    with DbTxn("Generate events", db, batch=True) as trans:
+        place = Place()
+        place.set_name(PlaceName(value="Benchmark"))
+        db.add_place(place, trans)
+        person = Person()
+        other = Person()
+        for index in range(events):
+            event = Event()
+            if index == 0:
+                event.set_type(EventType(EventType.BIRTH))
+            else:
+                event.set_type(EventType(rng.choice(EVENT_TYPES)))
+            if rng.random() < 0.9:
+                date = Date()
+                date.set_yr_mon_day(
+                    1800 + rng.randrange(200),
+                    rng.randint(1, 12),
+                    rng.randint(1, 28),
+                )
+                event.set_date_object(date)
+            event.set_place_handle(place.get_handle())
+            db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event.get_handle())
+            if index and rng.random() < WITNESS_RATIO:
+                event_ref.set_role(EventRoleType(EventRoleType.WITNESS))
+                primary_ref = EventRef()
+                primary_ref.set_reference_handle(event.get_handle())
+                other.add_event_ref(primary_ref)
+            person.add_event_ref(event_ref)
+        db.add_person(person, trans)
+        db.add_person(other, trans)
+    return db, person.get_handle(), place.get_handle()
+
+
+def time_call(function, *args, **kwargs):
+    """
+    Return the wall time of a call.
+    """
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def benchmark_events(events, args):
+    """
+    Time building the timelines for a tree with a number of events.
+    """
+    path = tempfile.mkdtemp(prefix="timeline-benchmark-")
+    try:
+        db, person_handle, place_handle = generate_tree(
+            path, events, args.seed
+        )
+        runs = []
+        for repeat in range(args.repeat):
+            timeline = GrampsTimeline(db)
+            person_seconds = time_call(timeline.set_person, person_handle)
+            person_events = len(timeline.events())
+            place_seconds = time_call(timeline.set_place, place_handle)
+            place_events = len(timeline.events())
+            runs.append(
+                {
+                    "repeat": repeat,
+                    "person_seconds": person_seconds,
+                    "person_events": person_events,
+                    "place_seconds": place_seconds,
+                    "place_events": place_events,
+                }
+            )
+            print(
+                "{0:>8} events person {1:8.3f}s {2:6.1f}us/event "
+                "place {3:8.3f}s {4:6.1f}us/event".format(
+                    events,
+                    person_seconds,
+                    person_seconds * 1000000 / max(1, person_events),
+                    place_seconds,
+                    place_seconds * 1000000 / max(1, place_events),
+                ),
+                file=sys.stderr,
+            )
+        db.close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+    return {"events": events, "runs": runs}
+
+
+def main():
+    """
+    Main program.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-e",
+        "--events",
+        dest="events",
+        type=int,
+        nargs="+",
+        default=[1000, 2500, 5000, 10000, 20000],
+        help="Number of events in each generated tree",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        dest="repeat",
+        type=int,
+        default=1,
+        help="Number of times to build each timeline",
+    )
+    parser.add_argument(
+        "-r",
+        "--report",
+        dest="report",
+        default="timeline-benchmark.json",
+        help="Path of the JSON report",
+    )
+    parser.add_argument(
+        "--seed",
+        dest="seed",
+        type=int,
+        default=1,
+        help="Random seed for the generated trees",
+    )
+    args = parser.parse_args()
+
+    report = {
+        "gramps": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "trees": [],
+    }
+    for events in args.events:
+        report["trees"].append(benchmark_events(events, args))
+
+    with open(args.report, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
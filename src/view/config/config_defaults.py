@@ -94,6 +94,7 @@ VIEWDEFAULTS = (
     ("display.icons-active-width", 24),
     ("display.icons-group-width", 12),
     ("display.max-changes-per-list", 20),
+    ("display.defer-card-details", True),
     ######################################################################
     ## General Options
     ######################################################################
@@ -900,6 +901,8 @@ VIEWDEFAULTS = (
     ("timeline.place.show-class-residence", True),
     ("timeline.place.show-class-other", True),
     ("timeline.place.show-class-custom", True),
+    ("timeline.place.start-year", 0),
+    ("timeline.place.end-year", 0),
     ######################################################################
     # Additional Color Schemes
     #
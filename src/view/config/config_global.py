@@ -231,6 +231,12 @@ def build_display_grid(configdialog, grstate, *_dummy_args):
         "display.max-changes-per-list",
         (1, 40),
     )
+    configdialog.add_checkbox(
+        grid,
+        _("Defer status indicators and calculated fields for group cards"),
+        28,
+        "display.defer-card-details",
+    )
     return add_config_buttons(
         configdialog, grstate, "display", grid, HELP_CONFIG_DISPLAY
     )
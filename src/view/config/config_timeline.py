@@ -238,6 +238,22 @@ def build_timeline_grid(configdialog, grstate, space, *_dummy_args):
         10,
         "{}.show-class-custom".format(space),
     )
+    if "place" in space:
+        configdialog.add_text(grid2, _("Date Range"), 11, bold=True)
+        configdialog.add_spinner(
+            grid2,
+            _("Start year, 0 for no limit"),
+            12,
+            "{}.start-year".format(space),
+            (0, 9999),
+        )
+        configdialog.add_spinner(
+            grid2,
+            _("End year, 0 for no limit"),
+            13,
+            "{}.end-year".format(space),
+            (0, 9999),
+        )
 
     if "person" in space:
         grid3 = create_grid()
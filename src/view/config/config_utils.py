@@ -498,3 +498,17 @@ def get_event_fields(grstate, key, count=12):
         if len(value) > 1:
             events.append(value[1])
     return events
+
+
+def get_option_event_fields(options, key, count=12):
+    """
+    Return list of events from event fields in a snapshot of the options.
+    """
+    events = []
+    prefix = "".join(("status.", key, "-"))
+    for number in range(1, count):
+        option = "".join((prefix, str(number)))
+        value = options[option].split(":")
+        if len(value) > 1:
+            events.append(value[1])
+    return events
@@ -45,7 +45,11 @@ from gramps.gen.lib import Family, Person
 from ..common.common_classes import GrampsOptions
 from ..cards import FamilyCard
 from .group_children import ChildrenCardGroup
-from .group_const import GENERIC_GROUPS, STATISTICS_GROUPS
+from .group_const import (
+    GENERIC_GROUPS,
+    GROUP_OBJECT_FIELDS,
+    STATISTICS_GROUPS,
+)
 from .group_events import EventsCardGroup
 from .group_expander import CardGroupExpander
 from .group_generic import GenericCardGroup
@@ -77,6 +81,28 @@ def group_builder(grstate, group_type, obj, args):
     return group
 
 
+def get_group_key(group_type, obj):
+    """
+    Return a key describing the state of the object fields a group is
+    rendered from, so changes to other fields can be detected and ignored.
+    """
+    if obj is None:
+        return None
+    if group_type not in GROUP_OBJECT_FIELDS:
+        return obj.serialize()
+    key = []
+    for field in GROUP_OBJECT_FIELDS[group_type]:
+        value = getattr(obj, field, None)
+        if isinstance(value, list):
+            value = [
+                x.serialize() if hasattr(x, "serialize") else x for x in value
+            ]
+        elif hasattr(value, "serialize"):
+            value = value.serialize()
+        key.append(value)
+    return key
+
+
 def build_simple_group(grstate, group_type, obj, args):
     """
     Generate and return a simple group for a given object.
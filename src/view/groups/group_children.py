@@ -71,6 +71,8 @@ class ChildrenCardGroup(CardGroupList):
         number_children = self.grstate.config.get(
             "%s.number-children" % groptions.option_space
         )
+        children = [child_ref.ref for child_ref in family.child_ref_list]
+        self.prepare_status(self.grstate.fetch_many("Person", children))
         for child_ref in family.child_ref_list:
             if number_children:
                 child_number = child_number + 1
@@ -174,3 +174,38 @@ STATISTICS_GROUPS = {
     "stats-tag": _("Tags"),
     "stats-uncited": _("Uncited Information"),
 }
+
+
+# Fields of the group base object each group is rendered from, used to decide
+# if a group needs to be rebuilt when that object changes. Groups not listed
+# depend on the whole object.
+GROUP_OBJECT_FIELDS = {
+    "address": ["address_list"],
+    "association": ["person_ref_list"],
+    "attribute": ["attribute_list"],
+    "child": ["child_ref_list"],
+    "event": ["event_ref_list", "family_list"],
+    "ldsord": ["lds_ord_list"],
+    "maternal": ["parent_family_list"],
+    "media": ["media_list"],
+    "name": ["primary_name", "alternate_names"],
+    "note": ["note_list"],
+    "parent": ["parent_family_list"],
+    "paternal": ["parent_family_list"],
+    "repository": ["reporef_list"],
+    "spouse": ["family_list"],
+    "timeline": [
+        "event_ref_list",
+        "family_list",
+        "parent_family_list",
+        "child_ref_list",
+        "address_list",
+        "alternate_names",
+        "lds_ord_list",
+        "media_list",
+        "citation_list",
+        "father_handle",
+        "mother_handle",
+    ],
+    "url": ["urls"],
+}
@@ -89,6 +89,19 @@ class CardGroupExpander(Gtk.Expander):
             return True
         return False
 
+    def restore_state(self, other):
+        """
+        Restore the expanded and hidden state of the expander it replaces.
+        """
+        self.set_expanded(other.get_expanded())
+        if other.hidden:
+            self.set_hexpand(False)
+            for child in self.get_children():
+                child.hide()
+            self.hidden = True
+        if not other.get_visible():
+            self.hide()
+
     def toggle_state(self, _dummy_obj):
         """
         Expand or collapse as needed.
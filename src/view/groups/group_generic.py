@@ -92,13 +92,17 @@ class GenericCardGroup(CardGroupList):
             "image": Gtk.SizeGroup(mode=Gtk.SizeGroupMode.HORIZONTAL),
         }
 
-        for obj_type, obj_handle in tuple_list:
-            if obj_type not in CARD_MAP:
-                continue
+        tuple_list = [
+            (obj_type, self.fetch(obj_type, obj_handle))
+            for obj_type, obj_handle in tuple_list
+            if obj_type in CARD_MAP
+        ]
+        self.prepare_status([obj for dummy_obj_type, obj in tuple_list])
+
+        for obj_type, obj in tuple_list:
             group_space = "group.%s" % obj_type.lower()
             group_groptions = GrampsOptions(group_space, size_groups=groups)
             group_groptions.set_age_base(groptions.age_base)
-            obj = self.fetch(obj_type, obj_handle)
             card = CARD_MAP[obj_type](grstate, group_groptions, obj)
             self.add_card(card)
         self.show_all()
@@ -35,6 +35,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsOptions
+from ..services.service_lineage import LineageIndexService
 from ..cards import FamilyCard
 from .group_list import CardGroupList
 
@@ -90,8 +91,12 @@ class PaternalLineageCardGroup(CardGroupList):
         families = []
         ancestors = []
         family_handle = self.group_base.obj.get_main_parents_family_handle()
-        while family_handle:
-            family = self.grstate.fetch("Family", family_handle)
+        for handle in LineageIndexService(self.grstate).get_line(
+            family_handle, paternal=not maternal
+        ):
+            family = self.grstate.fetch("Family", handle)
+            if not family:
+                break
             families.append(family)
             if not maternal:
                 if family.father_handle:
@@ -103,7 +108,6 @@ class PaternalLineageCardGroup(CardGroupList):
                     else:
                         mother = None
                     ancestors.append((father, mother))
-                    family_handle = father.get_main_parents_family_handle()
             else:
                 if family.mother_handle:
                     mother = self.grstate.fetch("Person", family.mother_handle)
@@ -114,7 +118,6 @@ class PaternalLineageCardGroup(CardGroupList):
                     else:
                         father = None
                     ancestors.append((mother, father))
-                    family_handle = mother.get_main_parents_family_handle()
         return families, ancestors
 
 
@@ -36,6 +36,13 @@ import pickle
 # ------------------------------------------------------------------------
 from gi.repository import Gdk, Gtk
 
+# ------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# ------------------------------------------------------------------------
+from gramps.gen.lib import Person
+
 # ------------------------------------------------------------------------
 #
 # Plugin Modules
@@ -43,7 +50,9 @@ from gi.repository import Gdk, Gtk
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsConfig, GrampsObject
 from ..common.common_utils import set_dnd_css
+from ..common.lifespan import LIFESPANS
 from ..cards.card_object import ObjectCard
+from ..services.service_status import StatusIndicatorService
 
 
 # ------------------------------------------------------------------------
@@ -91,6 +100,25 @@ class CardGroupList(Gtk.ListBox, GrampsConfig):
         row.add(self.row_cards[-1])
         self.add(row)
 
+    def prepare_status(self, objs):
+        """
+        Estimate the lifespans of the people and evaluate the status
+        indicators for the objects the cards will be built for in one batch.
+        When status indicators are deferred the cards in view are evaluated
+        in batches as they are reached instead.
+        """
+        LIFESPANS.warm_up(
+            self.grstate.dbstate.db,
+            [obj.handle for obj in objs if isinstance(obj, Person)],
+        )
+        if self.grstate.config.get("display.defer-card-details"):
+            return
+        if self.grstate.config.get("display.use-smaller-icons"):
+            size = Gtk.IconSize.SMALL_TOOLBAR
+        else:
+            size = Gtk.IconSize.LARGE_TOOLBAR
+        StatusIndicatorService().prepare_status(self.grstate, objs, size)
+
     def on_drag_data_received(
         self,
         _dummy_widget,
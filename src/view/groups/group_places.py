@@ -125,7 +125,7 @@ class EnclosedPlacesCardGroup(CardGroupList):
             handle, ["Place"]
         ):
             if len(place_list) < self.maximum:
-                place = db.get_place_from_handle(obj_handle)
+                place = self.fetch("Place", obj_handle)
                 for place_ref in place.placeref_list:
                     if place_ref.ref == handle:
                         place_list.append((place, place_ref))
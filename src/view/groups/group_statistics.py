@@ -587,6 +587,43 @@ PREPARE_GROUP = {
     "privacy": get_private_statistics,
 }
 
+ALL_SOURCES = {
+    "Person",
+    "Family",
+    "Event",
+    "Place",
+    "Media",
+    "Source",
+    "Citation",
+    "Repository",
+    "Note",
+    "Tag",
+}
+
+# The object types whose statistics must be collected before a group can
+# be rendered, as partial results arrive while collection is in progress.
+GROUP_SOURCES = {
+    "person": {"Person"},
+    "person-short": {"Person"},
+    "family": {"Family", "Event"},
+    "child": {"Family"},
+    "association": {"Person"},
+    "event": {"Event"},
+    "ldsordperson": {"Person"},
+    "ldsordfamily": {"Family"},
+    "participant": {"Person", "Family"},
+    "place": {"Place"},
+    "media": ALL_SOURCES - {"Repository", "Note", "Tag"},
+    "note": {"Note"},
+    "bookmark": {"Bookmark"},
+    "tag": ALL_SOURCES,
+    "repository": {"Repository"},
+    "source": {"Source"},
+    "citation": {"Citation"},
+    "uncited": {"Person", "Family", "Event", "Place", "Media"},
+    "privacy": ALL_SOURCES - {"Tag"},
+}
+
 
 # ------------------------------------------------------------------------
 #
@@ -624,6 +661,10 @@ class StatisticsCardGroup(CardGroupList):
         """
         Load card data.
         """
+        if not GROUP_SOURCES[self.key].issubset(data.get("loaded", [])):
+            self.card.load_data([(_("Calculating..."), "")])
+            self.show_all()
+            return
         result = PREPARE_GROUP[self.key](data)
 
         output = []
@@ -22,12 +22,28 @@
 TimelineCardGroup
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from heapq import merge
+from itertools import chain, islice
+
+# ------------------------------------------------------------------------
+#
+# GTK Modules
+#
+# ------------------------------------------------------------------------
+from gi.repository import Gtk
+
 # ------------------------------------------------------------------------
 #
 # Gramps Modules
 #
 # ------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.lib import Date
 
 # ------------------------------------------------------------------------
 #
@@ -35,6 +51,9 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from ..common.timeline import EVENT_CATEGORIES, RELATIVES, GrampsTimeline
+from ..services.service_deferred import DeferredLoadService
+from ..services.service_places import PlaceIndexService
+from ..services.service_timelines import TimelineCacheService
 from ..cards import (
     AddressCard,
     CitationCard,
@@ -72,28 +91,134 @@ class TimelineCardGroup(CardGroupList):
         }
         self.prepare_options()
 
-        self.timeline = GrampsTimeline(
-            grstate.dbstate.db,
+        obj_type = self.group_base.obj_type
+        if obj_type in ["Person", "Family"]:
+            key = (
+                obj_type,
+                obj.handle,
+                tuple(self.options["categories"]),
+                tuple(self.options["relations"]),
+                tuple(self.options["relation_categories"]),
+                self.options["ancestors"],
+                self.options["offspring"],
+            )
+            self.timeline = TimelineCacheService(grstate).get_timeline(
+                key, lambda: self.build_timeline(obj)
+            )
+        else:
+            self.timeline = self.build_timeline(obj)
+
+        self.maximum = grstate.config.get("group.event.max-per-group")
+        self.more_row = None
+        self.owner = DeferredLoadService().owner
+        self.pending = self.prepare_timeline(obj)
+        self.load_more()
+        self.show_all()
+
+    def build_timeline(self, obj):
+        """
+        Build the timeline for the object.
+        """
+        timeline = GrampsTimeline(
+            self.grstate.dbstate.db,
             events=self.options["categories"],
             relatives=self.options["relations"],
             relative_events=self.options["relation_categories"],
         )
         if self.group_base.obj_type == "Person":
-            self.timeline.set_person(
+            timeline.set_person(
                 obj.handle,
                 ancestors=self.options["ancestors"],
                 offspring=self.options["offspring"],
             )
         elif self.group_base.obj_type == "Family":
-            self.timeline.set_family(
+            timeline.set_family(
                 obj.handle,
                 ancestors=self.options["ancestors"],
                 offspring=self.options["offspring"],
             )
         elif self.group_base.obj_type == "Place":
-            self.timeline.set_place(obj.handle)
+            start_date, end_date = self.get_date_range()
+            if start_date is not None or end_date is not None:
+                timeline.set_span(
+                    start_date=start_date,
+                    end_date=end_date,
+                    place=obj.handle,
+                    event_index=PlaceIndexService(self.grstate),
+                )
+            else:
+                timeline.set_place(
+                    obj.handle, place_index=PlaceIndexService(self.grstate)
+                )
+        return timeline
+
+    def get_date_range(self):
+        """
+        Return the start and end dates of the years the timeline is limited
+        to, if any.
+        """
+        start_year = self.get_option("start-year")
+        end_year = self.get_option("end-year")
+        start_date = end_date = None
+        if start_year:
+            start_date = Date((start_year, 1, 1))
+        if end_year:
+            end_date = Date((end_year, 12, 31))
+        return start_date, end_date
+
+    def __len__(self):
+        """
+        Return the number of cards, ignoring the load more row.
+        """
+        return len(self.row_cards)
+
+    def load_more(self, count=None):
+        """
+        Produce and add the cards for the next page of the timeline. Any
+        deferred jobs belong to the view or window the group was built for.
+        """
+        count = count or self.maximum
+        page = list(islice(self.pending, count + 1))
+        more = len(page) > count
+        if more:
+            self.pending = chain([page.pop()], self.pending)
+        if self.more_row:
+            self.remove(self.more_row)
+            self.more_row = None
+        service = DeferredLoadService()
+        owner = service.set_owner(self.owner)
+        try:
+            self.add_timeline_cards(page)
+        finally:
+            service.set_owner(owner)
+        if more:
+            button = Gtk.Button(
+                label=_("Load more"), relief=Gtk.ReliefStyle.NONE
+            )
+            button.connect("clicked", self.on_load_more)
+            self.more_row = Gtk.ListBoxRow(selectable=False)
+            self.more_row.add(button)
+            self.add(self.more_row)
 
-        timeline = self.prepare_timeline(obj)
+    def restore_state(self, other):
+        """
+        Load as many cards as were loaded in the group it replaces.
+        """
+        if self.more_row and len(other) > len(self):
+            self.load_more(len(other) - len(self))
+
+    def on_load_more(self, *_dummy_args):
+        """
+        Load the next page of the timeline.
+        """
+        self.load_more()
+        self.show_all()
+
+    def add_timeline_cards(self, timeline):
+        """
+        Add the cards for a set of timeline entries.
+        """
+        grstate, groptions = self.grstate, self.groptions
         for (dummy_sortval, timeline_obj_type, timeline_obj, item) in timeline:
             if timeline_obj_type == "event":
                 (
@@ -153,7 +278,6 @@ class TimelineCardGroup(CardGroupList):
                         item,
                     )
                 )
-        self.show_all()
 
     def prepare_options(self):
         """
@@ -177,11 +301,14 @@ class TimelineCardGroup(CardGroupList):
 
     def prepare_timeline(self, obj):
         """
-        Prepare timeline of sorted events.
+        Prepare a lazily merged stream of the sorted timeline entries.
         """
-        timeline = []
-        for (sortval, item) in self.timeline.events(raw=True):
-            timeline.append((sortval, "event", None, item))
+        sources = [
+            (
+                (sortval, "event", None, item)
+                for (sortval, item) in self.timeline.iter_events(raw=True)
+            )
+        ]
 
         if (
             not self.groptions.age_base
@@ -190,13 +317,11 @@ class TimelineCardGroup(CardGroupList):
         ):
             birth_ref = obj.get_birth_ref()
             if birth_ref:
-                event = self.grstate.dbstate.db.get_event_from_handle(
-                    birth_ref.ref
-                )
+                event = self.fetch("Event", birth_ref.ref)
                 if event:
                     self.groptions.set_age_base(event.get_date_object())
 
-        timeline = self.extract_objects(timeline)
+        sources.extend(self.extract_objects())
         try:
             self.groptions.set_ref_mode(
                 self.grstate.config.get(
@@ -210,26 +335,26 @@ class TimelineCardGroup(CardGroupList):
         if self.group_base.obj_type == "Person":
             self.groptions.set_relation(obj)
 
-        timeline.sort(key=lambda x: x[0])
-        maximum = self.grstate.config.get("group.event.max-per-group")
-        timeline = timeline[:maximum]
-        return timeline
+        return merge(*sources, key=lambda x: x[0])
 
-    def extract_objects(self, timeline):
+    def extract_objects(self):
         """
-        Examine and extract other objects to add to timeline if needed.
+        Examine and extract other objects to add to timeline if needed,
+        returning a sorted list for each type.
         """
-        if self.get_option("include-addresses"):
-            timeline = timeline + self.extract_object_type("addresses")
-        if self.get_option("include-citations"):
-            timeline = timeline + self.extract_object_type("citations")
-        if self.get_option("include-media"):
-            timeline = timeline + self.extract_object_type("media")
-        if self.get_option("include-names"):
-            timeline = timeline + self.extract_object_type("names")
-        if self.get_option("include-ldsords"):
-            timeline = timeline + self.extract_object_type("ldsords")
-        return timeline
+        sources = []
+        for extract_type in [
+            "addresses",
+            "citations",
+            "media",
+            "names",
+            "ldsords",
+        ]:
+            if self.get_option("include-%s" % extract_type):
+                obj_list = self.extract_object_type(extract_type)
+                obj_list.sort(key=lambda x: x[0])
+                sources.append(obj_list)
+        return sources
 
     def extract_object_type(self, extract_type):
         """
@@ -289,6 +414,19 @@ class TimelineCardGroup(CardGroupList):
         return media
 
 
+def find_timeline_group(widget):
+    """
+    Return the timeline group a group widget is or wraps, if any.
+    """
+    if isinstance(widget, TimelineCardGroup):
+        return widget
+    if isinstance(widget, Gtk.Container):
+        for child in widget.get_children():
+            if isinstance(child, TimelineCardGroup):
+                return child
+    return None
+
+
 def extract_addresses(obj):
     """
     Return list of addresses with a date value.
@@ -69,9 +69,8 @@ class UncitedEventsCardGroup(CardGroupList):
         """
         Check for uncited events and add to group if found.
         """
-        db = self.grstate.dbstate.db
         for event_ref in obj.event_ref_list:
-            event = db.get_event_from_handle(event_ref.ref)
+            event = self.fetch("Event", event_ref.ref)
             if not event.citation_list:
                 card = EventRefCard(
                     self.grstate,
@@ -85,5 +84,5 @@ class UncitedEventsCardGroup(CardGroupList):
         """
         Check family events with spouse.
         """
-        family = self.grstate.dbstate.db.get_family_from_handle(family_handle)
+        family = self.fetch("Family", family_handle)
         self.check_events(options, family)
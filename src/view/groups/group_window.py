@@ -46,7 +46,9 @@ from gramps.gui.managedwindow import ManagedWindow
 from ..common.common_classes import GrampsObject
 from ..common.common_const import GROUP_LABELS
 from ..common.common_utils import make_scrollable
+from ..services.service_deferred import DeferredLoadService
 from .group_builder import group_builder
+from .group_timeline import find_timeline_group
 
 _ = glocale.translation.sgettext
 
@@ -85,8 +87,7 @@ class CardGroupWindow(ManagedWindow):
         prefix = "interface.cardview.group-%s-window" % self.group_type
         ManagedWindow.__init__(self, grstate.uistate, [], obj)
 
-        group_args = {"raw": True, "title": self.base_title}
-        group = group_builder(grstate, group_type, obj, group_args)
+        group = self.build_group()
         self.group_box = Gtk.VBox(spacing=3, margin=3)
         self.group_box.pack_start(group, expand=False, fill=True, padding=0)
         scroll = make_scrollable(self.group_box)
@@ -129,15 +130,34 @@ class CardGroupWindow(ManagedWindow):
         menu_label = "%s: %s" % (self.group_base.obj_lang, title)
         return (menu_label, None)
 
+    def build_group(self):
+        """
+        Build the group, owning any of its deferred jobs.
+        """
+        group_args = {"raw": True, "title": self.base_title}
+        service = DeferredLoadService()
+        owner = service.set_owner(self)
+        try:
+            return group_builder(
+                self.grstate, self.group_type, self.group_base.obj, group_args
+            )
+        finally:
+            service.set_owner(owner)
+
     def rebuild(self):
         """
         Rebuild current group contents.
         """
-        group_args = {"raw": True, "title": self.base_title}
-        group = group_builder(
-            self.grstate, self.group_type, self.group_base.obj, group_args
-        )
-        list(map(self.group_box.remove, self.group_box.get_children()))
+        DeferredLoadService().cancel(self)
+        group = self.build_group()
+        old_groups = self.group_box.get_children()
+        timeline = find_timeline_group(group)
+        if timeline:
+            for old_group in old_groups:
+                old_timeline = find_timeline_group(old_group)
+                if old_timeline:
+                    timeline.restore_state(old_timeline)
+        list(map(Gtk.Widget.destroy, old_groups))
         self.group_box.pack_start(group, expand=False, fill=True, padding=0)
         self.show()
 
@@ -164,6 +184,7 @@ class CardGroupWindow(ManagedWindow):
         """
         Close the window.
         """
+        DeferredLoadService().cancel(self)
         ManagedWindow.close(self)
         if not defer_delete:
             self.callback(self.key)
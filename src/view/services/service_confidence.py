@@ -0,0 +1,178 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+ConfidenceRankingService
+"""
+
+# -------------------------------------------------------------------------
+#
+# GTK Modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import GLib
+
+# Number of rankings computed per idle callback in a background pass.
+PRECOMPUTE_BATCH = 50
+
+
+# -------------------------------------------------------------------------
+#
+# ConfidenceRankingService
+#
+# -------------------------------------------------------------------------
+class ConfidenceRankingService:
+    """
+    A singleton class that caches the confidence rankings computed by the
+    status indicators, keyed by object handle and the ranking options in
+    effect. A ranking is dropped when any person, family, event or citation
+    read while computing it changes. It can also fill the cache for a list
+    of objects in a background pass.
+    """
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(ConfidenceRankingService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.rankings = {}
+                self.dependencies = {}
+                self.precompute_options = None
+                self.precompute_id = None
+                self.pending = []
+                self.signal_map = {}
+                for obj_type in ["person", "family", "event", "citation"]:
+                    for action in ["update", "delete"]:
+                        self.signal_map[
+                            "%s-%s" % (obj_type, action)
+                        ] = self.objects_changed
+                    self.signal_map["%s-rebuild" % obj_type] = self.reset
+                self.dbstate.connect("database-changed", self.database_changed)
+                if self.dbstate.is_open():
+                    self.__init_signals()
+                self.__init = True
+
+    def __init_signals(self):
+        """
+        Connect to signals from database.
+        """
+        for sig, callback in self.signal_map.items():
+            self.dbstate.db.connect(sig, callback)
+
+    def database_changed(self, *_dummy_args):
+        """
+        Clear the cache for a new database.
+        """
+        self.reset()
+        self.__init_signals()
+
+    def reset(self, *_dummy_args):
+        """
+        Drop all the cached rankings and stop any background pass.
+        """
+        self.cancel_precompute()
+        self.precompute_options = None
+        self.rankings = {}
+        self.dependencies = {}
+
+    def get_ranking(self, handle, options, compute):
+        """
+        Return the cached ranking for an object and set of options,
+        computing it with the given callable if it is not available. The
+        callable returns the ranking and the handles it was derived from.
+        """
+        key = (handle, options)
+        if key not in self.rankings:
+            self.store(key, *compute())
+        return self.rankings[key]
+
+    def store(self, key, ranking, handles):
+        """
+        Cache a ranking and record the handles it depends on.
+        """
+        self.rankings[key] = ranking
+        for handle in handles:
+            self.dependencies.setdefault(handle, set()).add(key)
+
+    def objects_changed(self, handles):
+        """
+        Drop the cached rankings that depend on changed objects.
+        """
+        for handle in handles:
+            for key in self.dependencies.pop(handle, []):
+                self.rankings.pop(key, None)
+
+    def precompute(self, options, get_handles, compute):
+        """
+        Start a background pass computing the rankings for the object handles
+        returned by a callable with a set of options, unless one was already
+        started for them, so the handles are only listed when a pass starts.
+        The compute callable takes a handle and returns the ranking and the
+        handles it was derived from, or None if the object is missing.
+        """
+        if options == self.precompute_options:
+            return
+        self.cancel_precompute()
+        self.precompute_options = options
+        self.pending = list(get_handles())
+        self.precompute_id = GLib.idle_add(
+            self.precompute_batch,
+            options,
+            compute,
+            priority=GLib.PRIORITY_LOW,
+        )
+
+    def precompute_batch(self, options, compute):
+        """
+        Compute the rankings for the next batch of objects.
+        """
+        batch = self.pending[-PRECOMPUTE_BATCH:]
+        del self.pending[-PRECOMPUTE_BATCH:]
+        for handle in batch:
+            key = (handle, options)
+            if key not in self.rankings:
+                computed = compute(handle)
+                if computed is not None:
+                    self.store(key, *computed)
+        if self.pending:
+            return True
+        self.precompute_id = None
+        return False
+
+    def cancel_precompute(self):
+        """
+        Stop any background pass.
+        """
+        if self.precompute_id:
+            GLib.source_remove(self.precompute_id)
+            self.precompute_id = None
+        self.pending = []
@@ -0,0 +1,301 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+DeferredLoadService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import heapq
+import time
+from itertools import count
+
+# -------------------------------------------------------------------------
+#
+# GTK Modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import GLib
+
+# Job priorities, lower runs first. Jobs for unmapped widgets are parked
+# until the widget is mapped.
+ON_SCREEN = 0
+OFF_SCREEN = 1
+UNMAPPED = 2
+
+# Seconds of work done per idle callback before yielding to the main loop.
+TIME_SLICE = 0.02
+
+# Most jobs whose work is prepared together in one batch.
+BATCH_SIZE = 50
+
+
+# -------------------------------------------------------------------------
+#
+# DeferredJob Class
+#
+# -------------------------------------------------------------------------
+class DeferredJob:
+    """
+    A callable waiting to fill in the content of a widget.
+    """
+
+    __slots__ = (
+        "widget",
+        "callback",
+        "owner",
+        "grstate",
+        "group",
+        "done",
+        "signals",
+        "batch",
+        "item",
+        "prepared",
+    )
+
+    def __init__(
+        self, widget, callback, owner=None, grstate=None, batch=None, item=None
+    ):
+        self.widget = widget
+        self.callback = callback
+        self.owner = owner
+        self.grstate = grstate
+        self.batch = batch
+        self.item = item
+        self.prepared = False
+        self.group = None
+        if grstate:
+            self.group = grstate.dependency_group
+        self.done = False
+        self.signals = []
+
+    def run(self):
+        """
+        Run the job, recording any dependencies against the page group
+        that queued it. Any jobs it queues belong to the same owner.
+        """
+        self.cancel()
+        service = DeferredLoadService()
+        owner = service.set_owner(self.owner)
+        try:
+            self.run_callback()
+        finally:
+            service.set_owner(owner)
+
+    def run_callback(self):
+        """
+        Run the callback with the page group that queued it.
+        """
+        grstate = self.grstate
+        if grstate is None or grstate.dependencies is None:
+            self.callback()
+            return
+        group = grstate.dependency_group
+        grstate.set_dependency_group(self.group)
+        try:
+            self.callback()
+        finally:
+            grstate.set_dependency_group(group)
+
+    def cancel(self):
+        """
+        Mark the job done and disconnect from the widget.
+        """
+        self.done = True
+        for signal_id in self.signals:
+            self.widget.disconnect(signal_id)
+        self.signals = []
+
+
+# -------------------------------------------------------------------------
+#
+# DeferredLoadService Class
+#
+# -------------------------------------------------------------------------
+class DeferredLoadService:
+    """
+    A singleton class that defers filling in the expensive parts of cards,
+    like status indicators and calculated fields, to idle callbacks. Jobs
+    for widgets shown in the window run first, then those scrolled out of
+    view, while those for widgets that are not mapped wait until they are.
+    Jobs belong to the view or window being built when they were queued,
+    so those of one owner can be dropped without touching the others.
+    """
+
+    def __new__(cls):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(DeferredLoadService, cls).__new__(cls)
+            cls.instance.__init_singleton__()
+        return cls.instance
+
+    def __init_singleton__(self):
+        """
+        Prepare the deferred load service for use.
+        """
+        self.queue = []
+        self.parked = set()
+        self.sequence = count()
+        self.idle_id = None
+        self.owner = None
+
+    def set_owner(self, owner):
+        """
+        Set the view or window jobs queued from now on belong to, returning
+        the previous one so it can be restored.
+        """
+        previous = self.owner
+        self.owner = owner
+        return previous
+
+    def defer(self, widget, callback, grstate=None, batch=None, item=None):
+        """
+        Queue a callable to fill in the content of a widget. If the page
+        state is given the dependencies are recorded against the group
+        that was being built. If a batch callable is given, then before the
+        job runs it is called once with the items of the queued jobs sharing
+        it whose widgets are as much in view, so their work can be prepared
+        together.
+        """
+        job = DeferredJob(
+            widget,
+            callback,
+            owner=self.owner,
+            grstate=grstate,
+            batch=batch,
+            item=item,
+        )
+        job.signals.append(widget.connect("destroy", self.cb_destroy, job))
+        self.push(job, ON_SCREEN)
+
+    def push(self, job, priority):
+        """
+        Add a job to the queue and make sure it will be processed.
+        """
+        heapq.heappush(self.queue, (priority, next(self.sequence), job))
+        if not self.idle_id:
+            self.idle_id = GLib.idle_add(self.process)
+
+    def cancel(self, owner):
+        """
+        Drop the pending jobs of an owner, as when it is rebuilt or destroyed.
+        """
+        for dummy_priority, dummy_sequence, job in self.queue:
+            if job.owner is owner and not job.done:
+                job.cancel()
+        for job in [job for job in self.parked if job.owner is owner]:
+            job.cancel()
+            self.parked.discard(job)
+        self.queue = [entry for entry in self.queue if not entry[2].done]
+        heapq.heapify(self.queue)
+        if not self.queue and self.idle_id:
+            GLib.source_remove(self.idle_id)
+            self.idle_id = None
+
+    def cb_destroy(self, _dummy_widget, job):
+        """
+        Forget a job when its widget is destroyed.
+        """
+        job.cancel()
+        self.parked.discard(job)
+
+    def cb_map(self, _dummy_widget, job):
+        """
+        Requeue a parked job once its widget is mapped.
+        """
+        self.parked.discard(job)
+        if not job.done:
+            for signal_id in job.signals[1:]:
+                job.widget.disconnect(signal_id)
+            del job.signals[1:]
+            self.push(job, ON_SCREEN)
+
+    def process(self):
+        """
+        Run queued jobs until the time slice is used up. A job is put back
+        if its widget has since moved out of view, so the priorities are
+        current when it is reached.
+        """
+        start = time.time()
+        while self.queue and time.time() - start < TIME_SLICE:
+            priority, dummy_sequence, job = heapq.heappop(self.queue)
+            if job.done:
+                continue
+            current = get_priority(job.widget)
+            if current == UNMAPPED:
+                job.signals.append(
+                    job.widget.connect("map", self.cb_map, job)
+                )
+                self.parked.add(job)
+            elif current > priority:
+                self.push(job, current)
+            else:
+                if job.batch and not job.prepared:
+                    self.prepare_batch(job, current)
+                job.run()
+        if self.queue:
+            return True
+        self.idle_id = None
+        return False
+
+    def prepare_batch(self, job, priority):
+        """
+        Prepare the work for a job together with that of the other queued
+        jobs sharing its batch callable whose widgets are as much in view.
+        """
+        jobs = [job]
+        for dummy_priority, dummy_sequence, other in self.queue:
+            if len(jobs) >= BATCH_SIZE:
+                break
+            if (
+                not other.done
+                and not other.prepared
+                and other.batch == job.batch
+                and get_priority(other.widget) <= priority
+            ):
+                jobs.append(other)
+        for other in jobs:
+            other.prepared = True
+        job.batch([other.item for other in jobs])
+
+
+def get_priority(widget):
+    """
+    Return the priority for a job given where its widget is.
+    """
+    if not widget.get_mapped():
+        return UNMAPPED
+    toplevel = widget.get_toplevel()
+    coordinates = widget.translate_coordinates(toplevel, 0, 0)
+    if not coordinates:
+        return OFF_SCREEN
+    dummy_x, y_position = coordinates
+    if (
+        y_position + widget.get_allocated_height() < 0
+        or y_position > toplevel.get_allocated_height()
+    ):
+        return OFF_SCREEN
+    return ON_SCREEN
@@ -0,0 +1,204 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+LineageIndexService
+"""
+
+# Positions of the fields read from the raw serialized data.
+FAMILY_FATHER = 2
+FAMILY_MOTHER = 3
+PERSON_PARENT_FAMILIES = 9
+
+
+# -------------------------------------------------------------------------
+#
+# LineageIndexService
+#
+# -------------------------------------------------------------------------
+class LineageIndexService:
+    """
+    A singleton class that maintains the paternal and maternal lines of
+    descent from the raw data. For each family it records the main parent
+    family of the father or mother, and the root family of the line with
+    the number of generations to it. Roots are memoised for every family
+    on a walked line, so lines sharing ancestors are only walked once. The
+    index is kept current from the database signals.
+    """
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(LineageIndexService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.parents = {}
+                self.roots = {}
+                self.descendants = {}
+                self.links = {}
+                self.signal_map = {
+                    "person-update": self.people_changed,
+                    "person-delete": self.people_changed,
+                    "family-update": self.families_changed,
+                    "family-delete": self.families_changed,
+                    "person-rebuild": self.reset,
+                    "family-rebuild": self.reset,
+                }
+                self.dbstate.connect("database-changed", self.database_changed)
+                if self.dbstate.is_open():
+                    self.__init_signals()
+                self.__init = True
+
+    def __init_signals(self):
+        """
+        Connect to signals from database.
+        """
+        for sig, callback in self.signal_map.items():
+            self.dbstate.db.connect(sig, callback)
+
+    def database_changed(self, *_dummy_args):
+        """
+        Reset the index for a new database.
+        """
+        self.reset()
+        self.__init_signals()
+
+    def reset(self, *_dummy_args):
+        """
+        Drop the index.
+        """
+        self.parents = {}
+        self.roots = {}
+        self.descendants = {}
+        self.links = {}
+
+    def get_parent_family(self, key):
+        """
+        Return the main parent family of the father or mother of a family,
+        keyed by family handle and whether the line is paternal.
+        """
+        if key not in self.parents:
+            db = self.dbstate.db
+            family_handle, paternal = key
+            parent_family_handle = None
+            data = db.get_raw_family_data(family_handle)
+            if data:
+                if paternal:
+                    person_handle = data[FAMILY_FATHER]
+                else:
+                    person_handle = data[FAMILY_MOTHER]
+                if person_handle:
+                    self.links.setdefault(person_handle, set()).add(key)
+                    person_data = db.get_raw_person_data(person_handle)
+                    if person_data and person_data[PERSON_PARENT_FAMILIES]:
+                        handle = person_data[PERSON_PARENT_FAMILIES][0]
+                        if db.get_raw_family_data(handle):
+                            parent_family_handle = handle
+            self.parents[key] = parent_family_handle
+            if parent_family_handle:
+                self.descendants.setdefault(
+                    (parent_family_handle, paternal), set()
+                ).add(key)
+        return self.parents[key]
+
+    def get_progenitors(self, family_handle, paternal=True):
+        """
+        Return the root family of the paternal or maternal line a family
+        descends from and the number of generations to it, counting the
+        family itself as the first.
+        """
+        key = (family_handle, paternal)
+        line = []
+        seen = set()
+        while key not in self.roots and key not in seen:
+            seen.add(key)
+            line.append(key)
+            parent_family_handle = self.get_parent_family(key)
+            if not parent_family_handle:
+                break
+            key = (parent_family_handle, paternal)
+        if key in self.roots:
+            root_handle, generations = self.roots[key]
+        else:
+            root_handle, generations = line[-1][0], 0
+        while line:
+            generations = generations + 1
+            self.roots[line.pop()] = (root_handle, generations)
+        return self.roots[(family_handle, paternal)]
+
+    def get_line(self, family_handle, paternal=True):
+        """
+        Return the handles of the families in the paternal or maternal line
+        of a family, starting with the family itself.
+        """
+        line = []
+        seen = set()
+        while family_handle and family_handle not in seen:
+            seen.add(family_handle)
+            line.append(family_handle)
+            family_handle = self.get_parent_family((family_handle, paternal))
+        return line
+
+    def invalidate(self, key):
+        """
+        Drop the parent family of a family and the roots memoised for it
+        and all the families descending from it.
+        """
+        parent_family_handle = self.parents.pop(key, None)
+        if parent_family_handle:
+            self.descendants.get(
+                (parent_family_handle, key[1]), set()
+            ).discard(key)
+        pending = [key]
+        seen = set()
+        while pending:
+            key = pending.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            if self.roots.pop(key, None):
+                pending.extend(self.descendants.get(key, []))
+
+    def people_changed(self, handles):
+        """
+        Update the index for changed people.
+        """
+        for handle in handles:
+            for key in self.links.pop(handle, []):
+                self.invalidate(key)
+
+    def families_changed(self, handles):
+        """
+        Update the index for changed families.
+        """
+        for handle in handles:
+            self.invalidate((handle, True))
+            self.invalidate((handle, False))
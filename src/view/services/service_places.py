@@ -0,0 +1,395 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+PlaceIndexService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from bisect import bisect_left, insort
+from functools import partial
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.lib import EventRoleType
+
+# Positions of the fields read from the raw serialized data.
+EVENT_DATE = 3
+EVENT_PLACE = 5
+EVENT_TAGS = 11
+DATE_SORTVAL = 5
+PERSON_EVENT_REFS = 7
+EVENTREF_REF = 4
+EVENTREF_ROLE = 5
+PLACE_PLACEREFS = 5
+PLACEREF_REF = 0
+
+# Enclosed places are followed this many levels down, as a guard against
+# cycles in the hierarchy.
+MAX_DEPTH = 8
+
+
+# -------------------------------------------------------------------------
+#
+# PlaceIndexService
+#
+# -------------------------------------------------------------------------
+class PlaceIndexService:
+    """
+    A singleton class that maintains an index of the events that took place
+    in each place, including those in all the places it encloses, along
+    with their sort values and primary participants. All events are also
+    kept in sort value order so those within a date range can be found
+    without a full scan. It is built from the raw data on first use and
+    then kept current from the database signals.
+    """
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(PlaceIndexService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.loaded = False
+                self.event_places = {}
+                self.event_sortvals = {}
+                self.event_tags = {}
+                self.sorted_events = []
+                self.event_people = {}
+                self.person_events = {}
+                self.place_events = {}
+                self.parents = {}
+                self.children = {}
+                self.cache = {}
+                self.signal_map = {
+                    "event-add": partial(self.events_changed, False),
+                    "event-update": partial(self.events_changed, False),
+                    "event-delete": partial(self.events_changed, True),
+                    "person-add": partial(self.people_changed, False),
+                    "person-update": partial(self.people_changed, False),
+                    "person-delete": partial(self.people_changed, True),
+                    "place-add": partial(self.places_changed, False),
+                    "place-update": partial(self.places_changed, False),
+                    "place-delete": partial(self.places_changed, True),
+                    "event-rebuild": self.reset,
+                    "person-rebuild": self.reset,
+                    "place-rebuild": self.reset,
+                }
+                self.dbstate.connect("database-changed", self.database_changed)
+                if self.dbstate.is_open():
+                    self.__init_signals()
+                self.__init = True
+
+    def __init_signals(self):
+        """
+        Connect to signals from database.
+        """
+        for sig, callback in self.signal_map.items():
+            self.dbstate.db.connect(sig, callback)
+
+    def database_changed(self, *_dummy_args):
+        """
+        Reset the index for a new database.
+        """
+        self.reset()
+        self.__init_signals()
+
+    def reset(self, *_dummy_args):
+        """
+        Drop the index so it is rebuilt on next use.
+        """
+        self.loaded = False
+        self.event_places = {}
+        self.event_sortvals = {}
+        self.event_tags = {}
+        self.sorted_events = []
+        self.event_people = {}
+        self.person_events = {}
+        self.place_events = {}
+        self.parents = {}
+        self.children = {}
+        self.cache = {}
+
+    def load(self):
+        """
+        Build the index from the raw data.
+        """
+        self.reset()
+        db = self.dbstate.db
+        for handle, data in db._iter_raw_place_data():
+            self.add_place(handle, data)
+        for handle, data in db._iter_raw_event_data():
+            self.add_event(handle, data)
+        for handle, data in db._iter_raw_person_data():
+            self.add_person(handle, data)
+        self.sorted_events = sorted(
+            (sortval, handle)
+            for handle, sortval in self.event_sortvals.items()
+        )
+        self.loaded = True
+
+    def add_place(self, handle, data):
+        """
+        Record the places enclosing a place.
+        """
+        parents = {
+            place_ref[PLACEREF_REF] for place_ref in data[PLACE_PLACEREFS]
+        }
+        self.parents[handle] = parents
+        for parent_handle in parents:
+            self.children.setdefault(parent_handle, set()).add(handle)
+
+    def remove_place(self, handle):
+        """
+        Remove the places enclosing a place.
+        """
+        for parent_handle in self.parents.pop(handle, []):
+            self.children.get(parent_handle, set()).discard(handle)
+
+    def add_event(self, handle, data):
+        """
+        Record the place, tags and sort value for an event.
+        """
+        date = data[EVENT_DATE]
+        self.event_sortvals[handle] = date[DATE_SORTVAL] if date else 0
+        if data[EVENT_TAGS]:
+            self.event_tags[handle] = set(data[EVENT_TAGS])
+        place_handle = data[EVENT_PLACE]
+        if place_handle:
+            self.event_places[handle] = place_handle
+            self.place_events.setdefault(place_handle, set()).add(handle)
+            self.invalidate(place_handle)
+
+    def remove_event(self, handle):
+        """
+        Remove the place, tags and sort value for an event.
+        """
+        place_handle = self.event_places.pop(handle, None)
+        sortval = self.event_sortvals.pop(handle, None)
+        self.event_tags.pop(handle, None)
+        if sortval is not None:
+            index = bisect_left(self.sorted_events, (sortval, handle))
+            if self.sorted_events[index : index + 1] == [(sortval, handle)]:
+                del self.sorted_events[index]
+        if place_handle:
+            self.place_events.get(place_handle, set()).discard(handle)
+            self.invalidate(place_handle)
+
+    def add_person(self, handle, data):
+        """
+        Record the events a person is a primary participant in.
+        """
+        events = []
+        for event_ref in data[PERSON_EVENT_REFS]:
+            if event_ref[EVENTREF_ROLE][0] == EventRoleType.PRIMARY:
+                event_handle = event_ref[EVENTREF_REF]
+                events.append(event_handle)
+                self.event_people.setdefault(event_handle, []).append(handle)
+        if events:
+            self.person_events[handle] = events
+
+    def remove_person(self, handle):
+        """
+        Remove the events a person is a primary participant in.
+        """
+        for event_handle in self.person_events.pop(handle, []):
+            people = self.event_people.get(event_handle, [])
+            if handle in people:
+                people.remove(handle)
+            if not people:
+                self.event_people.pop(event_handle, None)
+
+    def events_changed(self, deleted, handles):
+        """
+        Update the index for changed events.
+        """
+        if not self.loaded:
+            return
+        get_raw_event_data = self.dbstate.db.get_raw_event_data
+        for handle in handles:
+            self.remove_event(handle)
+            if not deleted:
+                data = get_raw_event_data(handle)
+                if data:
+                    self.add_event(handle, data)
+                    insort(
+                        self.sorted_events,
+                        (self.event_sortvals[handle], handle),
+                    )
+
+    def people_changed(self, deleted, handles):
+        """
+        Update the index for changed people.
+        """
+        if not self.loaded:
+            return
+        get_raw_person_data = self.dbstate.db.get_raw_person_data
+        for handle in handles:
+            self.remove_person(handle)
+            if not deleted:
+                data = get_raw_person_data(handle)
+                if data:
+                    self.add_person(handle, data)
+
+    def places_changed(self, deleted, handles):
+        """
+        Update the index for changed places. As the hierarchy may have
+        changed all the cached event lists are dropped.
+        """
+        if not self.loaded:
+            return
+        get_raw_place_data = self.dbstate.db.get_raw_place_data
+        for handle in handles:
+            self.remove_place(handle)
+            if not deleted:
+                data = get_raw_place_data(handle)
+                if data:
+                    self.add_place(handle, data)
+        self.cache = {}
+
+    def invalidate(self, handle):
+        """
+        Drop the cached event lists for a place and all places enclosing it.
+        """
+        if not self.cache:
+            return
+        pending = [handle]
+        seen = set()
+        while pending:
+            place_handle = pending.pop()
+            if place_handle in seen:
+                continue
+            seen.add(place_handle)
+            self.cache.pop(place_handle, None)
+            pending.extend(self.parents.get(place_handle, []))
+
+    def get_enclosed_places(self, handle):
+        """
+        Return a place and all the places it encloses.
+        """
+        places = {handle}
+        generation = [handle]
+        for dummy_depth in range(MAX_DEPTH):
+            generation = [
+                child_handle
+                for place_handle in generation
+                for child_handle in self.children.get(place_handle, [])
+                if child_handle not in places
+            ]
+            if not generation:
+                break
+            places.update(generation)
+        return places
+
+    def get_sorted_events(self, handle):
+        """
+        Return the sorted (sortval, event handle) list for a place and all
+        the places it encloses.
+        """
+        if not self.loaded:
+            self.load()
+        if handle not in self.cache:
+            events = []
+            for place_handle in self.get_enclosed_places(handle):
+                events.extend(
+                    (self.event_sortvals[event_handle], event_handle)
+                    for event_handle in self.place_events.get(
+                        place_handle, []
+                    )
+                )
+            events.sort()
+            self.cache[handle] = events
+        return self.cache[handle]
+
+    def get_events(self, handle, start=None, end=None):
+        """
+        Return the (sortval, event handle, primary participant handle) for
+        the events in a place and all the places it encloses, optionally
+        only those with a sort value within a range.
+        """
+        events = self.get_sorted_events(handle)
+        low, high = 0, len(events)
+        if start is not None:
+            low = bisect_left(events, (start,))
+        if end is not None:
+            high = bisect_left(events, (end + 1,))
+        return [
+            (sortval, event_handle, self.get_primary_participant(event_handle))
+            for sortval, event_handle in events[low:high]
+        ]
+
+    def get_primary_participant(self, event_handle):
+        """
+        Return the handle of the primary participant in an event if any.
+        """
+        people = self.event_people.get(event_handle)
+        if people:
+            return people[0]
+        return None
+
+    def get_span_events(self, start=None, end=None, place=None, tag=None):
+        """
+        Return the (sortval, event handle, primary participant handle) for
+        the events with a sort value within a range, optionally only those
+        in a place and all the places it encloses or with a given tag.
+        """
+        if place:
+            events = self.get_events(place, start=start, end=end)
+        else:
+            if not self.loaded:
+                self.load()
+            low, high = 0, len(self.sorted_events)
+            if start is not None:
+                low = bisect_left(self.sorted_events, (start,))
+            if end is not None:
+                high = bisect_left(self.sorted_events, (end + 1,))
+            events = [
+                (
+                    sortval,
+                    event_handle,
+                    self.get_primary_participant(event_handle),
+                )
+                for sortval, event_handle in self.sorted_events[low:high]
+            ]
+        if tag:
+            events = [
+                event
+                for event in events
+                if tag in self.event_tags.get(event[1], [])
+            ]
+        return events
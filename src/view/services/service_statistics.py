@@ -33,7 +33,10 @@ import os
 import sys
 import time
 import pickle
-from subprocess import Popen, PIPE, TimeoutExpired
+import signal
+from functools import partial
+from queue import Empty, Queue
+from subprocess import Popen, PIPE
 from threading import Event, Lock, Thread
 
 # -------------------------------------------------------------------------
@@ -57,7 +60,21 @@ from gramps.gen.utils.callback import Callback
 # Plugin Modules
 #
 # -------------------------------------------------------------------------
-from .service_statistics_worker import gather_statistics, get_object_list
+from ..common.lifespan import LIFESPANS
+from .service_statistics_worker import (
+    CHANGE_POSITIONS,
+    OBJECT_HANDLERS,
+    StatisticsResult,
+    build_statistics,
+    close_readonly_database,
+    count_bookmarks,
+    count_surnames,
+    gather_statistics,
+    get_last_changes,
+    get_object_counts,
+    open_readonly_database,
+    read_frame,
+)
 
 CATEGORIES = [
     "Person",
@@ -72,6 +89,22 @@ CATEGORIES = [
     "Tag",
 ]
 
+STORE_FILENAME = "cardview-statistics.pickle"
+STORE_VERSION = 4
+
+# Database changes are queued and applied once no more have arrived for
+# CHANGE_DELAY seconds, or at least every CHANGE_MAX_DELAY seconds during
+# a steady stream of changes. A burst of more than CHANGE_BURST changed
+# objects pauses a running collection until things are quiet again.
+CHANGE_DELAY = 1.0
+CHANGE_MAX_DELAY = 10.0
+CHANGE_BURST = 100
+
+# Collections are started from the main loop at low priority after a short
+# delay so repeated requests coalesce, and the worker runs niced.
+COLLECT_DELAY = 500
+WORKER_NICENESS = 10
+
 _ = glocale.translation.sgettext
 
 
@@ -120,6 +153,20 @@ class StatisticsService(Callback):
                 self.threads = []
                 self.lock = Lock()
                 self.data = {}
+                self.results = {}
+                self.change_queue = {}
+                self.change_count = 0
+                self.change_timer = None
+                self.first_change = 0
+                self.last_change = 0
+                self.rebuild_detected = False
+                self.paused = False
+                self.collect_timer = None
+                self.store_path = None
+                self.store_dirty = False
+                self.save_timer = None
+                self.validate_event = None
+                self.update_pending = False
                 self.worker = find_statistics_service_worker()
                 self.concurrent = self.determine_collection_method()
                 self.signal_map = {}
@@ -140,123 +187,463 @@ class StatisticsService(Callback):
         Register signal.
         """
         lower_type = object_type.lower()
-        for sig in ["add", "update", "delete", "rebuild"]:
-            self.signal_map[
-                "{}-{}".format(lower_type, sig)
-            ] = self.change_detected
+        for sig in ["add", "update", "delete"]:
+            self.signal_map["{}-{}".format(lower_type, sig)] = partial(
+                self.objects_changed, object_type, sig == "delete"
+            )
+        self.signal_map["{}-rebuild".format(lower_type)] = self.change_detected
 
     def change_detected(self, *_dummy_args):
         """
-        Emit change detected signal.
+        Note a change that requires a rebuild, the signal is emitted once
+        the changes settle.
+        """
+        self.rebuild_detected = True
+        self.schedule_changes()
+
+    def objects_changed(self, obj_type, deleted, handles):
+        """
+        Queue the changes to be applied once they settle. Only the last
+        change to each object is kept.
+        """
+        with self.lock:
+            queue = self.change_queue.setdefault(obj_type, {})
+            for handle in handles:
+                queue[handle] = deleted
+            self.change_count += len(handles)
+            burst = self.change_count > CHANGE_BURST
+        if burst and self.is_collecting():
+            self.pause_collection()
+        self.schedule_changes()
+
+    def schedule_changes(self):
+        """
+        Note the time of a change and start the timer to process the
+        queued changes if needed.
+        """
+        self.last_change = time.monotonic()
+        if not self.change_timer:
+            self.first_change = self.last_change
+            self.change_timer = GLib.timeout_add(
+                int(CHANGE_DELAY * 1000), self.process_changes
+            )
+
+    def process_changes(self):
+        """
+        Process the queued changes once they settle. A paused collection is
+        resumed, otherwise the changes are applied unless a collection is
+        running in which case they are applied when it completes.
+        """
+        now = time.monotonic()
+        quiet = now - self.last_change >= CHANGE_DELAY
+        if not quiet and (
+            self.paused or now - self.first_change < CHANGE_MAX_DELAY
+        ):
+            return True
+        self.change_timer = None
+        self.change_count = 0
+        if self.rebuild_detected:
+            self.rebuild_detected = False
+            self.emit("changes-detected", ())
+        if self.paused:
+            self.paused = False
+            self.spawn_collect_statistics(resume=True)
+            return False
+        if self.is_collecting():
+            return False
+        with self.lock:
+            changes, self.change_queue = self.change_queue, {}
+            if not self.results:
+                return False
+        if changes:
+            self.apply_changes(changes)
+        return False
+
+    def apply_changes(self, changes):
+        """
+        Update the statistics for changed objects by subtracting the counts
+        recorded for each object and adding the counts for its current state.
+        """
+        db = self.dbstate.db
+        args = {"all_events": self.all_events, "lifespans": LIFESPANS}
+        with self.lock:
+            for obj_type, queue in changes.items():
+                if obj_type not in self.results:
+                    continue
+                deleted = [x for x in queue if queue[x]]
+                updated = [x for x in queue if not queue[x]]
+                if obj_type == "Event" and updated:
+                    people = set()
+                    for handle in updated:
+                        for (
+                            dummy_obj_type,
+                            person_handle,
+                        ) in db.find_backlink_handles(
+                            handle, include_classes=["Person"]
+                        ):
+                            people.add(person_handle)
+                    if "Person" in self.results:
+                        self.update_objects(db, args, "Person", False, people)
+                self.update_objects(db, args, obj_type, True, deleted)
+                self.update_objects(db, args, obj_type, False, updated)
+            if "Family" in self.results:
+                self.results["Family"].values[
+                    "surname_total"
+                ] = count_surnames(db)
+            if "Bookmark" in self.results:
+                self.results["Bookmark"].counts = count_bookmarks(db)
+            self.data = self.build_data()
+        self.store_dirty = True
+        if not self.save_timer:
+            self.save_timer = GLib.timeout_add_seconds(30, self.save_timeout)
+        if not self.update_pending:
+            self.update_pending = True
+            GLib.idle_add(self.emit_update)
+
+    def update_objects(self, db, args, obj_type, deleted, handles):
+        """
+        Update the counts for a set of objects of a given type.
+        """
+        result = self.results[obj_type]
+        count_object = OBJECT_HANDLERS[obj_type][0]
+        get_raw_data = db.method("get_raw_%s_data", obj_type)
+        change_position = CHANGE_POSITIONS[obj_type]
+        if obj_type == "Person" and not deleted and "lifespans" in args:
+            args["lifespans"].warm_up(db, handles)
+        for handle in handles:
+            result.remove_object(handle)
+            if not deleted:
+                data = get_raw_data(handle)
+                if data is not None:
+                    result.add_object(handle, count_object(db, data, args))
+                    result.note_change(data[change_position])
+
+    def build_data(self):
+        """
+        Build the statistics payload, noting the object types included.
+        """
+        data = build_statistics(self.results)
+        data["loaded"] = set(self.results)
+        return data
+
+    def emit_update(self):
+        """
+        Emit statistics updated signal after changes were applied.
+        """
+        self.update_pending = False
+        self.emit("statistics-updated", (self.data,))
+        return False
+
+    def save_timeout(self):
+        """
+        Save the statistics store.
+        """
+        self.save_timer = None
+        Thread(target=self.save_store).start()
+        return False
+
+    def save_store(self):
         """
-        self.emit("changes-detected", ())
+        Save the statistics store if it changed. The results are copied
+        under the lock and written outside it so the main loop is not held
+        up. The store is not saved while changes are still queued or a
+        loaded store is still being checked, as it would then be taken as
+        current without them.
+        """
+        with self.lock:
+            if (
+                not self.store_dirty
+                or not self.store_path
+                or self.change_queue
+                or self.validate_event
+            ):
+                return
+            self.store_dirty = False
+            store_path = self.store_path
+            results = {
+                obj_type: {
+                    "counts": dict(result.counts),
+                    "objects": dict(result.objects),
+                    "values": dict(result.values),
+                }
+                for obj_type, result in self.results.items()
+            }
+        save_statistics_store(store_path, results, self.all_events)
+
+    def load_store(self):
+        """
+        Load the statistics store for the current database if it is valid,
+        then check in the background that no objects were changed since it
+        was saved.
+        """
+        self.store_path = get_statistics_store_path(self.dbstate)
+        if not self.store_path:
+            return False
+        results = load_statistics_store(
+            self.store_path,
+            get_object_counts(self.dbstate.db),
+            self.all_events,
+        )
+        if not results:
+            return False
+        with self.lock:
+            self.results = results
+            self.data = self.build_data()
+        self.cancel_validation()
+        self.validate_event = Event()
+        Thread(
+            target=self.validate_store,
+            args=(
+                self.validate_event,
+                self.dbstate.db.get_dbname(),
+                {
+                    obj_type: result.values.get("last_change", 0)
+                    for obj_type, result in results.items()
+                    if obj_type in OBJECT_HANDLERS
+                },
+            ),
+        ).start()
+        return True
+
+    def validate_store(self, event, dbname, last_changes):
+        """
+        Thread to compare the latest last changed timestamp of each object
+        type with the one saved in the store. An edit that did not change
+        the object totals is only caught this way if it was made while the
+        service was not listening.
+        """
+        stale = True
+        try:
+            db = open_readonly_database(dbname)
+            try:
+                current = get_last_changes(db, list(last_changes), event)
+            finally:
+                close_readonly_database(db)
+            if current is not None:
+                stale = any(
+                    current[obj_type] > last_change
+                    for obj_type, last_change in last_changes.items()
+                )
+        except (Exception, SystemExit) as err:
+            print("Statistics store check failed: %s" % err, file=sys.stderr)
+        GLib.idle_add(self.finish_validation, event, stale)
+
+    def finish_validation(self, event, stale):
+        """
+        Recollect the statistics if the loaded store was stale.
+        """
+        if event is not self.validate_event or event.is_set():
+            return False
+        self.validate_event = None
+        if stale:
+            self.recalculate_data()
+        return False
+
+    def cancel_validation(self):
+        """
+        Stop checking a loaded store.
+        """
+        if self.validate_event:
+            self.validate_event.set()
+            self.validate_event = None
 
     def determine_collection_method(self):
         """
         Determine based on size what method to try to use.
         """
         if self.dbstate.is_open():
-            total, dummy_obj_list = get_object_list(
-                self.dbstate.db.get_dbname()
-            )
+            total = sum(get_object_counts(self.dbstate.db).values())
             if total > self.threshold:
                 return True
         return False
 
-    def emit_statistics_updated(self, thread_dbname):
+    def emit_statistics_updated(self, thread_dbname, thread_event):
         """
         Emit statistics updated signal.
         """
-        for (index, (dbname, dummy_thread, dummy_event)) in enumerate(
-            self.threads
-        ):
-            if dbname == thread_dbname:
-                if self.dbstate.db.get_dbname() == thread_dbname:
-                    self.emit("statistics-updated", (self.data,))
-                del self.threads[index]
+        self.clean_stale_thread(thread_event)
+        if self.dbstate.db.get_dbname() == thread_dbname:
+            with self.lock:
+                changes, self.change_queue = self.change_queue, {}
+            if changes:
+                self.apply_changes(changes)
+            self.emit("statistics-updated", (self.data,))
         return False
 
-    def clean_stale_thread(self, thread_dbname):
+    def clean_stale_thread(self, thread_event):
         """
-        Cleanup aborted thread entry.
+        Cleanup finished or aborted thread entry.
         """
-        for (index, (dbname, dummy_thread, dummy_event)) in enumerate(
-            self.threads
-        ):
-            if dbname == thread_dbname:
-                del self.threads[index]
+        self.threads = [x for x in self.threads if x[2] is not thread_event]
+        return False
+
+    def is_collecting(self):
+        """
+        Return True if a collection is running for the current database.
+        """
+        current_dbname = self.dbstate.db.get_dbname()
+        for (dbname, dummy_thread, event) in self.threads:
+            if dbname == current_dbname and not event.is_set():
+                return True
+        return False
+
+    def pause_collection(self):
+        """
+        Cancel the running collection so it can be resumed later from the
+        object types that were not completed.
+        """
+        for (dummy_dbname, dummy_thread, event) in self.threads:
+            event.set()
+        self.paused = True
 
-    def collect_statistics(self, event, dbname):
+    def collect_statistics(self, event, dbname, exclude):
         """
-        Thread to handle the statistics collection work.
+        Thread to handle the statistics collection work. If the worker
+        process fails the collection continues in serial mode, and if that
+        fails too the collection is abandoned so it is not left running.
         """
         s = time.time()
-        done = False
-        if self.concurrent and self.worker:
-            args = ["python3", "-u", self.worker, "-t", dbname]
-            if self.all_events:
-                args.append("-a")
-            try:
-                process = Popen(args, stdout=PIPE)
-                finished = False
-                while not finished:
-                    try:
-                        output, dummy_errors = process.communicate(timeout=0.1)
-                        finished = True
-                    except TimeoutExpired:
-                        if event.is_set():
-                            process.terminate()
-                            output, dummy_errors = process.communicate()
-                            finished = True
-                if not event.is_set():
-                    with self.lock:
-                        self.data = pickle.loads(output)
-                print(
-                    "stats collected: %s" % (time.time() - s), file=sys.stderr
-                )
-                done = True
-            except FileNotFoundError:
-                self.worker = None
-            except EOFError:
-                self.worker = None
-        if not done:
-            args = {
-                "all_events": self.all_events,
-                "tree_name": dbname,
-                "serial": True,
-            }
-            dummy_total, data = gather_statistics(args, event=event)
-            if not event.is_set():
+        try:
+            done = False
+            if self.concurrent and self.worker:
+                done = self.collect_worker_statistics(event, dbname, exclude)
+            if not done and not event.is_set():
                 with self.lock:
-                    self.data = data
+                    exclude = set(exclude) | set(self.results)
+                args = {
+                    "all_events": self.all_events,
+                    "objects": True,
+                    "tree_name": dbname,
+                    "serial": True,
+                    "exclude": exclude,
+                }
+                gather_statistics(
+                    args,
+                    event=event,
+                    report=partial(self.load_result, event),
+                )
             print("stats collected: %s" % (time.time() - s), file=sys.stderr)
+        except (Exception, SystemExit) as err:
+            print("Statistics collection failed: %s" % err, file=sys.stderr)
+            event.set()
         if not event.is_set():
-            GLib.idle_add(self.emit_statistics_updated, dbname)
+            with self.lock:
+                self.store_dirty = True
+            self.save_store()
+            GLib.idle_add(self.emit_statistics_updated, dbname, event)
         else:
-            GLib.idle_add(self.clean_stale_thread, dbname)
+            GLib.idle_add(self.clean_stale_thread, event)
+
+    def collect_worker_statistics(self, event, dbname, exclude):
+        """
+        Collect the statistics with the concurrent worker process. Returns
+        False if the worker could not be used.
+        """
+        args = [
+            "python3",
+            "-u",
+            self.worker,
+            "-o",
+            "-n",
+            str(WORKER_NICENESS),
+            "-t",
+            dbname,
+        ]
+        if self.all_events:
+            args.append("-a")
+        if exclude:
+            args.extend(["-x"] + sorted(exclude))
+        try:
+            process = Popen(
+                args,
+                stdout=PIPE,
+                bufsize=0,
+                start_new_session=hasattr(os, "killpg"),
+            )
+        except OSError:
+            self.worker = None
+            return False
+        try:
+            if self.read_worker_results(process, event):
+                process.wait()
+        except Exception as err:
+            print("Statistics worker failed: %s" % err, file=sys.stderr)
+            self.worker = None
+            return False
+        finally:
+            stop_worker_process(process)
+        return True
 
-    def spawn_collect_statistics(self):
+    def read_worker_results(self, process, event):
         """
-        Spawn statistics collection thread.
+        Read the result frames streamed by the worker process, loading the
+        results for each object type as they arrive. The frames are read by
+        a separate thread so the wait for each one can time out to check
+        if the collection was cancelled. Returns False if it was.
+        """
+        frames = Queue()
+        Thread(
+            target=read_frames, args=(process.stdout, frames), daemon=True
+        ).start()
+        while True:
+            try:
+                frame = frames.get(timeout=0.1)
+            except Empty:
+                if event.is_set():
+                    return False
+                continue
+            if isinstance(frame, Exception):
+                raise frame
+            obj_type, result = frame
+            if obj_type is None:
+                return True
+            self.load_result(event, obj_type, result)
+
+    def load_result(self, event, obj_type, result):
+        """
+        Load the results for an object type so partial statistics can be
+        shown while collection continues.
+        """
+        with self.lock:
+            if event.is_set():
+                return
+            self.results[obj_type] = result
+            self.data = self.build_data()
+        if not self.update_pending:
+            self.update_pending = True
+            GLib.idle_add(self.emit_update)
+
+    def spawn_collect_statistics(self, resume=False):
+        """
+        Spawn statistics collection thread. When resuming the object types
+        already collected are kept and skipped.
         """
         current_dbname = self.dbstate.db.get_dbname()
         if current_dbname:
             need_collect = True
             for (dbname, dummy_thread, event) in self.threads:
-                if dbname == current_dbname:
+                if dbname == current_dbname and not event.is_set():
                     need_collect = False
                 else:
                     event.set()
             if need_collect:
+                if not resume:
+                    self.cancel_validation()
+                self.paused = False
                 self.concurrent = self.determine_collection_method()
+                self.store_path = get_statistics_store_path(self.dbstate)
                 with self.lock:
-                    self.data.clear()
+                    if not resume:
+                        self.data = {}
+                        self.results = {}
+                        self.change_queue = {}
                     event = Event()
                     thread = Thread(
                         target=self.collect_statistics,
                         args=(
                             event,
                             current_dbname,
+                            set(self.results),
                         ),
                     )
                     self.threads.append((current_dbname, thread, event))
@@ -264,15 +651,68 @@ class StatisticsService(Callback):
         else:
             for (dummy_dbname, dummy_thread, event) in self.threads:
                 event.set()
+            self.cancel_validation()
+            self.paused = False
             with self.lock:
-                self.data.clear()
+                self.data = {}
+                self.results = {}
+                self.change_queue = {}
+
+    def schedule_collection(self):
+        """
+        Schedule a collection to start when the main loop is idle. Requests
+        made while one is already scheduled are coalesced into it.
+        """
+        if not self.collect_timer:
+            self.collect_timer = GLib.timeout_add(
+                COLLECT_DELAY,
+                self.start_collection,
+                priority=GLib.PRIORITY_LOW,
+            )
+
+    def start_collection(self):
+        """
+        Start a scheduled collection.
+        """
+        self.collect_timer = None
+        self.spawn_collect_statistics()
+        return False
+
+    def cancel_timers(self):
+        """
+        Cancel any pending change processing and scheduled collection.
+        """
+        for timer in [self.change_timer, self.collect_timer]:
+            if timer:
+                GLib.source_remove(timer)
+        self.change_timer = None
+        self.collect_timer = None
+        self.change_count = 0
+        self.rebuild_detected = False
 
     def database_changed(self, *_dummy_args):
         """
-        Rescan the database.
+        Save the store for the previous database, then load the store for
+        the new one or rescan it if there is no valid store.
         """
+        if self.save_timer:
+            GLib.source_remove(self.save_timer)
+            self.save_timer = None
+        self.cancel_timers()
+        for (dummy_dbname, dummy_thread, event) in self.threads:
+            event.set()
+        self.save_store()
+        self.cancel_validation()
+        self.paused = False
+        with self.lock:
+            self.data = {}
+            self.results = {}
+            self.change_queue = {}
         self.__init_signals()
-        self.spawn_collect_statistics()
+        if self.load_store():
+            self.emit("statistics-updated", (self.data,))
+        else:
+            self.schedule_collection()
 
     def request_data(self):
         """
@@ -281,14 +721,117 @@ class StatisticsService(Callback):
         with self.lock:
             if self.data != {}:
                 return self.data
-        self.spawn_collect_statistics()
+        if not self.threads and self.load_store():
+            return self.data
+        if not self.paused:
+            self.schedule_collection()
         return None
 
     def recalculate_data(self):
         """
-        Force a statistics collection if one not running.
+        Cancel any running collection and schedule a new one.
         """
-        self.spawn_collect_statistics()
+        self.cancel_validation()
+        for (dummy_dbname, dummy_thread, event) in self.threads:
+            event.set()
+        self.paused = False
+        with self.lock:
+            self.data = {}
+            self.results = {}
+            self.change_queue = {}
+        self.schedule_collection()
+
+
+def get_statistics_store_path(dbstate):
+    """
+    Return the path to the statistics store kept with the tree.
+    """
+    if dbstate.is_open():
+        save_path = dbstate.db.get_save_path()
+        if save_path:
+            return os.path.join(save_path, STORE_FILENAME)
+    return None
+
+
+def save_statistics_store(path, results, all_events):
+    """
+    Save the statistics store. The object totals are saved with it, and
+    the results hold the latest last changed timestamp for each type, so a
+    store left stale by changes made elsewhere can be detected.
+    """
+    store = {
+        "version": STORE_VERSION,
+        "all_events": all_events,
+        "signature": {
+            obj_type: result["counts"].get("total", 0)
+            for obj_type, result in results.items()
+            if obj_type in OBJECT_HANDLERS
+        },
+        "results": results,
+    }
+    temp_path = "%s.tmp" % path
+    try:
+        with open(temp_path, "wb") as store_file:
+            pickle.dump(store, store_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError as err:
+        print("Unable to save statistics store: %s" % err, file=sys.stderr)
+
+
+def load_statistics_store(path, object_counts, all_events):
+    """
+    Load the statistics store if it exists and still matches the database
+    object totals.
+    """
+    try:
+        with open(path, "rb") as store_file:
+            store = pickle.load(store_file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if (
+        not isinstance(store, dict)
+        or store.get("version") != STORE_VERSION
+        or store.get("all_events") != all_events
+        or store.get("signature") != object_counts
+    ):
+        return None
+    return {
+        obj_type: StatisticsResult.from_frame(result)
+        for obj_type, result in store["results"].items()
+    }
+
+
+def read_frames(stream, frames):
+    """
+    Read result frames from a stream onto a queue until the end frame. A
+    read error is put on the queue in place of a frame.
+    """
+    while True:
+        try:
+            frame = read_frame(stream)
+        except Exception as err:
+            frames.put(err)
+            return
+        frames.put(frame)
+        if frame[0] is None:
+            return
+
+
+def stop_worker_process(process):
+    """
+    Stop the worker process if it is still running and reap it. On POSIX
+    systems the worker is started in its own process group, which is
+    signalled as a whole so its pool processes are stopped with it.
+    """
+    if process.poll() is None:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except OSError:
+            pass
+    process.wait()
 
 
 def find_statistics_service_worker():
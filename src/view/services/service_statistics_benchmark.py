@@ -0,0 +1,633 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics service worker benchmark
+
+Generates synthetic trees of a given number of people in the SQLite
+backend, runs the statistics worker against them in each collection mode
+and writes the wall time, peak resident set size and per examiner timings
+of every run to a JSON report. Like the worker it is run standalone:
+
+    python3 service_statistics_benchmark.py -p 10000 100000 -r report.json
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import argparse
+import platform
+from subprocess import Popen, PIPE
+from tempfile import TemporaryFile
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.cli.clidbman import CLIDbManager
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.dbstate import DbState
+from gramps.gen.lib import (
+    ChildRef,
+    Citation,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    FamilyRelType,
+    Media,
+    MediaRef,
+    Name,
+    Note,
+    NoteType,
+    Person,
+    Place,
+    PlaceName,
+    PlaceType,
+    RepoRef,
+    Repository,
+    RepositoryType,
+    Source,
+    Surname,
+)
+from gramps.version import VERSION
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from service_statistics_worker import read_frame
+
+WORKER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "service_statistics_worker.py"
+)
+
+# Number of secondary objects generated per person.
+OBJECT_RATIOS = {
+    "Place": 0.05,
+    "Repository": 0.0005,
+    "Source": 0.005,
+    "Media": 0.1,
+    "Note": 0.2,
+}
+
+# Probability a person has each optional event, and that a person or event
+# has a citation, media reference, note or place attached.
+EVENT_RATIOS = {
+    EventType.DEATH: 0.6,
+    EventType.BURIAL: 0.3,
+    EventType.RESIDENCE: 0.5,
+    EventType.OCCUPATION: 0.3,
+}
+CITATION_RATIO = 0.5
+MEDIA_RATIO = 0.1
+NOTE_RATIO = 0.2
+PLACE_RATIO = 0.8
+
+# People are committed in batches of this size.
+BATCH_SIZE = 10000
+
+FIRST_NAMES = [
+    "Anna",
+    "Carl",
+    "Elise",
+    "Frederick",
+    "Hanna",
+    "John",
+    "Karin",
+    "Lars",
+    "Maria",
+    "Peter",
+    "",
+]
+SURNAMES = [
+    "Andersen",
+    "Berg",
+    "Carlson",
+    "Dahl",
+    "Eriksen",
+    "Holm",
+    "Lund",
+    "Nilsen",
+    "Strand",
+    "",
+]
+
+MODES = ["serial", "concurrent", "sharded"]
+
+
+# Every object is given a predictable handle so a family can refer to
+# people that have not been generated yet. Three people are generated per
+# family, a father, a mother who married in and a child. The fathers of
+# families 2f + 1 and 2f + 2 are also children of family f, which gives a
+# tree of a realistic depth.
+
+
+def get_handle(prefix, index):
+    """
+    Return the handle for a generated object.
+    """
+    return "%s%08d" % (prefix, index)
+
+
+def get_count(people, obj_type):
+    """
+    Return the number of secondary objects of a type to generate.
+    """
+    return max(1, int(people * OBJECT_RATIOS[obj_type]))
+
+
+def get_children(family_index, people):
+    """
+    Return the indexes of the children of a family.
+    """
+    children = [family_index * 3 + 2]
+    for child_family in [family_index * 2 + 1, family_index * 2 + 2]:
+        if child_family * 3 < people:
+            children.append(child_family * 3)
+    return [x for x in children if x < people]
+
+
+def get_parent_family(person_index):
+    """
+    Return the index of the parent family of a person or None.
+    """
+    if person_index % 3 == 2:
+        return person_index // 3
+    if person_index % 3 == 0 and person_index:
+        return (person_index // 3 - 1) // 2
+    return None
+
+
+def generate_secondary_objects(db, rng, people):
+    """
+    Generate the places, repositories, sources, media and notes.
+    """
+    with DbTxn("Generate objects", db, batch=True) as trans:
+        for index in range(get_count(people, "Place")):
+            place = Place()
+            place.set_handle(get_handle("L", index))
+            place.set_name(PlaceName(value="Place %s" % index))
+            place.set_type(PlaceType(PlaceType.CITY))
+            if rng.random() < 0.7:
+                place.set_latitude("%.4f" % rng.uniform(-90, 90))
+                place.set_longitude("%.4f" % rng.uniform(-180, 180))
+            db.add_place(place, trans)
+        for index in range(get_count(people, "Repository")):
+            repository = Repository()
+            repository.set_handle(get_handle("R", index))
+            repository.set_name("Archive %s" % index)
+            repository.set_type(RepositoryType(RepositoryType.ARCHIVE))
+            db.add_repository(repository, trans)
+        for index in range(get_count(people, "Source")):
+            source = Source()
+            source.set_handle(get_handle("S", index))
+            source.set_title("Register %s" % index)
+            if rng.random() < 0.5:
+                source.set_author("Parish clerk")
+            repo_ref = RepoRef()
+            repo_ref.set_reference_handle(
+                get_handle("R", rng.randrange(get_count(people, "Repository")))
+            )
+            if rng.random() < 0.5:
+                repo_ref.set_call_number("%s" % index)
+            source.add_repo_reference(repo_ref)
+            db.add_source(source, trans)
+        for index in range(get_count(people, "Media")):
+            media = Media()
+            media.set_handle(get_handle("M", index))
+            media.set_path("media/image%s.jpg" % index)
+            media.set_mime_type("image/jpeg")
+            media.set_description("Image %s" % index)
+            db.add_media(media, trans)
+        for index in range(get_count(people, "Note")):
+            note = Note()
+            note.set_handle(get_handle("N", index))
+            note.set("Research note %s" % index)
+            note.set_type(NoteType(NoteType.GENERAL))
+            db.add_note(note, trans)
+
+
+def generate_person(db, rng, trans, people, index):
+    """
+    Generate a person with their events, citations and references.
+    """
+    person = Person()
+    person.set_handle(get_handle("I", index))
+    if index % 3 == 0:
+        person.set_gender(Person.MALE)
+    elif index % 3 == 1:
+        person.set_gender(Person.FEMALE)
+    else:
+        person.set_gender(rng.choice([Person.MALE, Person.FEMALE]))
+
+    name = Name()
+    name.set_first_name(rng.choice(FIRST_NAMES))
+    surname = Surname()
+    surname.set_surname(rng.choice(SURNAMES))
+    surname.set_primary(True)
+    name.add_surname(surname)
+    person.set_primary_name(name)
+
+    if index % 3 != 2:
+        person.add_family_handle(get_handle("F", index // 3))
+    parent_family = get_parent_family(index)
+    if parent_family is not None:
+        person.add_parent_family_handle(get_handle("F", parent_family))
+
+    year = 1600 + rng.randrange(400)
+    event_types = [EventType.BIRTH] + [
+        event_type
+        for event_type, ratio in EVENT_RATIOS.items()
+        if rng.random() < ratio
+    ]
+    for event_type in event_types:
+        event_ref = generate_event(db, rng, trans, people, event_type, year)
+        person.add_event_ref(event_ref)
+        if event_type == EventType.BIRTH:
+            person.set_birth_ref(event_ref)
+        elif event_type == EventType.DEATH:
+            person.set_death_ref(event_ref)
+
+    if rng.random() < MEDIA_RATIO:
+        media_ref = MediaRef()
+        media_ref.set_reference_handle(
+            get_handle("M", rng.randrange(get_count(people, "Media")))
+        )
+        person.add_media_reference(media_ref)
+    if rng.random() < NOTE_RATIO:
+        person.add_note(
+            get_handle("N", rng.randrange(get_count(people, "Note")))
+        )
+    if rng.random() < CITATION_RATIO:
+        person.add_citation(generate_citation(db, rng, trans, people))
+    db.add_person(person, trans)
+
+
+def generate_event(db, rng, trans, people, event_type, year):
+    """
+    Generate an event, returning a reference to it.
+    """
+    event = Event()
+    event.set_type(EventType(event_type))
+    if rng.random() < 0.9:
+        date = Date()
+        date.set_yr_mon_day(
+            year + rng.randrange(80), rng.randint(1, 12), rng.randint(1, 28)
+        )
+        event.set_date_object(date)
+    if rng.random() < PLACE_RATIO:
+        event.set_place_handle(
+            get_handle("L", rng.randrange(get_count(people, "Place")))
+        )
+    if rng.random() < CITATION_RATIO:
+        event.add_citation(generate_citation(db, rng, trans, people))
+    db.add_event(event, trans)
+    event_ref = EventRef()
+    event_ref.set_reference_handle(event.get_handle())
+    return event_ref
+
+
+def generate_citation(db, rng, trans, people):
+    """
+    Generate a citation, returning its handle.
+    """
+    citation = Citation()
+    citation.set_reference_handle(
+        get_handle("S", rng.randrange(get_count(people, "Source")))
+    )
+    if rng.random() < 0.8:
+        citation.set_page("Page %s" % rng.randrange(500))
+    citation.set_confidence_level(rng.randrange(5))
+    db.add_citation(citation, trans)
+    return citation.get_handle()
+
+
+def generate_family(db, rng, trans, people, family_index):
+    """
+    Generate a family with its marriage event.
+    """
+    family = Family()
+    family.set_handle(get_handle("F", family_index))
+    family.set_relationship(FamilyRelType(FamilyRelType.MARRIED))
+    family.set_father_handle(get_handle("I", family_index * 3))
+    if family_index * 3 + 1 < people:
+        family.set_mother_handle(get_handle("I", family_index * 3 + 1))
+    for child_index in get_children(family_index, people):
+        child_ref = ChildRef()
+        child_ref.set_reference_handle(get_handle("I", child_index))
+        family.add_child_ref(child_ref)
+    year = 1620 + rng.randrange(400)
+    family.add_event_ref(
+        generate_event(db, rng, trans, people, EventType.MARRIAGE, year)
+    )
+    db.add_family(family, trans)
+
+
+def generate_tree(title, people, seed):
+    """
+    Create a new SQLite tree and fill it with synthetic data.
+    """
+    dbman = CLIDbManager(DbState())
+    path, title = dbman.create_new_db_cli(title, dbid="sqlite")
+    db = make_database("sqlite")
+    db.load(path)
+    rng = random.Random(seed)
+    generate_secondary_objects(db, rng, people)
+    for start in range(0, people, BATCH_SIZE):
+        with DbTxn("Generate people", db, batch=True) as trans:
+            for index in range(start, min(start + BATCH_SIZE, people)):
+                generate_person(db, rng, trans, people, index)
+                if index % 3 == 0:
+                    generate_family(db, rng, trans, people, index // 3)
+    counts = {
+        "Person": db.get_number_of_people(),
+        "Family": db.get_number_of_families(),
+        "Event": db.get_number_of_events(),
+        "Place": db.get_number_of_places(),
+        "Media": db.get_number_of_media(),
+        "Source": db.get_number_of_sources(),
+        "Citation": db.get_number_of_citations(),
+        "Repository": db.get_number_of_repositories(),
+        "Note": db.get_number_of_notes(),
+    }
+    db.close()
+    return title, counts
+
+
+def remove_tree(title):
+    """
+    Remove a generated tree.
+    """
+    dbman = CLIDbManager(DbState())
+    dbman.remove_database(title)
+
+
+def get_mode_args(mode, jobs, shard_size):
+    """
+    Return the worker arguments for a collection mode.
+    """
+    if mode == "serial":
+        return ["-s"]
+    args = ["-j", str(jobs)]
+    if mode == "concurrent":
+        return args + ["-S", str(sys.maxsize)]
+    return args + ["-S", str(shard_size)]
+
+
+def parse_timings(output, serial):
+    """
+    Parse the timings the worker dumps for each examiner. The times are
+    from the start of the run, so in serial mode the time taken by each
+    examiner is the difference from the one before it.
+    """
+    examiners = []
+    for line in output.splitlines():
+        fields = line.rsplit(None, 2)
+        if len(fields) != 3 or fields[0] == "Run complete":
+            continue
+        try:
+            objects, finished = int(fields[1]), float(fields[2])
+        except ValueError:
+            continue
+        examiners.append(
+            {"label": fields[0], "objects": objects, "finished": finished}
+        )
+    examiners.sort(key=lambda x: x["finished"])
+    if serial:
+        previous = 0
+        for examiner in examiners:
+            examiner["seconds"] = examiner["finished"] - previous
+            previous = examiner["finished"]
+    return examiners
+
+
+def run_worker(title, mode, args):
+    """
+    Run the worker once, returning the wall time, peak resident set size
+    and examiner timings.
+    """
+    command = [sys.executable, "-u", WORKER, "-o", "-T", "-t", title]
+    if args.all_events:
+        command.append("-a")
+    command.extend(get_mode_args(mode, args.jobs, args.shard_size))
+
+    # The timings are written to a file rather than a pipe, so a worker
+    # writing a lot to stderr can not block while frames are being read.
+    with TemporaryFile() as error_file:
+        start = time.perf_counter()
+        process = Popen(command, stdout=PIPE, stderr=error_file, bufsize=0)
+        frames = 0
+        completed = False
+        while True:
+            try:
+                obj_type, dummy_result = read_frame(process.stdout)
+            except (EOFError, ValueError, pickle.UnpicklingError):
+                # A worker that died or sent a bad frame is still reaped
+                # so its status and stderr are recorded with the run.
+                process.kill()
+                break
+            if obj_type is None:
+                completed = True
+                break
+            frames += 1
+        process.stdout.close()
+        dummy_pid, status, usage = os.wait4(process.pid, 0)
+        wall_time = time.perf_counter() - start
+        error_file.seek(0)
+        errors = error_file.read().decode("utf-8", errors="replace")
+    if os.WIFEXITED(status):
+        process.returncode = os.WEXITSTATUS(status)
+    else:
+        process.returncode = -os.WTERMSIG(status)
+
+    # ru_maxrss is the peak of the largest process, the worker or one of
+    # its pool processes, in kilobytes on Linux but bytes on macOS.
+    peak_rss = usage.ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss = peak_rss // 1024
+    return {
+        "mode": mode,
+        "jobs": 1 if mode == "serial" else args.jobs,
+        "status": process.returncode,
+        "completed": completed,
+        "frames": frames,
+        "wall_seconds": wall_time,
+        "peak_rss_kb": peak_rss,
+        "examiners": parse_timings(errors, mode == "serial"),
+        "stderr": "" if completed else errors,
+    }
+
+
+def benchmark_tree(title, counts, args):
+    """
+    Run each collection mode against a tree the requested number of times.
+    """
+    runs = []
+    for repeat in range(args.repeat):
+        for mode in args.modes:
+            run = run_worker(title, mode, args)
+            run["repeat"] = repeat
+            runs.append(run)
+            print(
+                "{0:<24} {1:<10} {2:8.2f}s {3:8} KB".format(
+                    title, mode, run["wall_seconds"], run["peak_rss_kb"]
+                ),
+                file=sys.stderr,
+            )
+    return {"title": title, "counts": counts, "runs": runs}
+
+
+def main():
+    """
+    Main program.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-a",
+        "--all",
+        dest="all_events",
+        default=False,
+        action="store_true",
+        help="Examine all person events",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes for the concurrent modes",
+    )
+    parser.add_argument(
+        "-k",
+        "--keep",
+        dest="keep",
+        default=False,
+        action="store_true",
+        help="Keep the generated trees",
+    )
+    parser.add_argument(
+        "-m",
+        "--modes",
+        dest="modes",
+        nargs="+",
+        choices=MODES,
+        default=MODES,
+        help="Collection modes to benchmark",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        dest="repeat",
+        type=int,
+        default=1,
+        help="Number of times to run each mode",
+    )
+    parser.add_argument(
+        "-p",
+        "--people",
+        dest="people",
+        type=int,
+        nargs="+",
+        default=[10000],
+        help="Number of people in each generated tree",
+    )
+    parser.add_argument(
+        "-r",
+        "--report",
+        dest="report",
+        default="statistics-benchmark.json",
+        help="Path of the JSON report",
+    )
+    parser.add_argument(
+        "-S",
+        "--shard-size",
+        dest="shard_size",
+        type=int,
+        default=5000,
+        help="Minimum number of objects in a shard in sharded mode",
+    )
+    parser.add_argument(
+        "--seed",
+        dest="seed",
+        type=int,
+        default=1,
+        help="Random seed for the generated trees",
+    )
+    parser.add_argument(
+        "-t",
+        "--tree",
+        dest="trees",
+        nargs="+",
+        default=[],
+        help="Benchmark existing trees instead of generating them",
+    )
+    args = parser.parse_args()
+
+    report = {
+        "gramps": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "trees": [],
+    }
+    for title in args.trees:
+        report["trees"].append(benchmark_tree(title, None, args))
+    if not args.trees:
+        for people in args.people:
+            start = time.perf_counter()
+            title, counts = generate_tree(
+                "Statistics Benchmark %s" % people, people, args.seed
+            )
+            generate_time = time.perf_counter() - start
+            print(
+                "{0:<24} generated {1:8.2f}s".format(title, generate_time),
+                file=sys.stderr,
+            )
+            try:
+                result = benchmark_tree(title, counts, args)
+                result["people"] = people
+                result["generate_seconds"] = generate_time
+                report["trees"].append(result)
+            finally:
+                if not args.keep:
+                    remove_tree(title)
+
+    with open(args.report, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
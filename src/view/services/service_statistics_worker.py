@@ -29,722 +29,914 @@ Statistics service worker
 # Python Modules
 #
 # -------------------------------------------------------------------------
-import io
 import os
 import sys
 import time
 import pickle
+import signal
+import struct
 import argparse
-from multiprocessing import Process, Queue
+from collections import Counter
+from functools import partial
+from multiprocessing import Pool
 
 # -------------------------------------------------------------------------
 #
 # Gramps Modules
 #
 # -------------------------------------------------------------------------
-from gramps.gen.datehandler import get_date
 from gramps.gen.db import DBLOCKFN, DBMODE_R
 from gramps.gen.db.utils import (
     lookup_family_tree,
     make_database,
     write_lock_file,
 )
-from gramps.gen.lib import Citation, Person, EventType, EventRoleType
+from gramps.gen.lib import Citation, EventRoleType, EventType, Person
 from gramps.gen.utils.alive import probably_alive
 from gramps.gen.utils.file import media_path_full
 
+# Results are streamed to the parent as length prefixed pickled frames, one
+# per object type as each finishes, followed by an end frame without one.
+PROTOCOL_VERSION = 2
+FRAME_HEADER = struct.Struct("!I")
+
+# Position of the last changed timestamp in the raw data of each object
+# type. The latest one seen is kept with the results so a saved store can
+# be checked against the database.
+CHANGE_POSITIONS = {
+    "Person": 17,
+    "Family": 12,
+    "Event": 10,
+    "Place": 15,
+    "Media": 9,
+    "Source": 8,
+    "Citation": 9,
+    "Repository": 7,
+    "Note": 5,
+    "Tag": 4,
+}
 
-def examine_people(args, queue=None, thread_event=None):
+# Object types are split into handle range shards of at least this many
+# objects each when collecting concurrently, unless overridden.
+MIN_SHARD_SIZE = 5000
+
+# Counters work on the raw serialized data tuples instead of unserialized
+# objects. Top level tuples are unpacked in full but for secondary objects
+# only the positions of the fields that are examined are named here.
+NAME_PRIVATE = 0
+NAME_CITATIONS = 1
+NAME_FIRST_NAME = 4
+NAME_SURNAMES = 5
+SURNAME_SURNAME = 0
+MEDIAREF_RECT = 5
+EVENTREF_PRIVATE = 0
+EVENTREF_REF = 4
+EVENTREF_ROLE = 5
+PERSONREF_PRIVATE = 0
+PERSONREF_CITATIONS = 1
+PERSONREF_REL = 4
+CHILDREF_PRIVATE = 0
+CHILDREF_CITATIONS = 1
+CHILDREF_FREL = 4
+CHILDREF_MREL = 5
+LDSORD_CITATIONS = 0
+LDSORD_DATE = 2
+LDSORD_PLACE = 4
+LDSORD_FAMC = 5
+LDSORD_TEMPLE = 6
+LDSORD_STATUS = 7
+LDSORD_PRIVATE = 8
+REPOREF_CALL_NUMBER = 2
+REPOREF_MEDIA_TYPE = 3
+EVENT_TYPE = 2
+EVENT_DATE = 3
+EVENT_PLACE = 5
+EVENT_CITATIONS = 6
+EVENT_PRIVATE = 12
+
+
+# Each examiner is split in two. A counter reduces the raw data for a single
+# object to its StatisticsCounts, which are gathered into a StatisticsResult
+# that can be merged with others or have objects added and removed as they
+# change. A payload builder then turns a result into the nested (count,
+# total) payload used by the dashboard.
+
+
+class StatisticsCounts(Counter):
     """
-    Parse and analyze people.
+    Mergeable counts. Plain keys are simple counters while keys that are a
+    (name, key) tuple make up a histogram of counts by type or value.
     """
 
-    def get_gender_stats(gender_stats, gender):
+    def merge(self, other):
         """
-        Return gender statistics.
+        Add other counts to these ones.
         """
-        if gender not in gender_stats:
-            gender_stats[gender] = {
-                "total": 0,
-                "private": 0,
-                "tagged": 0,
-                "uncited": 0,
-                "living": 0,
-                "living_not_private": 0,
-            }
-        return gender_stats[gender]
-
-    gender_stats = {}
-    media, media_refs, missing_region = 0, 0, 0
-    incomplete_names, alternate_names, no_families, total_living = 0, 0, 0, 0
-    names_private, names_uncited = 0, 0
-    association_types = {}
-    association, association_refs = 0, 0
-    association_private, association_uncited = 0, 0
-    participant_roles = {}
-    participant, participant_refs, participant_private = 0, 0, 0
-    ldsord_people, ldsord_refs, ldsord_private, ldsord_uncited = 0, 0, 0, 0
-    no_temple, no_status, no_date, no_place, no_family = 0, 0, 0, 0, 0
-
-    no_birth, no_birth_date, no_birth_place = 0, 0, 0
-    births_uncited, births_private = 0, 0
-    no_baptism, no_baptism_date, no_baptism_place = 0, 0, 0
-    baptisms_private = 0
-    no_death, no_death_date, no_death_place = 0, 0, 0
-    deaths_uncited, deaths_private = 0, 0
-    no_burial, no_burial_date, no_burial_place = 0, 0, 0
-    burials_private = 0
+        self.update(other)
+        return self
 
-    db = open_readonly_database(args.get("tree_name"))
-    total_people = db.get_number_of_people()
-    all_events = args.get("all_events")
+    def remove(self, other):
+        """
+        Remove other counts from these ones, keeping zero counts.
+        """
+        self.subtract(other)
+        return self
 
-    for person in db.iter_people():
-        if thread_event and thread_event.is_set():
-            break
+    def histogram(self, name, total):
+        """
+        Return the positive counts in a histogram, paired with a total.
+        """
+        return {
+            key[1]: (value, total)
+            for key, value in self.items()
+            if isinstance(key, tuple) and key[0] == name and value > 0
+        }
 
-        length = len(person.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-            for media_ref in person.media_list:
-                if not media_ref.rect:
-                    missing_region += 1
-
-        if person.alternate_names:
-            alternate_names += 1
-        for name in [person.primary_name] + person.alternate_names:
-            if name.private:
-                names_private += 1
-            if not name.citation_list:
-                names_uncited += 1
-            if name.first_name.strip() == "":
-                incomplete_names += 1
-            else:
-                if name.get_surname_list():
-                    for surname in name.get_surname_list():
-                        if surname.get_surname().strip() == "":
-                            incomplete_names += 1
-                else:
-                    incomplete_names += 1
-
-        if not person.parent_family_list and not person.family_list:
-            no_families += 1
-
-        gender = get_gender_stats(gender_stats, person.get_gender())
-        gender["total"] += 1
-        if person.private:
-            gender["private"] += 1
-        if person.tag_list:
-            gender["tagged"] += 1
-        if not person.citation_list:
-            gender["uncited"] += 1
-
-        living = True
-        birth_ref = person.get_birth_ref()
-        death_ref = person.get_death_ref()
-        has_birth, has_baptism = False, False
-        has_death, has_burial = False, False
-
-        if person.event_ref_list:
-            participant += 1
-            if all_events:
-                for event_ref in person.event_ref_list:
-                    participant_refs += 1
-                    role = event_ref.get_role()
-                    role_key = role.serialize()
-                    if role_key not in participant_roles:
-                        participant_roles[role_key] = 0
-                    participant_roles[role_key] += 1
-                    if event_ref.private:
-                        participant_private += 1
-
-                    if role == EventRoleType.PRIMARY:
-                        event = db.get_event_from_handle(event_ref.ref)
-                        if birth_ref and event.handle == birth_ref.ref:
-                            has_birth = True
-                            birth_ref = None
-                            if not get_date(event):
-                                no_birth_date += 1
-                            if not event.place:
-                                no_birth_place += 1
-                            if not event.citation_list:
-                                births_uncited += 1
-                            if event.private:
-                                births_private += 1
-                            continue
-                        if death_ref and event.handle == death_ref.ref:
-                            has_death = True
-                            death_ref = None
-                            if not get_date(event):
-                                no_death_date += 1
-                            if not event.place:
-                                no_death_place += 1
-                            if not event.citation_list:
-                                deaths_uncited += 1
-                            if event.private:
-                                deaths_private += 1
-                            living = False
-                            continue
-                        event_type = event.get_type()
-                        if event_type in [
-                            EventType.BAPTISM,
-                            EventType.CHRISTEN,
-                        ]:
-                            has_baptism = True
-                            if not get_date(event):
-                                no_baptism_date += 1
-                            if not event.place:
-                                no_baptism_place += 1
-                            if event.private:
-                                baptisms_private += 1
-                            continue
-                        if event_type in [
-                            EventType.BURIAL,
-                            EventType.CREMATION,
-                        ]:
-                            has_burial = True
-                            if not get_date(event):
-                                no_burial_date += 1
-                            if not event.place:
-                                no_burial_place += 1
-                            if event.private:
-                                burials_private += 1
-                            living = False
-                            continue
-                        if event_type in [
-                            EventType.CAUSE_DEATH,
-                            EventType.PROBATE,
-                        ]:
-                            living = False
-            else:
-                if birth_ref:
-                    event = db.get_event_from_handle(birth_ref.ref)
-                    has_birth = True
-                    if not get_date(event):
-                        no_birth_date += 1
-                    if not event.place:
-                        no_birth_place += 1
-                    if not event.citation_list:
-                        births_uncited += 1
-                    if event.private:
-                        births_private += 1
-                if death_ref:
-                    event = db.get_event_from_handle(death_ref.ref)
-                    has_death = True
-                    if not get_date(event):
-                        no_death_date += 1
-                    if not event.place:
-                        no_death_place += 1
-                    if not event.citation_list:
-                        deaths_uncited += 1
-                    if event.private:
-                        deaths_private += 1
-                    living = False
-
-        if not has_birth:
-            no_birth += 1
-        if not has_baptism:
-            no_baptism += 1
 
-        if living:
-            if not probably_alive(person, db):
-                living = False
+class StatisticsResult:
+    """
+    The counts for a set of objects of one type, optionally with the counts
+    contributed by each object so they can be removed again when it changes.
+    Values are properties of the set as a whole that are not summed when
+    results are merged.
+
+    Every object adds one to the total, so only its other nonzero counts
+    are kept and objects contributing the same counts share one tuple. Most
+    objects of the simpler types only keep a reference to the empty tuple.
+    """
+
+    __slots__ = ("counts", "objects", "values", "shared")
+
+    def __init__(self, counts=None):
+        self.counts = counts or StatisticsCounts()
+        self.objects = {}
+        self.values = {}
+        self.shared = {}
+
+    def add_object(self, handle, counts, keep=True):
+        """
+        Add the counts for an object.
+        """
+        self.counts.merge(counts)
+        if keep:
+            contribution = tuple(
+                (key, value)
+                for key, value in counts.items()
+                if value and key != "total"
+            )
+            self.objects[handle] = self.shared.setdefault(
+                contribution, contribution
+            )
+
+    def remove_object(self, handle):
+        """
+        Remove the counts for an object if they were kept.
+        """
+        contribution = self.objects.pop(handle, None)
+        if contribution is not None:
+            self.counts.remove(dict(contribution))
+            self.counts["total"] -= 1
+
+    def merge(self, other):
+        """
+        Merge another result for a disjoint set of objects into this one.
+        """
+        last_change = max(
+            self.values.get("last_change", 0),
+            other.values.get("last_change", 0),
+        )
+        self.counts.merge(other.counts)
+        self.objects.update(other.objects)
+        self.values.update(other.values)
+        self.values["last_change"] = last_change
+        return self
+
+    def note_change(self, change):
+        """
+        Note the last changed timestamp of an object.
+        """
+        if change > self.values.get("last_change", 0):
+            self.values["last_change"] = change
+
+    def to_frame(self):
+        """
+        Return the result as plain containers, so it can be unpickled by a
+        process that does not have this module loaded under the same name.
+        """
+        return {
+            "counts": dict(self.counts),
+            "objects": self.objects,
+            "values": self.values,
+        }
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Rebuild a result from plain containers.
+        """
+        result = cls(StatisticsCounts(frame["counts"]))
+        result.objects = frame["objects"]
+        result.values = frame["values"]
+        return result
+
+
+def count_vital_event(counts, event, vital, cited=True):
+    """
+    Count the statistics for a vital event from its raw data.
+    """
+    if not event[EVENT_DATE]:
+        counts["no_%s_date" % vital] += 1
+    if not event[EVENT_PLACE]:
+        counts["no_%s_place" % vital] += 1
+    if cited and not event[EVENT_CITATIONS]:
+        counts["%s_uncited" % vital] += 1
+    if event[EVENT_PRIVATE]:
+        counts["%s_private" % vital] += 1
+
+
+def count_ldsord(counts, ldsord):
+    """
+    Count the statistics for an ordinance from its raw data.
+    """
+    counts["ldsord_refs"] += 1
+    if ldsord[LDSORD_PRIVATE]:
+        counts["ldsord_private"] += 1
+    if not ldsord[LDSORD_CITATIONS]:
+        counts["ldsord_uncited"] += 1
+    if not ldsord[LDSORD_DATE]:
+        counts["no_date"] += 1
+    if not ldsord[LDSORD_PLACE]:
+        counts["no_place"] += 1
+    if not ldsord[LDSORD_TEMPLE]:
+        counts["no_temple"] += 1
+    if not ldsord[LDSORD_STATUS]:
+        counts["no_status"] += 1
+
+
+def get_vital_ref_handle(event_ref_list, index):
+    """
+    Return the event handle for a birth or death reference index.
+    """
+    if 0 <= index < len(event_ref_list):
+        return event_ref_list[index][EVENTREF_REF]
+    return None
+
+
+def count_person(db, data, args):
+    """
+    Count the statistics for a person from their raw data. If the args
+    carry a lifespan memo it is used for the living check.
+    """
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        gender,
+        primary_name,
+        alternate_names,
+        death_ref_index,
+        birth_ref_index,
+        event_ref_list,
+        family_list,
+        parent_family_list,
+        media_list,
+        dummy_address_list,
+        dummy_attribute_list,
+        dummy_urls,
+        lds_ord_list,
+        citation_list,
+        dummy_note_list,
+        dummy_change,
+        tag_list,
+        private,
+        person_ref_list,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    length = len(media_list)
+    if length > 0:
+        counts["media"] += 1
+        counts["media_refs"] += length
+        for media_ref in media_list:
+            if not media_ref[MEDIAREF_RECT]:
+                counts["missing_region"] += 1
+
+    if alternate_names:
+        counts["alternate_names"] += 1
+    for name in [primary_name] + alternate_names:
+        if name[NAME_PRIVATE]:
+            counts["names_private"] += 1
+        if not name[NAME_CITATIONS]:
+            counts["names_uncited"] += 1
+        if name[NAME_FIRST_NAME].strip() == "":
+            counts["incomplete_names"] += 1
+        else:
+            if name[NAME_SURNAMES]:
+                for surname in name[NAME_SURNAMES]:
+                    if surname[SURNAME_SURNAME].strip() == "":
+                        counts["incomplete_names"] += 1
             else:
-                total_living += 1
-                gender["living"] += 1
-                if not person.private:
-                    gender["living_not_private"] += 1
-
-        if not living:
-            if not has_death:
-                no_death += 1
-            if not has_burial:
-                no_burial += 1
-
-        if person.person_ref_list:
-            association += 1
-            for person_ref in person.person_ref_list:
-                association_refs += 1
-                if person_ref.private:
-                    association_private += 1
-                if not person_ref.citation_list:
-                    association_uncited += 1
-                if person_ref.rel not in association_types:
-                    association_types[person_ref.rel] = 0
-                association_types[person_ref.rel] += 1
-
-        if person.lds_ord_list:
-            ldsord_people += 1
-            for ldsord in person.lds_ord_list:
-                ldsord_refs += 1
-                if ldsord.private:
-                    ldsord_private += 1
-                if not ldsord.citation_list:
-                    ldsord_uncited += 1
-                if not get_date(ldsord):
-                    no_date += 1
-                if not ldsord.place:
-                    no_place += 1
-                if not ldsord.famc:
-                    no_family += 1
-                if not ldsord.temple:
-                    no_temple += 1
-                if not ldsord.status:
-                    no_status += 1
-    close_readonly_database(db)
+                counts["incomplete_names"] += 1
+
+    if not parent_family_list and not family_list:
+        counts["no_families"] += 1
+
+    counts[("gender_total", gender)] += 1
+    if private:
+        counts[("gender_private", gender)] += 1
+    if tag_list:
+        counts[("gender_tagged", gender)] += 1
+    if not citation_list:
+        counts[("gender_uncited", gender)] += 1
+
+    living = True
+    birth_handle = get_vital_ref_handle(event_ref_list, birth_ref_index)
+    death_handle = get_vital_ref_handle(event_ref_list, death_ref_index)
+    has_birth, has_baptism = False, False
+    has_death, has_burial = False, False
+
+    if event_ref_list:
+        counts["participant"] += 1
+        if args.get("all_events"):
+            for event_ref in event_ref_list:
+                counts["participant_refs"] += 1
+                role = event_ref[EVENTREF_ROLE]
+                counts[("participant_roles", role)] += 1
+                if event_ref[EVENTREF_PRIVATE]:
+                    counts["participant_private"] += 1
+
+                if role[0] == EventRoleType.PRIMARY:
+                    event_handle = event_ref[EVENTREF_REF]
+                    event = db.get_raw_event_data(event_handle)
+                    if birth_handle and event_handle == birth_handle:
+                        has_birth = True
+                        birth_handle = None
+                        count_vital_event(counts, event, "birth")
+                        continue
+                    if death_handle and event_handle == death_handle:
+                        has_death = True
+                        death_handle = None
+                        count_vital_event(counts, event, "death")
+                        living = False
+                        continue
+                    event_type = event[EVENT_TYPE][0]
+                    if event_type in [
+                        EventType.BAPTISM,
+                        EventType.CHRISTEN,
+                    ]:
+                        has_baptism = True
+                        count_vital_event(
+                            counts, event, "baptism", cited=False
+                        )
+                        continue
+                    if event_type in [
+                        EventType.BURIAL,
+                        EventType.CREMATION,
+                    ]:
+                        has_burial = True
+                        count_vital_event(counts, event, "burial", cited=False)
+                        living = False
+                        continue
+                    if event_type in [
+                        EventType.CAUSE_DEATH,
+                        EventType.PROBATE,
+                    ]:
+                        living = False
+        else:
+            if birth_handle:
+                event = db.get_raw_event_data(birth_handle)
+                has_birth = True
+                count_vital_event(counts, event, "birth")
+            if death_handle:
+                event = db.get_raw_event_data(death_handle)
+                has_death = True
+                count_vital_event(counts, event, "death")
+                living = False
 
-    for key in participant_roles:
-        participant_roles[key] = (participant_roles[key], participant_refs)
-    for key in association_types:
-        association_types[key] = (association_types[key], association_refs)
+    if not has_birth:
+        counts["no_birth"] += 1
+    if not has_baptism:
+        counts["no_baptism"] += 1
 
-    with_birth = total_people - no_birth
-    with_baptism = total_people - no_baptism
-    dead_people = total_people - total_living
-    with_death = dead_people - no_death
-    with_burial = dead_people - no_burial
+    if living:
+        person = Person().unserialize(data)
+        lifespans = args.get("lifespans")
+        if lifespans:
+            living = lifespans.is_alive(db, person)
+        else:
+            living = probably_alive(person, db)
+        if living:
+            counts["living"] += 1
+            counts[("gender_living", gender)] += 1
+            if not private:
+                counts[("gender_living_not_private", gender)] += 1
+
+    if not living:
+        if not has_death:
+            counts["no_death"] += 1
+        if not has_burial:
+            counts["no_burial"] += 1
+
+    if person_ref_list:
+        counts["association"] += 1
+        for person_ref in person_ref_list:
+            counts["association_refs"] += 1
+            if person_ref[PERSONREF_PRIVATE]:
+                counts["association_private"] += 1
+            if not person_ref[PERSONREF_CITATIONS]:
+                counts["association_uncited"] += 1
+            counts[("association_types", person_ref[PERSONREF_REL])] += 1
+
+    if lds_ord_list:
+        counts["ldsord"] += 1
+        for ldsord in lds_ord_list:
+            count_ldsord(counts, ldsord)
+            if not ldsord[LDSORD_FAMC]:
+                counts["no_family"] += 1
+    return counts
+
+
+def build_person_payload(result):
+    """
+    Build the people payload.
+    """
+    counts = result.counts
+    total_people = counts["total"]
+    participant_refs = counts["participant_refs"]
+    association_refs = counts["association_refs"]
+    ldsord_refs = counts["ldsord_refs"]
+    with_birth = total_people - counts["no_birth"]
+    with_baptism = total_people - counts["no_baptism"]
+    dead_people = total_people - counts["living"]
+    with_death = dead_people - counts["no_death"]
+    with_burial = dead_people - counts["no_burial"]
 
     payload = {
         "person": {
             "total": (total_people, None),
-            "incomplete_names": (incomplete_names, total_people),
-            "alternate_names": (alternate_names, total_people),
-            "no_family_connection": (no_families, total_people),
-            "no_birth": (no_birth, total_people),
-            "no_birth_date": (no_birth_date, with_birth),
-            "no_birth_place": (no_birth_place, with_birth),
-            "no_baptism": (no_baptism, total_people),
-            "no_baptism_date": (no_baptism_date, with_baptism),
-            "no_baptism_place": (no_baptism_place, with_baptism),
-            "no_death": (no_death, dead_people),
-            "no_death_date": (no_death_date, with_death),
-            "no_death_place": (no_death_place, with_death),
-            "no_burial": (no_burial, dead_people),
-            "no_burial_date": (no_burial_date, with_burial),
-            "no_burial_place": (no_burial_place, with_burial),
+            "incomplete_names": (counts["incomplete_names"], total_people),
+            "alternate_names": (counts["alternate_names"], total_people),
+            "no_family_connection": (counts["no_families"], total_people),
+            "no_birth": (counts["no_birth"], total_people),
+            "no_birth_date": (counts["no_birth_date"], with_birth),
+            "no_birth_place": (counts["no_birth_place"], with_birth),
+            "no_baptism": (counts["no_baptism"], total_people),
+            "no_baptism_date": (counts["no_baptism_date"], with_baptism),
+            "no_baptism_place": (counts["no_baptism_place"], with_baptism),
+            "no_death": (counts["no_death"], dead_people),
+            "no_death_date": (counts["no_death_date"], with_death),
+            "no_death_place": (counts["no_death_place"], with_death),
+            "no_burial": (counts["no_burial"], dead_people),
+            "no_burial_date": (counts["no_burial_date"], with_burial),
+            "no_burial_place": (counts["no_burial_place"], with_burial),
         },
         "media": {
-            "person": (media, total_people),
-            "person_refs": (media_refs, None),
-            "person_missing_region": (missing_region, media_refs),
+            "person": (counts["media"], total_people),
+            "person_refs": (counts["media_refs"], None),
+            "person_missing_region": (
+                counts["missing_region"],
+                counts["media_refs"],
+            ),
         },
         "ldsord_person": {
-            "ldsord": (ldsord_people, total_people),
+            "ldsord": (counts["ldsord"], total_people),
             "ldsord_refs": (ldsord_refs, None),
-            "no_temple": (no_temple, ldsord_refs),
-            "no_status": (no_status, ldsord_refs),
-            "no_date": (no_date, ldsord_refs),
-            "no_place": (no_place, ldsord_refs),
-            "no_family": (no_family, ldsord_refs),
+            "no_temple": (counts["no_temple"], ldsord_refs),
+            "no_status": (counts["no_status"], ldsord_refs),
+            "no_date": (counts["no_date"], ldsord_refs),
+            "no_place": (counts["no_place"], ldsord_refs),
+            "no_family": (counts["no_family"], ldsord_refs),
         },
         "association": {
-            "total": (association, total_people),
+            "total": (counts["association"], total_people),
             "refs": (association_refs, None),
-            "types": association_types,
+            "types": counts.histogram(
+                "association_types", association_refs
+            ),
         },
         "participant": {
-            "person_total": (participant, total_people),
+            "person_total": (counts["participant"], total_people),
             "person_refs": (participant_refs, None),
-            "person_roles": participant_roles,
+            "person_roles": counts.histogram(
+                "participant_roles", participant_refs
+            ),
         },
         "uncited": {
-            "association": (association_uncited, association_refs),
-            "ldsord_person": (ldsord_uncited, ldsord_refs),
-            "names": (names_uncited, None),
-            "preferred_births": (births_uncited, with_birth),
-            "preferred_deaths": (deaths_uncited, with_death),
+            "association": (counts["association_uncited"], association_refs),
+            "ldsord_person": (counts["ldsord_uncited"], ldsord_refs),
+            "names": (counts["names_uncited"], None),
+            "preferred_births": (counts["birth_uncited"], with_birth),
+            "preferred_deaths": (counts["death_uncited"], with_death),
         },
         "privacy": {
-            "names": (names_private, None),
-            "baptism": (baptisms_private, with_baptism),
-            "preferred_births": (births_private, with_birth),
-            "preferred_deaths": (deaths_private, with_death),
-            "burial": (burials_private, with_burial),
-            "ldsord_person": (ldsord_private, ldsord_refs),
-            "association": (association_private, association_refs),
-            "participant": (participant_private, participant_refs),
+            "names": (counts["names_private"], None),
+            "baptism": (counts["baptism_private"], with_baptism),
+            "preferred_births": (counts["birth_private"], with_birth),
+            "preferred_deaths": (counts["death_private"], with_death),
+            "burial": (counts["burial_private"], with_burial),
+            "ldsord_person": (counts["ldsord_private"], ldsord_refs),
+            "association": (counts["association_private"], association_refs),
+            "participant": (counts["participant_private"], participant_refs),
         },
         "tag": {},
     }
 
-    for gender in gender_stats:
+    for gender, total_gender in counts.histogram(
+        "gender_total", None
+    ).items():
+        total_gender = total_gender[0]
         if gender == Person.MALE:
             prefix = "male"
         elif gender == Person.FEMALE:
             prefix = "female"
         else:
             prefix = "unknown"
-        data = gender_stats[gender]
-        total_gender = data["total"]
+        living = counts[("gender_living", gender)]
         payload["person"].update(
             {
                 "%s_total" % prefix: (total_gender, total_people),
-                "%s_living" % prefix: (data["living"], total_gender),
+                "%s_living" % prefix: (living, total_gender),
             }
         )
-        payload["tag"].update({prefix: (data["tagged"], total_gender)})
-        payload["uncited"].update({prefix: (data["uncited"], total_gender)})
+        payload["tag"].update(
+            {prefix: (counts[("gender_tagged", gender)], total_gender)}
+        )
+        payload["uncited"].update(
+            {prefix: (counts[("gender_uncited", gender)], total_gender)}
+        )
         payload["privacy"].update(
             {
-                prefix: (data["private"], total_gender),
+                prefix: (counts[("gender_private", gender)], total_gender),
                 "%s_living_not_private"
-                % prefix: (data["living_not_private"], data["living"]),
+                % prefix: (
+                    counts[("gender_living_not_private", gender)],
+                    living,
+                ),
             }
         )
-    return post_processing(args, "People", total_people, queue, payload)
+    return payload
 
 
-def examine_families(args, queue=None, thread_event=None):
+def count_family(_dummy_db, data, _dummy_args):
     """
-    Parse and analyze families.
+    Count the statistics for a family from its raw data.
     """
-    media, media_refs = 0, 0
-    missing_one, missing_both = 0, 0
-    family_relations = {}
-    uncited, no_events, private, tagged = 0, 0, 0, 0
-    child, no_child, child_private, child_uncited = 0, 0, 0, 0
-    child_mother_relations, child_father_relations = {}, {}
-    ldsord_families, ldsord_refs, ldsord_private, ldsord_uncited = 0, 0, 0, 0
-    no_temple, no_status, no_date, no_place = 0, 0, 0, 0
-    participant_roles = {}
-    participant, participant_refs, participant_private = 0, 0, 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_families = db.get_number_of_families()
-    total_surnames = len(set(db.surname_list))
-
-    for family in db.iter_families():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(family.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not family.father_handle and not family.mother_handle:
-            missing_both += 1
-        elif not family.father_handle or not family.mother_handle:
-            missing_one += 1
-
-        family_type = family.type.serialize()
-        if family_type not in family_relations:
-            family_relations[family_type] = 0
-        family_relations[family_type] += 1
-
-        if not family.citation_list:
-            uncited += 1
-        if family.private:
-            private += 1
-        if family.tag_list:
-            tagged += 1
-
-        if not family.event_ref_list:
-            no_events += 1
-        else:
-            participant += 1
-            for event_ref in family.event_ref_list:
-                participant_refs += 1
-                role = event_ref.get_role().serialize()
-                if role not in participant_roles:
-                    participant_roles[role] = 0
-                participant_roles[role] += 1
-                if event_ref.private:
-                    participant_private += 1
-
-        if not family.child_ref_list:
-            no_child += 1
-        else:
-            for child_ref in family.child_ref_list:
-                child += 1
-                if child_ref.private:
-                    child_private += 1
-                if not child_ref.citation_list:
-                    child_uncited += 1
-                mother_relation = child_ref.mrel.serialize()
-                if mother_relation not in child_mother_relations:
-                    child_mother_relations[mother_relation] = 0
-                child_mother_relations[mother_relation] += 1
-                father_relation = child_ref.frel.serialize()
-                if father_relation not in child_father_relations:
-                    child_father_relations[father_relation] = 0
-                child_father_relations[father_relation] += 1
-
-        if family.lds_ord_list:
-            ldsord_families += 1
-            for ldsord in family.lds_ord_list:
-                ldsord_refs += 1
-                if ldsord.private:
-                    ldsord_private += 1
-                if not ldsord.citation_list:
-                    ldsord_uncited += 1
-                if not get_date(ldsord):
-                    no_date += 1
-                if not ldsord.place:
-                    no_place += 1
-                if not ldsord.temple:
-                    no_temple += 1
-                if not ldsord.status:
-                    no_status += 1
-    close_readonly_database(db)
-
-    for key in family_relations:
-        family_relations[key] = (family_relations[key], total_families)
-    for key in child_mother_relations:
-        child_mother_relations[key] = (child_mother_relations[key], child)
-    for key in child_father_relations:
-        child_father_relations[key] = (child_father_relations[key], child)
-    for key in participant_roles:
-        participant_roles[key] = (participant_roles[key], participant_refs)
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        father_handle,
+        mother_handle,
+        child_ref_list,
+        family_type,
+        event_ref_list,
+        media_list,
+        dummy_attribute_list,
+        lds_ord_list,
+        citation_list,
+        dummy_note_list,
+        dummy_change,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    length = len(media_list)
+    if length > 0:
+        counts["media"] += 1
+        counts["media_refs"] += length
+
+    if not father_handle and not mother_handle:
+        counts["missing_both"] += 1
+    elif not father_handle or not mother_handle:
+        counts["missing_one"] += 1
+
+    counts[("relations", family_type)] += 1
+
+    if not citation_list:
+        counts["uncited"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+
+    if not event_ref_list:
+        counts["no_events"] += 1
+    else:
+        counts["participant"] += 1
+        for event_ref in event_ref_list:
+            counts["participant_refs"] += 1
+            counts[("participant_roles", event_ref[EVENTREF_ROLE])] += 1
+            if event_ref[EVENTREF_PRIVATE]:
+                counts["participant_private"] += 1
+
+    if not child_ref_list:
+        counts["no_child"] += 1
+    else:
+        for child_ref in child_ref_list:
+            counts["child"] += 1
+            if child_ref[CHILDREF_PRIVATE]:
+                counts["child_private"] += 1
+            if not child_ref[CHILDREF_CITATIONS]:
+                counts["child_uncited"] += 1
+            counts[("mother_relations", child_ref[CHILDREF_MREL])] += 1
+            counts[("father_relations", child_ref[CHILDREF_FREL])] += 1
+
+    if lds_ord_list:
+        counts["ldsord"] += 1
+        for ldsord in lds_ord_list:
+            count_ldsord(counts, ldsord)
+    return counts
+
+
+def build_family_payload(result):
+    """
+    Build the families payload.
+    """
+    counts = result.counts
+    total_families = counts["total"]
+    child = counts["child"]
+    ldsord_refs = counts["ldsord_refs"]
+    participant_refs = counts["participant_refs"]
 
-    payload = {
+    return {
         "family": {
             "total": (total_families, None),
-            "surname_total": (total_surnames, None),
-            "missing_one": (missing_one, total_families),
-            "missing_both": (missing_both, total_families),
-            "no_child": (no_child, total_families),
-            "no_events": (no_events, total_families),
-            "relations": family_relations,
+            "surname_total": (result.values.get("surname_total", 0), None),
+            "missing_one": (counts["missing_one"], total_families),
+            "missing_both": (counts["missing_both"], total_families),
+            "no_child": (counts["no_child"], total_families),
+            "no_events": (counts["no_events"], total_families),
+            "relations": counts.histogram("relations", total_families),
         },
         "ldsord_family": {
-            "ldsord": (ldsord_families, total_families),
+            "ldsord": (counts["ldsord"], total_families),
             "ldsord_refs": (ldsord_refs, None),
-            "no_temple": (no_temple, ldsord_refs),
-            "no_status": (no_status, ldsord_refs),
-            "no_date": (no_date, ldsord_refs),
-            "no_place": (no_place, ldsord_refs),
+            "no_temple": (counts["no_temple"], ldsord_refs),
+            "no_status": (counts["no_status"], ldsord_refs),
+            "no_date": (counts["no_date"], ldsord_refs),
+            "no_place": (counts["no_place"], ldsord_refs),
         },
         "uncited": {
-            "family": (uncited, total_families),
-            "child": (child_uncited, child),
-            "ldsord_family": (ldsord_uncited, ldsord_refs),
+            "family": (counts["uncited"], total_families),
+            "child": (counts["child_uncited"], child),
+            "ldsord_family": (counts["ldsord_uncited"], ldsord_refs),
         },
         "privacy": {
-            "family": (private, total_families),
-            "child": (child_private, child),
-            "family_participant": (participant_private, None),
-            "ldsord_family": (ldsord_private, ldsord_refs),
+            "family": (counts["private"], total_families),
+            "child": (counts["child_private"], child),
+            "family_participant": (counts["participant_private"], None),
+            "ldsord_family": (counts["ldsord_private"], ldsord_refs),
         },
         "tag": {
-            "family": (tagged, total_families),
+            "family": (counts["tagged"], total_families),
         },
         "children": {
             "refs": (child, None),
-            "mother_relations": child_mother_relations,
-            "father_relations": child_father_relations,
+            "mother_relations": counts.histogram("mother_relations", child),
+            "father_relations": counts.histogram("father_relations", child),
         },
         "participant": {
-            "family_total": participant,
+            "family_total": counts["participant"],
             "family_refs": participant_refs,
-            "family_roles": participant_roles,
+            "family_roles": counts.histogram(
+                "participant_roles", participant_refs
+            ),
         },
         "media": {
-            "family": (media, total_families),
-            "family_refs": (media_refs, None),
+            "family": (counts["media"], total_families),
+            "family_refs": (counts["media_refs"], None),
         },
     }
-    return post_processing(args, "Families", total_families, queue, payload)
 
 
-def examine_events(args, queue=None, thread_event=None):
+def count_event(_dummy_db, data, _dummy_args):
     """
-    Parse and analyze events.
+    Count the statistics for an event from its raw data.
     """
-    media, media_refs = 0, 0
-    no_date, no_place, no_description = 0, 0, 0
-    uncited, private, tagged, marriages = 0, 0, 0, 0
-    event_types = {}
-    uncited_events = {}
-    no_marriage_date, no_marriage_place, marriage_private = 0, 0, 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_events = db.get_number_of_events()
-
-    for event in db.iter_events():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(event.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not event.citation_list:
-            uncited += 1
-        if not event.place:
-            no_place += 1
-        if not get_date(event):
-            no_date += 1
-        if not event.get_description():
-            no_description += 1
-        if event.private:
-            private += 1
-        if event.tag_list:
-            tagged += 1
-
-        event_type = event.get_type()
-        if event_type == EventType.MARRIAGE:
-            marriages += 1
-            if not event.place:
-                no_marriage_place += 1
-            if not get_date(event):
-                no_marriage_date += 1
-            if event.private:
-                marriage_private += 1
-
-        event_key = event_type.serialize()
-        if event_key not in event_types:
-            event_types[event_key] = 0
-            uncited_events[event_key] = 0
-        event_types[event_key] += 1
-        if not event.citation_list:
-            uncited_events[event_key] += 1
-    close_readonly_database(db)
-
-    for key in uncited_events:
-        uncited_events[key] = (uncited_events[key], event_types[key])
-    for key in event_types:
-        event_types[key] = (event_types[key], total_events)
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        event_type,
+        date,
+        description,
+        place,
+        citation_list,
+        dummy_note_list,
+        media_list,
+        dummy_attribute_list,
+        dummy_change,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    length = len(media_list)
+    if length > 0:
+        counts["media"] += 1
+        counts["media_refs"] += length
+
+    if not citation_list:
+        counts["uncited"] += 1
+    if not place:
+        counts["no_place"] += 1
+    if not date:
+        counts["no_date"] += 1
+    if not description:
+        counts["no_description"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+
+    if event_type[0] == EventType.MARRIAGE:
+        counts["marriages"] += 1
+        if not place:
+            counts["no_marriage_place"] += 1
+        if not date:
+            counts["no_marriage_date"] += 1
+        if private:
+            counts["marriage_private"] += 1
+
+    counts[("types", event_type)] += 1
+    if not citation_list:
+        counts[("uncited_types", event_type)] += 1
+    return counts
+
+
+def build_event_payload(result):
+    """
+    Build the events payload.
+    """
+    counts = result.counts
+    total_events = counts["total"]
+    marriages = counts["marriages"]
+    event_types = counts.histogram("types", total_events)
+    uncited_events = {
+        key: (counts[("uncited_types", key)], value[0])
+        for key, value in event_types.items()
+    }
 
-    payload = {
+    return {
         "event": {
             "total": (total_events, None),
-            "no_place": (no_place, total_events),
-            "no_date": (no_date, total_events),
-            "no_description": (no_description, total_events),
+            "no_place": (counts["no_place"], total_events),
+            "no_date": (counts["no_date"], total_events),
+            "no_description": (counts["no_description"], total_events),
             "types": event_types,
         },
         "family": {
-            "no_marriage_date": (no_marriage_date, marriages),
-            "no_marriage_place": (no_marriage_place, marriages),
+            "no_marriage_date": (counts["no_marriage_date"], marriages),
+            "no_marriage_place": (counts["no_marriage_place"], marriages),
         },
         "uncited": {
-            "event": (uncited, total_events),
+            "event": (counts["uncited"], total_events),
             "events": uncited_events,
         },
         "privacy": {
-            "event": (private, total_events),
-            "marriage": (marriage_private, marriages),
+            "event": (counts["private"], total_events),
+            "marriage": (counts["marriage_private"], marriages),
         },
         "tag": {
-            "event": (tagged, total_events),
+            "event": (counts["tagged"], total_events),
         },
         "media": {
-            "event": (media, total_events),
-            "event_refs": (media_refs, None),
+            "event": (counts["media"], total_events),
+            "event_refs": (counts["media_refs"], None),
         },
     }
-    return post_processing(args, "Events", total_events, queue, payload)
 
 
-def examine_places(args, queue=None, thread_event=None):
+def count_place(_dummy_db, data, _dummy_args):
     """
-    Parse and analyze places.
+    Count the statistics for a place from its raw data.
     """
-    media, media_refs = 0, 0
-    no_name, no_latitude, no_longitude, no_code = 0, 0, 0, 0
-    uncited, private, tagged = 0, 0, 0
-    place_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_places = db.get_number_of_places()
-
-    for place in db.iter_places():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(place.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        place_type = place.get_type().serialize()
-        if place_type not in place_types:
-            place_types[place_type] = 0
-        place_types[place_type] += 1
-
-        if not place.name:
-            no_name += 1
-        if not place.lat:
-            no_latitude += 1
-        if not place.long:
-            no_longitude += 1
-        if not place.code:
-            no_code += 1
-        if not place.citation_list:
-            uncited += 1
-        if place.private:
-            private += 1
-        if place.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in place_types:
-        place_types[key] = (place_types[key], total_places)
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        dummy_title,
+        longitude,
+        latitude,
+        dummy_placeref_list,
+        name,
+        dummy_alt_names,
+        place_type,
+        code,
+        dummy_alt_loc,
+        dummy_urls,
+        media_list,
+        citation_list,
+        dummy_note_list,
+        dummy_change,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    length = len(media_list)
+    if length > 0:
+        counts["media"] += 1
+        counts["media_refs"] += length
+
+    counts[("types", place_type)] += 1
+
+    if not name:
+        counts["no_name"] += 1
+    if not latitude:
+        counts["no_latitude"] += 1
+    if not longitude:
+        counts["no_longitude"] += 1
+    if not code:
+        counts["no_code"] += 1
+    if not citation_list:
+        counts["uncited"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+    return counts
+
+
+def build_place_payload(result):
+    """
+    Build the places payload.
+    """
+    counts = result.counts
+    total_places = counts["total"]
 
-    payload = {
+    return {
         "place": {
             "total": (total_places, None),
-            "no_name": (no_name, total_places),
-            "no_latitude": (no_latitude, total_places),
-            "no_longitude": (no_longitude, total_places),
-            "no_code": (no_code, total_places),
-            "types": place_types,
+            "no_name": (counts["no_name"], total_places),
+            "no_latitude": (counts["no_latitude"], total_places),
+            "no_longitude": (counts["no_longitude"], total_places),
+            "no_code": (counts["no_code"], total_places),
+            "types": counts.histogram("types", total_places),
         },
         "uncited": {
-            "place": (uncited, total_places),
+            "place": (counts["uncited"], total_places),
         },
         "privacy": {
-            "place": (private, total_places),
+            "place": (counts["private"], total_places),
         },
         "tag": {
-            "place": (tagged, total_places),
+            "place": (counts["tagged"], total_places),
         },
         "media": {
-            "place": (media, total_places),
-            "place_refs": (media_refs, None),
+            "place": (counts["media"], total_places),
+            "place_refs": (counts["media_refs"], None),
         },
     }
-    return post_processing(args, "Places", total_places, queue, payload)
 
 
-def examine_media(args, queue=None, thread_event=None):
+def count_media(db, data, _dummy_args):
     """
-    Parse and analyze media objects.
+    Count the statistics for a media object from its raw data.
     """
-    no_desc, no_date, no_path, no_mime = 0, 0, 0, 0
-    uncited, private, tagged, size_bytes = 0, 0, 0, 0
-    not_found = []
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_media = db.get_number_of_media()
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        path,
+        mime,
+        desc,
+        dummy_checksum,
+        dummy_attribute_list,
+        dummy_citation_list,
+        dummy_note_list,
+        dummy_change,
+        date,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    if not desc:
+        counts["no_desc"] += 1
+    if not date:
+        counts["no_date"] += 1
+    if not mime:
+        counts["no_mime"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+    if not path:
+        counts["no_path"] += 1
+    else:
+        fullname = media_path_full(db, path)
+        try:
+            counts["size_bytes"] += os.path.getsize(fullname)
+        except OSError:
+            counts[("not_found", path)] += 1
+    return counts
 
-    for media in db.iter_media():
-        if thread_event and thread_event.is_set():
-            break
 
-        if not media.desc:
-            no_desc += 1
-        if not get_date(media):
-            no_date += 1
-        if not media.mime:
-            no_mime += 1
-        if media.private:
-            private += 1
-        if media.tag_list:
-            tagged += 1
-        if not media.path:
-            no_path += 1
-        else:
-            fullname = media_path_full(db, media.path)
-            try:
-                size_bytes += os.path.getsize(fullname)
-            except OSError:
-                if media.path not in not_found:
-                    not_found.append(media.path)
-    close_readonly_database(db)
+def build_media_payload(result):
+    """
+    Build the media payload.
+    """
+    counts = result.counts
+    total_media = counts["total"]
+    size_bytes = counts["size_bytes"]
+    not_found = list(counts.histogram("not_found", None))
 
     if not int(size_bytes / 1024):
         size_string = "%s bytes" % size_bytes
@@ -753,288 +945,449 @@ def examine_media(args, queue=None, thread_event=None):
     else:
         size_string = "%s MB" % int(size_bytes / 1048576)
 
-    payload = {
+    return {
         "media": {
             "total": (total_media, None),
             "size": (size_string, None),
-            "no_path": (no_path, total_media),
-            "no_file": (len(not_found), total_media - no_path),
+            "no_path": (counts["no_path"], total_media),
+            "no_file": (len(not_found), total_media - counts["no_path"]),
             "not_found": not_found,
-            "no_description": (no_desc, total_media),
-            "no_date": (no_date, total_media),
-            "no_mime": (no_mime, total_media),
+            "no_description": (counts["no_desc"], total_media),
+            "no_date": (counts["no_date"], total_media),
+            "no_mime": (counts["no_mime"], total_media),
         },
         "uncited": {
-            "media": (uncited, total_media),
+            "media": (counts["uncited"], total_media),
         },
         "privacy": {
-            "media": (private, total_media),
+            "media": (counts["private"], total_media),
         },
         "tag": {
-            "media": (tagged, total_media),
+            "media": (counts["tagged"], total_media),
         },
     }
-    return post_processing(args, "Media", total_media, queue, payload)
 
 
-def examine_sources(args, queue=None, thread_event=None):
+def count_source(_dummy_db, data, _dummy_args):
     """
-    Parse and analyze sources.
+    Count the statistics for a source from its raw data.
     """
-    media, media_refs = 0, 0
-    no_title, no_author, no_pubinfo, no_abbrev = 0, 0, 0, 0
-    no_repository, repos_refs, no_call_number, private, tagged = 0, 0, 0, 0, 0
-    media_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_sources = db.get_number_of_sources()
-
-    for source in db.iter_sources():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(source.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not source.title:
-            no_title += 1
-        if not source.author:
-            no_author += 1
-        if not source.pubinfo:
-            no_pubinfo += 1
-        if not source.abbrev:
-            no_abbrev += 1
-        if not source.reporef_list:
-            no_repository += 1
-        else:
-            repos_refs += len(source.reporef_list)
-            for repo_ref in source.reporef_list:
-                if not repo_ref.call_number:
-                    no_call_number += 1
-                media_type = repo_ref.media_type.serialize()
-                if media_type not in media_types:
-                    media_types[media_type] = 0
-                media_types[media_type] += 1
-        if source.private:
-            private += 1
-        if source.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in media_types:
-        media_types[key] = (media_types[key], repos_refs)
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        title,
+        author,
+        pubinfo,
+        dummy_note_list,
+        media_list,
+        abbrev,
+        dummy_change,
+        dummy_attribute_list,
+        reporef_list,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    length = len(media_list)
+    if length > 0:
+        counts["media"] += 1
+        counts["media_refs"] += length
+
+    if not title:
+        counts["no_title"] += 1
+    if not author:
+        counts["no_author"] += 1
+    if not pubinfo:
+        counts["no_pubinfo"] += 1
+    if not abbrev:
+        counts["no_abbrev"] += 1
+    if not reporef_list:
+        counts["no_repository"] += 1
+    else:
+        counts["repos_refs"] += len(reporef_list)
+        for repo_ref in reporef_list:
+            if not repo_ref[REPOREF_CALL_NUMBER]:
+                counts["no_call_number"] += 1
+            counts[("types", repo_ref[REPOREF_MEDIA_TYPE])] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+    return counts
+
+
+def build_source_payload(result):
+    """
+    Build the sources payload.
+    """
+    counts = result.counts
+    total_sources = counts["total"]
+    repos_refs = counts["repos_refs"]
 
-    payload = {
+    return {
         "source": {
             "total": (total_sources, None),
-            "no_title": (no_title, total_sources),
-            "no_author": (no_author, total_sources),
-            "no_pubinfo": (no_pubinfo, total_sources),
-            "no_abbrev": (no_abbrev, total_sources),
-            "no_repository": (no_repository, total_sources),
+            "no_title": (counts["no_title"], total_sources),
+            "no_author": (counts["no_author"], total_sources),
+            "no_pubinfo": (counts["no_pubinfo"], total_sources),
+            "no_abbrev": (counts["no_abbrev"], total_sources),
+            "no_repository": (counts["no_repository"], total_sources),
             "repository_refs": (repos_refs, None),
-            "no_call_number": (no_call_number, repos_refs),
-            "types": media_types,
+            "no_call_number": (counts["no_call_number"], repos_refs),
+            "types": counts.histogram("types", repos_refs),
         },
         "privacy": {
-            "source": (private, total_sources),
+            "source": (counts["private"], total_sources),
         },
         "tag": {
-            "source": (tagged, total_sources),
+            "source": (counts["tagged"], total_sources),
         },
         "media": {
-            "source": (media, total_sources),
-            "source_refs": (media_refs, None),
+            "source": (counts["media"], total_sources),
+            "source_refs": (counts["media_refs"], None),
         },
     }
-    return post_processing(args, "Sources", total_sources, queue, payload)
 
 
-def examine_citations(args, queue=None, thread_event=None):
-    """
-    Parse and analyze citation objects.
-    """
-    media, media_refs = 0, 0
-    no_source, no_page, no_date, private, tagged = 0, 0, 0, 0, 0
-    very_low, low, normal, high, very_high = 0, 0, 0, 0, 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_citations = db.get_number_of_citations()
+CONFIDENCE_KEYS = {
+    Citation.CONF_VERY_LOW: "very_low",
+    Citation.CONF_LOW: "low",
+    Citation.CONF_NORMAL: "normal",
+    Citation.CONF_HIGH: "high",
+    Citation.CONF_VERY_HIGH: "very_high",
+}
 
-    for citation in db.iter_citations():
-        if thread_event and thread_event.is_set():
-            break
 
-        length = len(citation.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not get_date(citation):
-            no_date += 1
-        if not citation.source_handle:
-            no_source += 1
-        if not citation.page:
-            no_page += 1
-        if citation.private:
-            private += 1
-        if citation.tag_list:
-            tagged += 1
-        if citation.confidence == Citation.CONF_VERY_LOW:
-            very_low += 1
-        elif citation.confidence == Citation.CONF_LOW:
-            low += 1
-        elif citation.confidence == Citation.CONF_NORMAL:
-            normal += 1
-        elif citation.confidence == Citation.CONF_HIGH:
-            high += 1
-        elif citation.confidence == Citation.CONF_VERY_HIGH:
-            very_high += 1
-    close_readonly_database(db)
+def count_citation(_dummy_db, data, _dummy_args):
+    """
+    Count the statistics for a citation from its raw data.
+    """
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        date,
+        page,
+        confidence,
+        source_handle,
+        dummy_note_list,
+        media_list,
+        dummy_attribute_list,
+        dummy_change,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    length = len(media_list)
+    if length > 0:
+        counts["media"] += 1
+        counts["media_refs"] += length
+
+    if not date:
+        counts["no_date"] += 1
+    if not source_handle:
+        counts["no_source"] += 1
+    if not page:
+        counts["no_page"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+    if confidence in CONFIDENCE_KEYS:
+        counts[CONFIDENCE_KEYS[confidence]] += 1
+    return counts
+
+
+def build_citation_payload(result):
+    """
+    Build the citations payload.
+    """
+    counts = result.counts
+    total_citations = counts["total"]
 
     payload = {
         "citation": {
             "total": (total_citations, None),
-            "no_source": (no_source, total_citations),
-            "no_date": (no_date, total_citations),
-            "no_page": (no_page, total_citations),
+            "no_source": (counts["no_source"], total_citations),
+            "no_date": (counts["no_date"], total_citations),
+            "no_page": (counts["no_page"], total_citations),
             "confidence": {},
         },
         "privacy": {
-            "citation": (private, total_citations),
+            "citation": (counts["private"], total_citations),
         },
         "tag": {
-            "citation": (tagged, total_citations),
+            "citation": (counts["tagged"], total_citations),
         },
         "media": {
-            "citation": (media, total_citations),
-            "citation_refs": (media_refs, None),
+            "citation": (counts["media"], total_citations),
+            "citation_refs": (counts["media_refs"], None),
         },
     }
     if total_citations:
         payload["citation"]["confidence"].update(
             {
-                "very_low": (very_low, total_citations),
-                "low": (low, total_citations),
-                "normal": (normal, total_citations),
-                "high": (high, total_citations),
-                "very_high": (very_high, total_citations),
+                key: (counts[key], total_citations)
+                for key in CONFIDENCE_KEYS.values()
             }
         )
-    return post_processing(args, "Citations", total_citations, queue, payload)
+    return payload
 
 
-def examine_repositories(args, queue=None, thread_event=None):
+def count_repository(_dummy_db, data, _dummy_args):
     """
-    Parse and analyze repositories.
+    Count the statistics for a repository from its raw data.
     """
-    no_name, no_address, private, tagged = 0, 0, 0, 0
-    repository_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_repositories = db.get_number_of_repositories()
-
-    for repository in db.iter_repositories():
-        if thread_event and thread_event.is_set():
-            break
-
-        repository_type = repository.get_type().serialize()
-        if repository_type not in repository_types:
-            repository_types[repository_type] = 0
-        repository_types[repository_type] += 1
-
-        if not repository.name:
-            no_name += 1
-        if not repository.address_list:
-            no_address += 1
-        if repository.private:
-            private += 1
-        if repository.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in repository_types:
-        repository_types[key] = (repository_types[key], total_repositories)
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        repository_type,
+        name,
+        dummy_note_list,
+        address_list,
+        dummy_urls,
+        dummy_change,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    counts[("types", repository_type)] += 1
+
+    if not name:
+        counts["no_name"] += 1
+    if not address_list:
+        counts["no_address"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+    return counts
+
+
+def build_repository_payload(result):
+    """
+    Build the repositories payload.
+    """
+    counts = result.counts
+    total_repositories = counts["total"]
 
-    payload = {
+    return {
         "repository": {
             "total": (total_repositories, None),
-            "no_name": (no_name, total_repositories),
-            "no_address": (no_address, total_repositories),
-            "types": repository_types,
+            "no_name": (counts["no_name"], total_repositories),
+            "no_address": (counts["no_address"], total_repositories),
+            "types": counts.histogram("types", total_repositories),
         },
         "privacy": {
-            "repository": (private, total_repositories),
+            "repository": (counts["private"], total_repositories),
         },
         "tag": {
-            "repository": (tagged, total_repositories),
+            "repository": (counts["tagged"], total_repositories),
         },
     }
-    return post_processing(
-        args, "Repositories", total_repositories, queue, payload
-    )
 
 
-def examine_notes(args, queue=None, thread_event=None):
+def count_note(_dummy_db, data, _dummy_args):
     """
-    Parse and analyze notes.
+    Count the statistics for a note from its raw data.
     """
-    no_text, private, tagged = 0, 0, 0
-    note_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_notes = db.get_number_of_notes()
-
-    for note in db.iter_notes():
-        if thread_event and thread_event.is_set():
-            break
-
-        note_type = note.get_type().serialize()
-        if note_type not in note_types:
-            note_types[note_type] = 0
-        note_types[note_type] += 1
-
-        if not note.text:
-            no_text += 1
-        if note.private:
-            private += 1
-        if note.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in note_types:
-        note_types[key] = (note_types[key], total_notes)
+    (
+        dummy_handle,
+        dummy_gramps_id,
+        text,
+        dummy_format,
+        note_type,
+        dummy_change,
+        tag_list,
+        private,
+    ) = data
+    counts = StatisticsCounts(total=1)
+
+    counts[("types", note_type)] += 1
+
+    if not text[0]:
+        counts["no_text"] += 1
+    if private:
+        counts["private"] += 1
+    if tag_list:
+        counts["tagged"] += 1
+    return counts
+
+
+def build_note_payload(result):
+    """
+    Build the notes payload.
+    """
+    counts = result.counts
+    total_notes = counts["total"]
 
-    payload = {
+    return {
         "note": {
             "total": (total_notes, None),
-            "no_text": (no_text, total_notes),
-            "types": note_types,
+            "no_text": (counts["no_text"], total_notes),
+            "types": counts.histogram("types", total_notes),
         },
         "privacy": {
-            "note": (private, total_notes),
+            "note": (counts["private"], total_notes),
         },
         "tag": {
-            "note": (tagged, total_notes),
+            "note": (counts["tagged"], total_notes),
         },
     }
-    return post_processing(args, "Notes", total_notes, queue, payload)
 
 
-def examine_tags(args, queue=None, thread_event=None):
+def count_tag(_dummy_db, _dummy_data, _dummy_args):
+    """
+    Count the statistics for a tag from its raw data.
+    """
+    return StatisticsCounts(total=1)
+
+
+def build_tag_payload(result):
+    """
+    Build the tags payload.
+    """
+    counts = result.counts
+    return {
+        "tag": {"total": (counts["total"], None)},
+    }
+
+
+def count_bookmarks(db):
+    """
+    Count the bookmarks.
+    """
+    counts = StatisticsCounts(
+        person=len(db.get_bookmarks().bookmarks),
+        family=len(db.get_family_bookmarks().bookmarks),
+        event=len(db.get_event_bookmarks().bookmarks),
+        place=len(db.get_place_bookmarks().bookmarks),
+        media=len(db.get_media_bookmarks().bookmarks),
+        source=len(db.get_source_bookmarks().bookmarks),
+        citation=len(db.get_citation_bookmarks().bookmarks),
+        repository=len(db.get_repo_bookmarks().bookmarks),
+        note=len(db.get_note_bookmarks().bookmarks),
+    )
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def build_bookmark_payload(result):
+    """
+    Build the bookmarks payload.
+    """
+    counts = result.counts
+    total_bookmarks = counts["total"]
+    payload = {"bookmark": {"total": (total_bookmarks, None)}}
+    for key in [
+        "person",
+        "family",
+        "event",
+        "place",
+        "media",
+        "source",
+        "citation",
+        "repository",
+        "note",
+    ]:
+        payload["bookmark"][key] = (counts[key], total_bookmarks)
+    return payload
+
+
+def count_surnames(db):
+    """
+    Count the unique surnames.
+    """
+    return len(set(db.surname_list))
+
+
+def examine_records(db, args, obj_type, records, event=None):
+    """
+    Count the statistics for a sequence of raw (handle, data) records.
+    """
+    count_object = OBJECT_HANDLERS[obj_type][0]
+    change_position = CHANGE_POSITIONS[obj_type]
+    keep_objects = args.get("objects")
+    result = StatisticsResult()
+    last_change = 0
+    for handle, data in records:
+        if event and event.is_set():
+            break
+        result.add_object(
+            handle, count_object(db, data, args), keep=keep_objects
+        )
+        if data[change_position] > last_change:
+            last_change = data[change_position]
+    result.note_change(last_change)
+    return result
+
+
+def get_last_changes(db, obj_types, event=None):
+    """
+    Return the latest last changed timestamp of the objects of each type,
+    or None if interrupted.
     """
-    Parse and analyze tags.
+    last_changes = {}
+    for obj_type in obj_types:
+        change_position = CHANGE_POSITIONS[obj_type]
+        last_change = 0
+        for dummy_handle, data in db.method("_iter_raw_%s_data", obj_type)():
+            if event and event.is_set():
+                return None
+            if data[change_position] > last_change:
+                last_change = data[change_position]
+        last_changes[obj_type] = last_change
+    return last_changes
+
+
+def examine_objects(args, obj_type, thread_event=None, shard=(0, 1)):
     """
+    Parse and analyze all objects of a given type, or those in one of a
+    number of handle range shards. If requested the count contribution of
+    every object is returned as well so the results can be maintained
+    incrementally.
+    """
+    index, shards = shard
+
     db = open_readonly_database(args.get("tree_name"))
-    total_tags = db.get_number_of_tags()
+    if shards > 1:
+        handles = sorted(db.method("get_%s_handles", obj_type)())
+        start = index * len(handles) // shards
+        end = (index + 1) * len(handles) // shards
+        get_raw_data = db.method("get_raw_%s_data", obj_type)
+        records = (
+            (handle, get_raw_data(handle)) for handle in handles[start:end]
+        )
+    else:
+        records = db.method("_iter_raw_%s_data", obj_type)()
+    result = examine_records(db, args, obj_type, records, thread_event)
+    if obj_type == "Family" and index == 0:
+        result.values["surname_total"] = count_surnames(db)
     close_readonly_database(db)
 
-    payload = {
-        "tag": {"total": (total_tags, None)},
-    }
-    return post_processing(args, "Tags", total_tags, queue, payload)
+    label = obj_type
+    if shards > 1:
+        label = "%s %s/%s" % (obj_type, index + 1, shards)
+    return post_processing(
+        args, label, result.counts["total"], (obj_type, result)
+    )
+
+
+def examine_shard(task):
+    """
+    Parse and analyze a shard of objects in a pool worker.
+    """
+    args, obj_type, shard = task
+    return examine_objects(args, obj_type, shard=shard)
+
+
+def get_shard_count(total, jobs, shard_size=MIN_SHARD_SIZE):
+    """
+    Return the number of shards to split a number of objects into.
+    """
+    return max(1, min(jobs, -(-total // shard_size)))
 
 
 def examine_bookmarks(args):
@@ -1042,42 +1395,12 @@ def examine_bookmarks(args):
     Parse and analyze bookmarks.
     """
     db = open_readonly_database(args.get("tree_name"))
-    person_bookmarks = len(db.get_bookmarks().bookmarks)
-    family_bookmarks = len(db.get_family_bookmarks().bookmarks)
-    event_bookmarks = len(db.get_event_bookmarks().bookmarks)
-    place_bookmarks = len(db.get_place_bookmarks().bookmarks)
-    media_bookmarks = len(db.get_media_bookmarks().bookmarks)
-    source_bookmarks = len(db.get_source_bookmarks().bookmarks)
-    citation_bookmarks = len(db.get_citation_bookmarks().bookmarks)
-    repository_bookmarks = len(db.get_repo_bookmarks().bookmarks)
-    note_bookmarks = len(db.get_note_bookmarks().bookmarks)
-    total_bookmarks = (
-        person_bookmarks
-        + family_bookmarks
-        + event_bookmarks
-        + place_bookmarks
-        + media_bookmarks
-        + source_bookmarks
-        + citation_bookmarks
-        + repository_bookmarks
-        + note_bookmarks
-    )
-    payload = {
-        "bookmark": {
-            "total": (total_bookmarks, None),
-            "person": (person_bookmarks, total_bookmarks),
-            "family": (family_bookmarks, total_bookmarks),
-            "event": (event_bookmarks, total_bookmarks),
-            "place": (place_bookmarks, total_bookmarks),
-            "media": (media_bookmarks, total_bookmarks),
-            "source": (source_bookmarks, total_bookmarks),
-            "citation": (citation_bookmarks, total_bookmarks),
-            "repository": (repository_bookmarks, total_bookmarks),
-            "note": (note_bookmarks, total_bookmarks),
-        }
-    }
+    result = StatisticsResult(count_bookmarks(db))
     close_readonly_database(db)
-    return post_processing(args, "Bookmarks", total_bookmarks, None, payload)
+
+    return post_processing(
+        args, "Bookmark", result.counts["total"], ("Bookmark", result)
+    )
 
 
 def open_readonly_database(dbname):
@@ -1104,7 +1427,7 @@ def close_readonly_database(db):
         write_lock_file(save_dir)
 
 
-def post_processing(args, obj_type, total, queue, payload):
+def post_processing(args, obj_type, total, payload):
     """
     Handle collection post processing.
     """
@@ -1115,104 +1438,158 @@ def post_processing(args, obj_type, total, queue, payload):
             ),
             file=sys.stderr,
         )
-    if queue:
-        queue.put(payload)
-    else:
-        return payload
+    return payload
+
+
+def get_object_counts(db):
+    """
+    Return the number of objects of each type.
+    """
+    return {
+        "Person": db.get_number_of_people(),
+        "Family": db.get_number_of_families(),
+        "Event": db.get_number_of_events(),
+        "Place": db.get_number_of_places(),
+        "Media": db.get_number_of_media(),
+        "Source": db.get_number_of_sources(),
+        "Citation": db.get_number_of_citations(),
+        "Repository": db.get_number_of_repositories(),
+        "Note": db.get_number_of_notes(),
+        "Tag": db.get_number_of_tags(),
+    }
 
 
 def get_object_list(dbname):
     """
-    Prepare object list based on descending number of objects.
+    Prepare list of object types and counts based on descending number of
+    objects.
     """
     db = open_readonly_database(dbname)
-    object_list = [
-        ("Person", db.get_number_of_people()),
-        ("Family", db.get_number_of_families()),
-        ("Event", db.get_number_of_events()),
-        ("Place", db.get_number_of_places()),
-        ("Media", db.get_number_of_media()),
-        ("Source", db.get_number_of_sources()),
-        ("Citation", db.get_number_of_citations()),
-        ("Repository", db.get_number_of_repositories()),
-        ("Note", db.get_number_of_notes()),
-        ("Tag", db.get_number_of_tags()),
-    ]
+    object_list = list(get_object_counts(db).items())
     close_readonly_database(db)
     object_list.sort(key=lambda x: x[1], reverse=True)
     total = sum([y for (x, y) in object_list])
-    return total, [x for (x, y) in object_list]
+    return total, object_list
 
 
-def fold(one, two):
+def build_statistics(results):
     """
-    Fold a set of dictionary entries into another.
+    Build the statistics payload from the results for each object type.
+    Each section of the payload may be filled in by several object types.
     """
-    for key in two.keys():
-        if key not in one:
-            one.update({key: two[key]})
-        else:
-            for subkey in two[key]:
-                if subkey not in one[key]:
-                    one[key].update({subkey: two[key][subkey]})
-
-
-TASK_HANDLERS = {
-    "Person": examine_people,
-    "Family": examine_families,
-    "Event": examine_events,
-    "Place": examine_places,
-    "Media": examine_media,
-    "Source": examine_sources,
-    "Citation": examine_citations,
-    "Repository": examine_repositories,
-    "Note": examine_notes,
-    "Tag": examine_tags,
+    facts = {}
+    for obj_type, result in results.items():
+        for section, values in PAYLOAD_BUILDERS[obj_type](result).items():
+            facts.setdefault(section, {}).update(values)
+    return facts
+
+
+OBJECT_HANDLERS = {
+    "Person": (count_person, build_person_payload),
+    "Family": (count_family, build_family_payload),
+    "Event": (count_event, build_event_payload),
+    "Place": (count_place, build_place_payload),
+    "Media": (count_media, build_media_payload),
+    "Source": (count_source, build_source_payload),
+    "Citation": (count_citation, build_citation_payload),
+    "Repository": (count_repository, build_repository_payload),
+    "Note": (count_note, build_note_payload),
+    "Tag": (count_tag, build_tag_payload),
 }
 
+PAYLOAD_BUILDERS = {key: value[1] for key, value in OBJECT_HANDLERS.items()}
+PAYLOAD_BUILDERS["Bookmark"] = build_bookmark_payload
+
 
-def gather_serial_statistics(args, obj_list, event=None):
+def gather_serial_statistics(args, db, event=None, report=None):
     """
-    Gather statistics using non-concurrent serial mode.
+    Gather statistics using non-concurrent serial mode. This makes a single
+    pass over one read only connection, streaming the raw records of each
+    table to the counter for the object type.
     """
-    facts = examine_bookmarks(args)
-    for obj_type in obj_list:
-        results = TASK_HANDLERS[obj_type](args, thread_event=event)
-        if event.is_set():
+    results = {}
+    report = report or results.__setitem__
+    exclude = args.get("exclude") or []
+
+    object_counts = get_object_counts(db)
+    if "Bookmark" not in exclude:
+        result = StatisticsResult(count_bookmarks(db))
+        report(
+            *post_processing(
+                args, "Bookmark", result.counts["total"], ("Bookmark", result)
+            )
+        )
+    for obj_type in OBJECT_HANDLERS:
+        if obj_type in exclude:
+            continue
+        records = db.method("_iter_raw_%s_data", obj_type)()
+        result = examine_records(db, args, obj_type, records, event)
+        if event and event.is_set():
             break
-        fold(facts, results)
-    return facts
+        if obj_type == "Family":
+            result.values["surname_total"] = count_surnames(db)
+        report(
+            *post_processing(
+                args, obj_type, result.counts["total"], (obj_type, result)
+            )
+        )
+    close_readonly_database(db)
+    return sum(object_counts.values()), results
 
 
-def gather_concurrent_statistics(args, obj_list, event=None):
+def gather_concurrent_statistics(args, obj_list, event=None, report=None):
     """
-    Gather statistics using multiprocessing mode.
+    Gather statistics using multiprocessing mode. Larger object types are
+    split into handle range shards that are examined by a pool of worker
+    processes, and the results for each object type are merged and
+    reported once all of its shards finish.
     """
-    workers = {}
-    queues = {}
-    for obj_type in obj_list:
-        queues[obj_type] = Queue()
-        workers[obj_type] = Process(
-            target=TASK_HANDLERS[obj_type],
-            args=(args, queues[obj_type], event),
-        )
-        workers[obj_type].start()
-
-    facts = examine_bookmarks(args)
-    obj_list.reverse()
-    for obj_type in obj_list:
-        result_set = queues[obj_type].get()
-        workers[obj_type].join()
-        fold(facts, result_set)
-    return facts
+    results = {}
+    report = report or results.__setitem__
+    jobs = args.get("jobs") or os.cpu_count() or 1
+    shard_size = args.get("shard_size") or MIN_SHARD_SIZE
+
+    tasks, remaining = [], {}
+    for obj_type, count in obj_list:
+        shards = get_shard_count(count, jobs, shard_size)
+        remaining[obj_type] = shards
+        for index in range(shards):
+            tasks.append((args, obj_type, (index, shards)))
+
+    partials = {}
+    with Pool(processes=jobs) as pool:
+        shard_results = pool.imap_unordered(examine_shard, tasks)
+        if "Bookmark" not in (args.get("exclude") or []):
+            report(*examine_bookmarks(args))
+        for obj_type, result in shard_results:
+            if event and event.is_set():
+                break
+            if obj_type in partials:
+                partials[obj_type].merge(result)
+            else:
+                partials[obj_type] = result
+            remaining[obj_type] -= 1
+            if not remaining[obj_type]:
+                report(obj_type, partials.pop(obj_type))
+    return results
 
 
-def gather_statistics(args, event=None):
+def gather_statistics(args, event=None, report=None):
     """
-    Gather tree statistics.
+    Gather tree statistics, returning the counts for each object type. If
+    a report callback is given the counts for each object type are passed
+    to it as they are collected instead.
     """
     try:
-        total, obj_list = get_object_list(args.get("tree_name"))
+        if args.get("serial"):
+            db = open_readonly_database(args.get("tree_name"))
+        else:
+            total, obj_list = get_object_list(args.get("tree_name"))
+            obj_list = [
+                (obj_type, count)
+                for (obj_type, count) in obj_list
+                if obj_type not in (args.get("exclude") or [])
+            ]
     except TypeError:
         print(
             "Error: Problem finding and loading tree: %s"
@@ -1222,10 +1599,67 @@ def gather_statistics(args, event=None):
         sys.exit(1)
 
     if args.get("serial"):
-        facts = gather_serial_statistics(args, obj_list, event=event)
-    else:
-        facts = gather_concurrent_statistics(args, obj_list, event=event)
-    return total, facts
+        return gather_serial_statistics(args, db, event=event, report=report)
+    results = gather_concurrent_statistics(
+        args, obj_list, event=event, report=report
+    )
+    return total, results
+
+
+def write_frame(stream, obj_type, result=None):
+    """
+    Write a result frame to a binary stream. Only plain containers are
+    pickled as the worker runs as the main module.
+    """
+    if result is not None:
+        result = result.to_frame()
+    data = pickle.dumps(
+        {"version": PROTOCOL_VERSION, "obj_type": obj_type, "result": result},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    stream.write(FRAME_HEADER.pack(len(data)))
+    stream.write(data)
+    stream.flush()
+
+
+def read_frame(stream):
+    """
+    Read a result frame from a binary stream, returning the object type
+    and result. The object type is None for the end frame.
+    """
+    header = read_exactly(stream, FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    message = pickle.loads(read_exactly(stream, length))
+    if message.get("version") != PROTOCOL_VERSION:
+        raise ValueError(
+            "Unsupported statistics protocol version %s"
+            % message.get("version")
+        )
+    result = message["result"]
+    if result is not None:
+        result = StatisticsResult.from_frame(result)
+    return message["obj_type"], result
+
+
+def read_exactly(stream, size):
+    """
+    Read an exact number of bytes from a binary stream.
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError
+        data.extend(chunk)
+    return bytes(data)
+
+
+def stop_collection(*_dummy_args):
+    """
+    Exit on a request to terminate. Leaving the pool context terminates the
+    pool processes, so they do not carry on with their shards.
+    """
+    sys.exit(1)
 
 
 def main():
@@ -1241,6 +1675,38 @@ def main():
         action="store_true",
         help="Examine all person events",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=0,
+        help="Number of worker processes, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "-n",
+        "--nice",
+        dest="nice",
+        type=int,
+        default=0,
+        help="Increment to the scheduling niceness of the worker processes",
+    )
+    parser.add_argument(
+        "-o",
+        "--objects",
+        dest="objects",
+        default=False,
+        action="store_true",
+        help="Include the counts for each object",
+    )
+    parser.add_argument(
+        "-S",
+        "--shard-size",
+        dest="shard_size",
+        type=int,
+        default=MIN_SHARD_SIZE,
+        help="Minimum number of objects in a shard in concurrent mode",
+    )
     parser.add_argument(
         "-t",
         "--tree",
@@ -1262,7 +1728,15 @@ def main():
         dest="serial",
         default=False,
         action="store_true",
-        help="Serial mode",
+        help="Serial mode, a single pass over one database connection",
+    )
+    parser.add_argument(
+        "-x",
+        "--exclude",
+        dest="exclude",
+        nargs="*",
+        default=[],
+        help="Object types to skip, used to resume an interrupted run",
     )
     parser.add_argument(
         "-y",
@@ -1273,34 +1747,42 @@ def main():
         help="Dump statistics in YAML format if YAML support available",
     )
     parsed_args = parser.parse_args()
+    signal.signal(signal.SIGTERM, stop_collection)
 
     args = {
         "all_events": parsed_args.all_events,
+        "jobs": parsed_args.jobs,
+        "objects": parsed_args.objects,
         "tree_name": parsed_args.tree_name,
         "time": parsed_args.time,
         "serial": parsed_args.serial,
+        "shard_size": parsed_args.shard_size,
+        "exclude": parsed_args.exclude,
     }
+    if parsed_args.nice and hasattr(os, "nice"):
+        os.nice(parsed_args.nice)
     if parsed_args.time:
         args["start_time"] = time.time()
         print("Run started", file=sys.stderr)
 
-    total, facts = gather_statistics(args)
-
     if parsed_args.yaml:
+        total, results = gather_statistics(args)
         try:
             import yaml
 
-            print(yaml.dump(facts))
+            print(yaml.dump(build_statistics(results)))
         except ModuleNotFoundError:
             print("YAML support not available", file=sys.stderr)
     else:
-        # https://stackoverflow.com/questions/38029058/sending-pickled-data-to-a-server
-        sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding="latin-1")
-        print(pickle.dumps(facts).decode("latin-1"), end="", flush=True)
+        stream = sys.stdout.buffer
+        total, dummy_results = gather_statistics(
+            args, report=partial(write_frame, stream)
+        )
+        write_frame(stream, None)
     if parsed_args.time:
         print(
             "{0:<12} {1:6} {2}".format(
-                "Run complete", total, time.time() - args.start_time
+                "Run complete", total, time.time() - args["start_time"]
             ),
             file=sys.stderr,
         )
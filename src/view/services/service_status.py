@@ -57,6 +57,8 @@ class StatusIndicatorService:
         self.status_checks = {}
         self.default_options = []
         self.config_grid_builders = []
+        self.results = {}
+        self.options = {}
         plugin_manager = GuiPluginManager.get_instance()
         plugin_manager.connect(
             "plugins-reloaded", self.cb_reload_status_plugins
@@ -71,7 +73,9 @@ class StatusIndicatorService:
 
     def load_status_plugins(self):
         """
-        Load the status plugins.
+        Load the status plugins. A plugin may provide a batch callable that
+        evaluates a list of objects at once given a snapshot of its options,
+        returning for each object a list of callables that build the icons.
         """
         plugin_manager = BasePluginManager.get_instance()
         plugin_manager.load_plugin_category("STATUS")
@@ -79,16 +83,26 @@ class StatusIndicatorService:
         self.status_checks.clear()
         self.default_options.clear()
         self.config_grid_builders.clear()
+        self.results.clear()
+        self.options.clear()
         for plugin in plugin_data:
             supported_types = plugin["supported_types"]
             default_options = plugin["default_options"]
             get_config_grids = plugin["get_config_grids"]
             get_status = plugin["get_status"]
+            get_status_batch = plugin.get("get_status_batch")
+            if isinstance(default_options, list):
+                option_keys = tuple(option[0] for option in default_options)
+            elif default_options:
+                option_keys = (default_options[0],)
+            else:
+                option_keys = ()
+            status_check = (get_status, get_status_batch, option_keys)
             for supported_type in supported_types:
                 if supported_type in self.status_checks:
-                    self.status_checks[supported_type].append(get_status)
+                    self.status_checks[supported_type].append(status_check)
                 else:
-                    self.status_checks.update({supported_type: [get_status]})
+                    self.status_checks.update({supported_type: [status_check]})
             if default_options:
                 if isinstance(default_options, list):
                     self.default_options = (
@@ -99,6 +113,95 @@ class StatusIndicatorService:
             if get_config_grids:
                 self.config_grid_builders.append(get_config_grids)
 
+    def clear_cache(self):
+        """
+        Drop the cached status results, as when the database changed.
+        """
+        self.results.clear()
+        self.options.clear()
+
+    def clear_options(self):
+        """
+        Drop the option snapshots so they are resolved again from the
+        configuration, as when a page is rendered.
+        """
+        self.options.clear()
+
+    def get_options(self, grstate, option_keys):
+        """
+        Return a snapshot of the options for a status check.
+        """
+        key = (id(grstate.config), option_keys)
+        if key not in self.options:
+            config = grstate.config
+            options = {option: config.get(option) for option in option_keys}
+            self.options[key] = (
+                options,
+                tuple(options[option] for option in option_keys),
+            )
+        return self.options[key]
+
+    def prepare_status(self, grstate, objs, size):
+        """
+        Evaluate the batch status checks for a list of objects in one pass
+        per plugin, caching the results for the cards that follow.
+        """
+        obj_types = {}
+        for obj in objs:
+            if obj is not None and getattr(obj, "handle", None):
+                obj_types.setdefault(type(obj).__name__, []).append(obj)
+        for obj_type, obj_list in obj_types.items():
+            for status_check in self.status_checks.get(obj_type, []):
+                if status_check[1]:
+                    self.get_batch_results(
+                        grstate, status_check, obj_list, size
+                    )
+
+    def prepare_items(self, items):
+        """
+        Evaluate the batch status checks for a list of (grstate, obj, size)
+        items, as for the cards in view whose status indicators were
+        deferred.
+        """
+        slices = {}
+        for grstate, obj, size in items:
+            slices.setdefault((grstate, size), []).append(obj)
+        for (grstate, size), objs in slices.items():
+            self.prepare_status(grstate, objs, size)
+
+    def get_batch_results(self, grstate, status_check, objs, size):
+        """
+        Return the icon builders for a list of objects from a batch status
+        check, evaluating those not cached for the current options.
+        """
+        dummy_get_status, get_status_batch, option_keys = status_check
+        options, values = self.get_options(grstate, option_keys)
+        snapshot = (get_status_batch, size, values)
+        keys = [
+            (obj.handle, obj.change, snapshot)
+            if getattr(obj, "handle", None)
+            else None
+            for obj in objs
+        ]
+        pending = [
+            index
+            for index, key in enumerate(keys)
+            if key is None or key not in self.results
+        ]
+        results = {}
+        if pending:
+            batch = get_status_batch(
+                grstate, [objs[index] for index in pending], size, options
+            )
+            for index, builders in zip(pending, batch):
+                results[index] = builders
+                if keys[index] is not None:
+                    self.results[keys[index]] = builders
+        return [
+            results[index] if index in results else self.results[key]
+            for index, key in enumerate(keys)
+        ]
+
     def get_status(self, grstate, obj, size):
         """
         Perform and return status checks for an object.
@@ -107,7 +210,13 @@ class StatusIndicatorService:
         obj_type = type(obj).__name__
         if obj_type in self.status_checks:
             for status_check in self.status_checks[obj_type]:
-                status = status_check(grstate, obj, size)
+                if status_check[1]:
+                    builders = self.get_batch_results(
+                        grstate, status_check, [obj], size
+                    )[0]
+                    status = [build() for build in builders]
+                else:
+                    status = status_check[0](grstate, obj, size)
                 if status:
                     results = results + status
         return results
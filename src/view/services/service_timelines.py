@@ -0,0 +1,153 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+TimelineCacheService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from collections import OrderedDict
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from ..common.lifespan import LIFESPANS
+from ..common.timeline import UNION_SORTVALS
+
+# Number of built timelines kept.
+CACHE_SIZE = 16
+
+
+# -------------------------------------------------------------------------
+#
+# TimelineCacheService
+#
+# -------------------------------------------------------------------------
+class TimelineCacheService:
+    """
+    A singleton class that keeps the most recently built person and family
+    timelines so the same timeline shown on several pages, in pinned
+    windows or when navigating back is only built once. A timeline is
+    dropped when any person, family or event read while building it
+    changes. The changes are also forwarded to the shared memos of
+    synthetic union sort values and estimated lifespans.
+    """
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(TimelineCacheService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.timelines = OrderedDict()
+                self.dependencies = {}
+                self.signal_map = {}
+                for obj_type in ["person", "family", "event"]:
+                    for action in ["update", "delete"]:
+                        self.signal_map[
+                            "%s-%s" % (obj_type, action)
+                        ] = self.objects_changed
+                    self.signal_map["%s-rebuild" % obj_type] = self.reset
+                self.dbstate.connect("database-changed", self.database_changed)
+                if self.dbstate.is_open():
+                    self.__init_signals()
+                self.__init = True
+
+    def __init_signals(self):
+        """
+        Connect to signals from database.
+        """
+        for sig, callback in self.signal_map.items():
+            self.dbstate.db.connect(sig, callback)
+
+    def database_changed(self, *_dummy_args):
+        """
+        Clear the cache for a new database.
+        """
+        self.reset()
+        self.__init_signals()
+
+    def reset(self, *_dummy_args):
+        """
+        Drop all the cached timelines.
+        """
+        self.timelines = OrderedDict()
+        self.dependencies = {}
+        UNION_SORTVALS.reset()
+        LIFESPANS.reset()
+
+    def get_timeline(self, key, build):
+        """
+        Return the cached timeline for a key, building it with the given
+        callable if it is not available. Cached timelines are sorted up
+        front as they may be read by several groups.
+        """
+        if key in self.timelines:
+            self.timelines.move_to_end(key)
+            return self.timelines[key][0]
+        timeline = build()
+        timeline.sort_events()
+        handles = timeline.get_referenced_handles()
+        self.timelines[key] = (timeline, handles)
+        for handle in handles:
+            self.dependencies.setdefault(handle, set()).add(key)
+        while len(self.timelines) > CACHE_SIZE:
+            self.remove_timeline(next(iter(self.timelines)))
+        return timeline
+
+    def remove_timeline(self, key):
+        """
+        Remove a cached timeline and its dependencies.
+        """
+        if key in self.timelines:
+            dummy_timeline, handles = self.timelines.pop(key)
+            for handle in handles:
+                keys = self.dependencies.get(handle)
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del self.dependencies[handle]
+
+    def objects_changed(self, handles):
+        """
+        Remove the cached timelines that depend on changed objects.
+        """
+        UNION_SORTVALS.objects_changed(handles)
+        LIFESPANS.objects_changed(handles)
+        for handle in handles:
+            for key in list(self.dependencies.get(handle, [])):
+                self.remove_timeline(key)
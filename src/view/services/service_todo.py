@@ -0,0 +1,234 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+TodoIndexService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from functools import partial
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.errors import HandleError
+from gramps.gen.lib import NoteType
+
+# Positions of the fields read from the raw serialized data.
+NOTE_TYPE = 4
+
+# Primary object types that may reference notes.
+NOTE_REFERRERS = [
+    "person",
+    "family",
+    "event",
+    "place",
+    "source",
+    "citation",
+    "repository",
+    "media",
+]
+
+
+# -------------------------------------------------------------------------
+#
+# TodoIndexService
+#
+# -------------------------------------------------------------------------
+class TodoIndexService:
+    """
+    A singleton class that maintains an index of the to do notes and the
+    primary objects that reference them, either directly or through any of
+    their secondary objects, so checking an object for open to do items is
+    a set lookup. It is built on first use and then kept current from the
+    database signals.
+    """
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(TodoIndexService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.loaded = False
+                self.todo_notes = set()
+                self.object_notes = {}
+                self.note_objects = {}
+                self.signal_map = {
+                    "note-add": partial(self.notes_changed, False),
+                    "note-update": partial(self.notes_changed, False),
+                    "note-delete": partial(self.notes_changed, True),
+                    "note-rebuild": self.reset,
+                }
+                for obj_type in NOTE_REFERRERS:
+                    for action in ["add", "update"]:
+                        self.signal_map[
+                            "%s-%s" % (obj_type, action)
+                        ] = partial(self.objects_changed, obj_type, False)
+                    self.signal_map["%s-delete" % obj_type] = partial(
+                        self.objects_changed, obj_type, True
+                    )
+                    self.signal_map["%s-rebuild" % obj_type] = self.reset
+                self.dbstate.connect("database-changed", self.database_changed)
+                if self.dbstate.is_open():
+                    self.__init_signals()
+                self.__init = True
+
+    def __init_signals(self):
+        """
+        Connect to signals from database.
+        """
+        for sig, callback in self.signal_map.items():
+            self.dbstate.db.connect(sig, callback)
+
+    def database_changed(self, *_dummy_args):
+        """
+        Reset the index for a new database.
+        """
+        self.reset()
+        self.__init_signals()
+
+    def reset(self, *_dummy_args):
+        """
+        Drop the index so it is rebuilt on next use.
+        """
+        self.loaded = False
+        self.todo_notes = set()
+        self.object_notes = {}
+        self.note_objects = {}
+
+    def load(self):
+        """
+        Build the index from the raw note data and the note back links.
+        """
+        self.reset()
+        for handle, data in self.dbstate.db._iter_raw_note_data():
+            self.add_note(handle, data)
+        self.loaded = True
+
+    def add_note(self, handle, data):
+        """
+        Record a note and the objects referencing it if it is a to do note.
+        """
+        if data[NOTE_TYPE][0] == NoteType.TODO:
+            self.todo_notes.add(handle)
+            for (
+                dummy_obj_type,
+                obj_handle,
+            ) in self.dbstate.db.find_backlink_handles(handle):
+                self.link(obj_handle, handle)
+
+    def remove_note(self, handle):
+        """
+        Remove a note and the objects referencing it.
+        """
+        self.todo_notes.discard(handle)
+        for obj_handle in self.note_objects.pop(handle, []):
+            notes = self.object_notes.get(obj_handle)
+            if notes:
+                notes.discard(handle)
+                if not notes:
+                    del self.object_notes[obj_handle]
+
+    def link(self, obj_handle, note_handle):
+        """
+        Record an object referencing a to do note.
+        """
+        self.object_notes.setdefault(obj_handle, set()).add(note_handle)
+        self.note_objects.setdefault(note_handle, set()).add(obj_handle)
+
+    def unlink(self, obj_handle):
+        """
+        Remove the to do notes an object references.
+        """
+        for note_handle in self.object_notes.pop(obj_handle, []):
+            objects = self.note_objects.get(note_handle)
+            if objects:
+                objects.discard(obj_handle)
+
+    def notes_changed(self, deleted, handles):
+        """
+        Update the index for changed notes.
+        """
+        if not self.loaded:
+            return
+        get_raw_note_data = self.dbstate.db.get_raw_note_data
+        for handle in handles:
+            self.remove_note(handle)
+            if not deleted:
+                data = get_raw_note_data(handle)
+                if data:
+                    self.add_note(handle, data)
+
+    def objects_changed(self, obj_type, deleted, handles):
+        """
+        Update the index for changed objects that may reference notes.
+        """
+        if not self.loaded:
+            return
+        get_object = getattr(self.dbstate.db, "get_%s_from_handle" % obj_type)
+        for handle in handles:
+            self.unlink(handle)
+            if deleted or not self.todo_notes:
+                continue
+            try:
+                obj = get_object(handle)
+            except HandleError:
+                continue
+            for (
+                class_name,
+                note_handle,
+            ) in obj.get_referenced_handles_recursively():
+                if class_name == "Note" and note_handle in self.todo_notes:
+                    self.link(handle, note_handle)
+
+    def is_todo(self, note_handle):
+        """
+        Return True if a note is a to do note.
+        """
+        if not self.loaded:
+            self.load()
+        return note_handle in self.todo_notes
+
+    def has_todo(self, obj_handle):
+        """
+        Return True if a primary object or any of its secondary objects
+        references a to do note.
+        """
+        if not self.loaded:
+            self.load()
+        return obj_handle in self.object_notes
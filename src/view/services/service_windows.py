@@ -143,7 +143,7 @@ class PinnedViewWindow(ManagedWindow):
         Rebuild current page view.
         """
         view = view_builder(self.grstate, self.grcontext, hint=self.hint)
-        list(map(self.page_view.remove, self.page_view.get_children()))
+        list(map(Gtk.Widget.destroy, self.page_view.get_children()))
         self.page_view.pack_start(view, True, True, 0)
         self.show()
 
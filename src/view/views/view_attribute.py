@@ -46,6 +46,15 @@ class AttributeObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
+        self.build_header()
+        self.view_body = self.build_object_groups(
+            self.grcontext.secondary_obj
+        )
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
         base = self.grcontext.primary_obj
         attribute = self.grcontext.secondary_obj
         if self.grcontext.reference_obj:
@@ -65,5 +74,3 @@ class AttributeObjectView(GrampsObjectView):
 
         self.view_header.pack_start(self.view_object, False, False, 0)
         self.view_header.pack_start(self.view_focus, False, False, 0)
-
-        self.view_body = self.build_object_groups(attribute)
@@ -50,9 +50,13 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 from ..bars.bar_media import MediaBarGroup
+from ..common.common_classes import GrampsContext
 from ..common.common_const import GROUP_LABELS
 from ..common.common_utils import make_scrollable
-from ..groups.group_builder import group_builder
+from ..groups.group_builder import get_group_key, group_builder
+from ..groups.group_expander import CardGroupExpander
+from ..groups.group_timeline import find_timeline_group
+from ..services.service_deferred import DeferredLoadService
 
 _ = glocale.translation.sgettext
 
@@ -77,7 +81,24 @@ class GrampsObjectView(Gtk.VBox):
         self.view_body = Gtk.HBox(vexpand=False)
         self.view_object = None
         self.view_focus = None
-        self.render_view()
+        self.media_bar_slot = None
+        self.group_slots = {}
+        self.group_keys = {}
+        self.group_base = None
+        self.group_args = None
+        service = DeferredLoadService()
+        owner = service.set_owner(self)
+        try:
+            self.render_view()
+        finally:
+            service.set_owner(owner)
+        self.connect("destroy", self.cb_destroy)
+
+    def cb_destroy(self, _dummy_widget):
+        """
+        Drop the deferred jobs still pending for the view.
+        """
+        DeferredLoadService().cancel(self)
 
     def render_view(self):
         """
@@ -137,6 +158,19 @@ class GrampsObjectView(Gtk.VBox):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
+        raise NotImplementedError
+
+    def get_age_base(self, grcontext):
+        """
+        Return the date ages in the groups are calculated relative to.
+        """
+        return None
+
     def wrap_focal_widget(self, focal_widget):
         """
         Wrap focal widget with colored background so it stands out.
@@ -181,12 +215,17 @@ class GrampsObjectView(Gtk.VBox):
         args = {"page_type": self.grcontext.page_type.lower()}
         if age_base:
             args["age_base"] = age_base
+        self.group_base = obj
+        self.group_args = args
         object_groups = {}
         for group in groups:
             if self.grstate.config.get("%s.%s.visible" % (space, group)):
+                self.grstate.set_dependency_group(group)
                 object_groups.update(
                     {group: group_builder(self.grstate, group, obj, args)}
                 )
+                self.group_keys[group] = get_group_key(group, obj)
+        self.grstate.set_dependency_group("header")
         return object_groups
 
     def render_group_view(self, obj_groups, space_override=None):
@@ -215,19 +254,144 @@ class GrampsObjectView(Gtk.VBox):
                 current_grouping = []
         if current_grouping:
             groupings.append(current_grouping)
+
+        slots = {}
+        for group, widget in obj_groups.items():
+            if widget:
+                slots[group] = Gtk.VBox(vexpand=False)
+                slots[group].pack_start(widget, True, True, 0)
+        self.group_slots.update(slots)
         if self.grstate.config.get("%s.tabbed" % space):
-            return prepare_tabbed_groups(obj_groups, groupings, scrolled)
-        return prepare_untabbed_groups(obj_groups, groupings, scrolled)
+            return prepare_tabbed_groups(slots, groupings, scrolled)
+        return prepare_untabbed_groups(slots, groupings, scrolled)
+
+    def refresh_groups(self, groups, primary_changed=False):
+        """
+        Rebuild the given groups in place, along with the header and any
+        groups rendered from fields that changed if the primary object was
+        updated, preserving the rest of the widget tree. Returns False if
+        the view can not be refreshed this way and needs a full rebuild.
+        """
+        if "header" in groups:
+            return False
+        groups = set(groups)
+        grcontext = self.grcontext
+        if primary_changed:
+            if grcontext.page_type != grcontext.primary_obj.obj_type:
+                return False
+            grcontext = GrampsContext()
+            grcontext.load_page_location(
+                self.grstate, self.grcontext.page_location
+            )
+            if not grcontext.primary_obj:
+                return False
+            old_age_base = self.group_args and self.group_args.get(
+                "age_base"
+            )
+            if not same_date(old_age_base, self.get_age_base(grcontext)):
+                return False
+            obj = grcontext.primary_obj.obj
+            for group, key in self.group_keys.items():
+                if key != get_group_key(group, obj):
+                    groups.add(group)
+        else:
+            obj = self.group_base
+
+        for group in groups:
+            if group not in self.group_keys or group not in self.group_slots:
+                return False
+
+        # The new groups record their dependencies apart from those of the
+        # page, which are only replaced once every group was rebuilt.
+        new_groups = {}
+        new_dependencies = {}
+        dependencies = self.grstate.dependencies
+        service = DeferredLoadService()
+        owner = service.set_owner(self)
+        self.grstate.cache_fetches()
+        try:
+            for group in groups:
+                self.grstate.dependencies = {}
+                self.grstate.set_dependency_group(group)
+                widget = group_builder(
+                    self.grstate, group, obj, self.group_args
+                )
+                if not widget:
+                    return False
+                new_groups[group] = widget
+                new_dependencies[group] = self.grstate.dependencies.get(
+                    group, set()
+                )
+        finally:
+            self.grstate.dependencies = dependencies
+            self.grstate.set_dependency_group("header")
+            self.grstate.clear_fetch_cache()
+            service.set_owner(owner)
+        dependencies.update(new_dependencies)
+
+        for group, widget in new_groups.items():
+            slot = self.group_slots[group]
+            old_widgets = slot.get_children()
+            list(map(slot.remove, old_widgets))
+            slot.pack_start(widget, True, True, 0)
+            timeline = find_timeline_group(widget)
+            if timeline:
+                for old_widget in old_widgets:
+                    old_timeline = find_timeline_group(old_widget)
+                    if old_timeline:
+                        timeline.restore_state(old_timeline)
+            slot.show_all()
+            if isinstance(widget, CardGroupExpander):
+                for old_widget in old_widgets:
+                    if isinstance(old_widget, CardGroupExpander):
+                        widget.restore_state(old_widget)
+            list(map(Gtk.Widget.destroy, old_widgets))
+            self.group_keys[group] = get_group_key(group, obj)
+
+        if primary_changed:
+            self.grcontext = grcontext
+            dependencies["header"] = set()
+            list(map(Gtk.Widget.destroy, self.view_header.get_children()))
+            owner = service.set_owner(self)
+            try:
+                self.build_header()
+            finally:
+                service.set_owner(owner)
+            self.view_header.show_all()
+            if self.media_bar_slot:
+                self.load_media_bar(obj)
+        return True
 
     def add_media_bar(self, widget, obj):
         """
         Check and if need and can build media bar add to widget for viewing.
         """
         if self.grstate.config.get("media-bar.enabled"):
-            css = self.view_object.get_css_style()
-            mediabar = MediaBarGroup(self.grstate, None, obj, css=css)
-            if mediabar.total:
-                widget.pack_start(mediabar, False, False, 0)
+            self.media_bar_slot = Gtk.VBox(vexpand=False)
+            widget.pack_start(self.media_bar_slot, False, False, 0)
+            self.load_media_bar(obj)
+
+    def load_media_bar(self, obj):
+        """
+        Build or rebuild the media bar.
+        """
+        list(
+            map(self.media_bar_slot.remove, self.media_bar_slot.get_children())
+        )
+        css = self.view_object.get_css_style()
+        mediabar = MediaBarGroup(self.grstate, None, obj, css=css)
+        if mediabar.total:
+            self.media_bar_slot.pack_start(mediabar, False, False, 0)
+            self.media_bar_slot.show_all()
+
+
+def same_date(date1, date2):
+    """
+    Return True if two optional dates are the same.
+    """
+    if date1 is None or date2 is None:
+        return date1 is date2
+    return date1.serialize() == date2.serialize()
 
 
 def add_to_title(title, group):
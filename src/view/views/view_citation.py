@@ -46,11 +46,23 @@ class CitationObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
-        citation = self.grcontext.primary_obj
+        self.build_header()
+        self.view_body = self.build_object_groups(
+            self.grcontext.primary_obj,
+            age_base=self.get_age_base(self.grcontext),
+        )
 
-        age_base = None
-        if citation.obj.get_date_object():
-            age_base = citation.obj.get_date_object()
+    def get_age_base(self, grcontext):
+        """
+        Return the date ages in the groups are calculated relative to.
+        """
+        return grcontext.primary_obj.obj.get_date_object() or None
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
+        citation = self.grcontext.primary_obj
 
         if citation.obj.source_handle:
             source = self.grstate.dbstate.db.get_source_from_handle(
@@ -66,5 +78,3 @@ class CitationObjectView(GrampsObjectView):
         )
         self.view_focus = self.wrap_focal_widget(self.view_object)
         self.view_header.pack_start(self.view_focus, False, False, 0)
-
-        self.view_body = self.build_object_groups(citation, age_base=age_base)
@@ -56,6 +56,31 @@ class EventObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
+        self.build_header()
+
+        event = self.grcontext.primary_obj.obj
+        groups = self.grstate.config.get("layout.event.groups").split(",")
+        object_groups = self.get_object_groups(
+            "layout.event",
+            groups,
+            event,
+            age_base=self.get_age_base(self.grcontext),
+        )
+        if "people" in groups or "family" in groups:
+            self.add_participant_groups(event, object_groups)
+
+        self.view_body = self.render_group_view(object_groups)
+
+    def get_age_base(self, grcontext):
+        """
+        Return the date ages in the groups are calculated relative to.
+        """
+        return grcontext.primary_obj.obj.get_date_object() or None
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
         event = self.grcontext.primary_obj.obj
 
         groptions = GrampsOptions("active.event")
@@ -67,15 +92,6 @@ class EventObjectView(GrampsObjectView):
         self.view_focus = self.wrap_focal_widget(self.view_object)
         self.view_header.pack_start(self.view_focus, False, False, 0)
 
-        groups = self.grstate.config.get("layout.event.groups").split(",")
-        object_groups = self.get_object_groups(
-            "layout.event", groups, event, age_base=event.get_date_object()
-        )
-        if "people" in groups or "family" in groups:
-            self.add_participant_groups(event, object_groups)
-
-        self.view_body = self.render_group_view(object_groups)
-
     def add_participant_groups(self, event, object_groups):
         """
         Evaluate and add the participant groups as needed.
@@ -102,6 +118,7 @@ class EventObjectView(GrampsObjectView):
             }
             if event.get_date_object():
                 args["age_base"] = event.get_date_object()
+            self.group_keys.pop("people", None)
             object_groups.update(
                 {
                     "people": get_references_group(
@@ -121,6 +138,7 @@ class EventObjectView(GrampsObjectView):
             }
             if event.get_date_object():
                 args["age_base"] = event.get_date_object()
+            self.group_keys.pop("family", None)
             object_groups.update(
                 {
                     "family": get_references_group(
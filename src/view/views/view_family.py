@@ -53,6 +53,13 @@ class FamilyObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
+        self.build_header()
+        self.view_body = self.build_object_groups(self.grcontext.primary_obj)
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
         family = self.grcontext.primary_obj.obj
 
         groups = {
@@ -99,8 +106,6 @@ class FamilyObjectView(GrampsObjectView):
             self.view_header.pack_start(pbox, False, False, 0)
         self.view_header.pack_start(self.view_focus, False, False, 0)
 
-        self.view_body = self.build_object_groups(self.grcontext.primary_obj)
-
     def _get_primary_parents(self, person, size_groups):
         """
         Return widget with primary parents of a person.
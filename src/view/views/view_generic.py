@@ -46,6 +46,17 @@ class GenericObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
+        self.build_header()
+        self.view_body = self.build_object_groups(
+            self.grcontext.reference_obj
+            or self.grcontext.secondary_obj
+            or self.grcontext.primary_obj
+        )
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
         primary = self.grcontext.primary_obj
         reference = self.grcontext.reference_obj
         secondary = self.grcontext.secondary_obj
@@ -55,16 +66,13 @@ class GenericObjectView(GrampsObjectView):
         groptions = GrampsOptions(option_space)
         primary_card = build_card(self.grstate, groptions, primary.obj)
 
-        groups = primary
         if reference:
-            groups = reference
             reference_card = self.build_secondary_card(primary, reference)
             self.view_object = reference_card
             self.view_focus = self.wrap_focal_widget(self.view_object)
             self.view_header.pack_start(primary_card, False, False, 0)
             self.view_header.pack_start(self.view_focus, False, False, 0)
         elif secondary:
-            groups = secondary
             self.view_object = self.build_secondary_card(primary, secondary)
             self.view_focus = self.wrap_focal_widget(self.view_object)
             self.view_header.pack_start(primary_card, False, False, 0)
@@ -74,8 +82,6 @@ class GenericObjectView(GrampsObjectView):
             self.view_focus = self.wrap_focal_widget(self.view_object)
             self.view_header.pack_start(self.view_focus, False, False, 0)
 
-        self.view_body = self.build_object_groups(groups)
-
     def build_secondary_card(self, primary, secondary):
         """
         Build card for secondary objects.
@@ -50,11 +50,23 @@ class MediaObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
-        media = self.grcontext.primary_obj
+        self.build_header()
+        self.view_body = self.build_object_groups(
+            self.grcontext.primary_obj,
+            age_base=self.get_age_base(self.grcontext),
+        )
 
-        age_base = None
-        if media.obj.get_date_object():
-            age_base = media.obj.get_date_object()
+    def get_age_base(self, grcontext):
+        """
+        Return the date ages in the groups are calculated relative to.
+        """
+        return grcontext.primary_obj.obj.get_date_object() or None
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
+        media = self.grcontext.primary_obj
 
         groptions = GrampsOptions("active.media")
         self.view_object = CARD_MAP["Media"](
@@ -62,5 +74,3 @@ class MediaObjectView(GrampsObjectView):
         )
         self.view_focus = self.wrap_focal_widget(self.view_object)
         self.view_header.pack_start(self.view_focus, False, False, 0)
-
-        self.view_body = self.build_object_groups(media, age_base=age_base)
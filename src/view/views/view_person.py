@@ -50,16 +50,30 @@ class PersonObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
-        person = self.grcontext.primary_obj.obj
+        self.build_header()
+        self.view_body = self.build_object_groups(
+            self.grcontext.primary_obj,
+            age_base=self.get_age_base(self.grcontext),
+        )
 
-        age_base = None
-        birth_ref = person.get_birth_ref()
+    def get_age_base(self, grcontext):
+        """
+        Return the date ages in the groups are calculated relative to.
+        """
+        birth_ref = grcontext.primary_obj.obj.get_birth_ref()
         if birth_ref is not None:
             event = self.grstate.dbstate.db.get_event_from_handle(
                 birth_ref.ref
             )
             if event:
-                age_base = event.get_date_object()
+                return event.get_date_object()
+        return None
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
+        person = self.grcontext.primary_obj.obj
 
         groptions = GrampsOptions("active.person")
         self.view_object = CARD_MAP["Person"](self.grstate, groptions, person)
@@ -69,10 +83,6 @@ class PersonObjectView(GrampsObjectView):
             self._add_primary_parents(person)
         self.view_header.pack_start(self.view_focus, False, False, 0)
 
-        self.view_body = self.build_object_groups(
-            self.grcontext.primary_obj, age_base=age_base
-        )
-
     def _add_primary_parents(self, person):
         """
         Add widget with primary parents of a person.
@@ -56,13 +56,9 @@ class SourceObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
-        source = self.grcontext.primary_obj.obj
-
-        groptions = GrampsOptions("active.source")
-        self.view_object = CARD_MAP["Source"](self.grstate, groptions, source)
-        self.view_focus = self.wrap_focal_widget(self.view_object)
-        self.view_header.pack_start(self.view_focus, False, False, 0)
+        self.build_header()
 
+        source = self.grcontext.primary_obj.obj
         groups = self.grstate.config.get("layout.source.groups").split(",")
         object_groups = self.get_object_groups("layout.source", groups, source)
         if "people" in groups or "event" in groups or "place" in groups:
@@ -70,6 +66,17 @@ class SourceObjectView(GrampsObjectView):
 
         self.view_body = self.render_group_view(object_groups)
 
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
+        source = self.grcontext.primary_obj.obj
+
+        groptions = GrampsOptions("active.source")
+        self.view_object = CARD_MAP["Source"](self.grstate, groptions, source)
+        self.view_focus = self.wrap_focal_widget(self.view_object)
+        self.view_header.pack_start(self.view_focus, False, False, 0)
+
     def add_cited_subject_groups(self, source, object_groups):
         """
         Evaluate and add the groups for cited subjects found in the source.
@@ -90,6 +97,7 @@ class SourceObjectView(GrampsObjectView):
         if "people" in object_groups and people_list:
             groptions = GrampsOptions("group.people")
             args = {"title": (_("Cited People"), _("Cited People"))}
+            self.group_keys.pop("people", None)
             object_groups.update(
                 {
                     "people": get_references_group(
@@ -105,6 +113,7 @@ class SourceObjectView(GrampsObjectView):
         if "event" in object_groups and events_list:
             groptions = GrampsOptions("group.event")
             args = {"title": (_("Cited Event"), _("Cited Events"))}
+            self.group_keys.pop("event", None)
             object_groups.update(
                 {
                     "event": get_references_group(
@@ -120,6 +129,7 @@ class SourceObjectView(GrampsObjectView):
         if "place" in object_groups and places_list:
             groptions = GrampsOptions("group.place")
             args = {"title": (_("Cited Place"), _("Cited Places"))}
+            self.group_keys.pop("place", None)
             object_groups.update(
                 {
                     "place": get_references_group(
@@ -47,11 +47,17 @@ class StatisticsObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
+        self.build_header()
+        self.view_body = self.build_statistics_groups()
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
         groptions = GrampsOptions("active.tree")
         self.view_object = FamilyTreeCard(self.grstate, groptions)
         self.view_focus = self.wrap_focal_widget(self.view_object)
         self.view_header.pack_start(self.view_focus, False, False, 0)
-        self.view_body = self.build_statistics_groups()
 
     def build_statistics_groups(self):
         """
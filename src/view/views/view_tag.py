@@ -47,13 +47,9 @@ class TagObjectView(GrampsObjectView):
         """
         Build the view header and body and set the focus.
         """
-        tag = self.grcontext.primary_obj.obj
-
-        groptions = GrampsOptions("active.tag")
-        self.view_object = CARD_MAP["Tag"](self.grstate, groptions, tag)
-        self.view_focus = self.wrap_focal_widget(self.view_object)
-        self.view_header.pack_start(self.view_focus, False, False, 0)
+        self.build_header()
 
+        tag = self.grcontext.primary_obj.obj
         object_list = {}
         for (
             obj_type,
@@ -79,3 +75,14 @@ class TagObjectView(GrampsObjectView):
                     }
                 )
         self.view_body = self.render_group_view(object_groups)
+
+    def build_header(self):
+        """
+        Build the view header and set the focus.
+        """
+        tag = self.grcontext.primary_obj.obj
+
+        groptions = GrampsOptions("active.tag")
+        self.view_object = CARD_MAP["Tag"](self.grstate, groptions, tag)
+        self.view_focus = self.wrap_focal_widget(self.view_object)
+        self.view_header.pack_start(self.view_focus, False, False, 0)